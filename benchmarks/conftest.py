@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+ビルドパイプラインのベンチマーク用フィクスチャ（pytest-benchmark）
+
+記録済みの RSS/Atom 本文・X の CSV・翻訳/Gemini 応答（benchmarks/fixtures/）を
+ネットワークを使わないスタンドインで再生する。規模は今日の量（feeds.yml のフィード数、X CSV の行数）の
+1×・10×・100×。コピーごとに URL を変え、タイトル・要約・投稿本文の語を書き換えて
+重複除去で潰れないようにしている（mutate_text）。
+
+実行:
+    pip install pytest-benchmark
+    python -m pytest benchmarks --benchmark-autosave          # .benchmarks/ に結果を保存
+    python -m pytest benchmarks --benchmark-compare           # 前回保存分と比較
+    python -m pytest benchmarks -k "1x"                       # 1× だけ
+"""
+import csv
+import io
+import json
+import random
+import re
+from datetime import datetime
+from pathlib import Path
+
+import feedparser
+import pytest
+import yaml
+
+import build
+from host_health import HostHealth
+from translation_cache import TranslationCache
+
+FIXTURES = Path(__file__).parent / "fixtures"
+# 記録時刻（フィード・CSV の日付がこの時点の取得ウィンドウに入る）
+RECORDED_AT = datetime(2025, 8, 13, 9, 0, tzinfo=build.JST)
+SCALES = {"1x": 1, "10x": 10, "100x": 100}
+# 規模ごとの計測回数（100× は 1 段で数十秒〜数分かかるため 1 回）
+ROUNDS = {1: 5, 10: 3, 100: 1}
+# カテゴリごとに再生する記録済みフィード本文（フィード順に巡回）
+CATEGORY_BODIES = {
+    "Business": ["business_rss.xml", "japanese_rss.xml"],
+    "Tools": ["tools_rss.xml"],
+    "Posts": ["research_atom.xml"],
+}
+
+# コピーで書き換える単位: 英単語（3文字以上）と日本語の 2 文字
+_TOKEN_RE = re.compile(r'[a-zA-Z]{3,}|[ぁ-ゟァ-ヿ一-龯]{2}')
+_SUFFIX_LETTERS = "bcdfghjklmnpqrstvwxz"
+# 書き換える語の割合（残りは記録のまま。英単語は接尾辞を付けるだけなのでキーワード一致は保たれる）
+MUTATION_RATE = 0.7
+
+
+def mutate_text(text: str, seed: int) -> str:
+    """
+    seed ごとに決まる書き換え。英単語には seed 由来の接尾辞を付け、日本語は 2 文字を別の漢字に置き換える。
+    同じ記事のコピー同士の類似度が下がり、重複除去やストーリー判定で 1 件に潰れない
+    """
+    rng = random.Random(seed)
+    suffix = "".join(rng.choice(_SUFFIX_LETTERS) for _ in range(3))
+
+    def replace(match):
+        token = match.group(0)
+        if rng.random() >= MUTATION_RATE:
+            return token
+        if token.isascii():
+            return token + suffix
+        return "".join(chr(rng.randrange(0x4E00, 0x9FA0)) for _ in token)
+
+    return _TOKEN_RE.sub(replace, text)
+
+
+def render_feed_copy(body: str, copy: int) -> bytes:
+    """記録済みフィード本文の copy 番目のコピー（0 は記録のまま）"""
+    if copy == 0:
+        return body.encode("utf-8")
+    body = re.sub(r"(<link>|<link href=\")(https?://[^<\"]+)", rf"\g<1>\g<2>?copy={copy}", body)
+    return re.sub(r"<(title|description|summary)>([^<]*)</\1>",
+                  lambda m: f"<{m.group(1)}>{mutate_text(m.group(2), copy)}</{m.group(1)}>", body).encode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def feeds_conf():
+    return yaml.safe_load((Path(build.__file__).parent / "feeds.yml").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="session")
+def recorded_responses():
+    return json.loads((FIXTURES / "responses.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="session")
+def x_csv_rows():
+    return list(csv.reader(io.StringIO((FIXTURES / "x_posts.csv").read_text(encoding="utf-8"))))
+
+
+@pytest.fixture(params=list(SCALES), scope="session")
+def scale(request):
+    return SCALES[request.param]
+
+
+@pytest.fixture
+def rounds(scale):
+    return ROUNDS[scale]
+
+
+@pytest.fixture
+def replay_feeds(monkeypatch, feeds_conf, scale):
+    """
+    build.fetch_feed を記録済み本文の再生に差し替え、カテゴリ名 -> フィード設定のリストを返す。
+    フィード数は feeds.yml の scale 倍（本文のパースはベンチマーク対象に含める）
+    """
+    bodies = {}
+    feeds_by_category = {}
+    for category, names in CATEGORY_BODIES.items():
+        feeds = []
+        for copy in range(scale):
+            for n, feed in enumerate(feeds_conf.get(category) or []):
+                url = f"https://bench.local/{category}/{copy}/{n}"
+                text = (FIXTURES / names[n % len(names)]).read_text(encoding="utf-8")
+                bodies[url] = render_feed_copy(text, copy * 1000 + n)
+                feeds.append({"name": feed.get("name", url), "url": url, "general": feed.get("general", False)})
+        feeds_by_category[category] = feeds
+
+    monkeypatch.setattr(build, "NOW", RECORDED_AT)
+    monkeypatch.setattr(build, "fetch_feed", lambda url, name: feedparser.parse(bodies[url]))
+    monkeypatch.setattr(build.FEED_CACHE, "save", lambda: None)
+    monkeypatch.setattr(build, "HOST_HEALTH", HostHealth(FIXTURES / "host_health.json", enabled=False))
+    return feeds_by_category
+
+
+@pytest.fixture
+def x_csv_bytes(x_csv_rows, scale):
+    """記録済み X CSV の scale 倍（コピーごとに URL と本文の語彙を変える）"""
+    out = io.StringIO()
+    writer = csv.writer(out, quoting=csv.QUOTE_MINIMAL)
+    for copy in range(scale):
+        for n, row in enumerate(x_csv_rows):
+            row = list(row)
+            if copy and len(row) >= 5:
+                row[2] = mutate_text(row[2], copy * 10000 + n)
+                row[4] = f"{row[4]}{copy:03d}"
+            writer.writerow(row)
+    return out.getvalue().encode("utf-8")
+
+
+class RecordedTranslator:
+    """記録済みの訳文を返す翻訳スタンドイン（未記録の文は印を付けて返す）"""
+
+    def __init__(self, translations):
+        self.translations = translations
+        self.batch_requests = 0
+
+    def translate(self, text):
+        return self.translations.get(text) or f"（訳）{text}"
+
+    def translate_batch(self, texts):
+        self.batch_requests += 1
+        return [self.translate(text) for text in texts]
+
+
+class RecordedGeminiClient:
+    """記録済みの分析結果を URL ごとの JSON 配列として返す Gemini URL context スタンドイン"""
+
+    def __init__(self, analyses):
+        self.analyses = analyses
+        self.requests = 0
+
+    def _analysis(self, url):
+        return self.analyses[int(re.sub(r"\D", "", url)[-6:] or 0) % len(self.analyses)]
+
+    def gather_from_urls(self, requests, max_concurrency=None):
+        results = []
+        for request in requests:
+            self.requests += 1
+            entries = [dict(self._analysis(url), url=url) for url in request["urls"]]
+            if len(entries) == 1:
+                a = entries[0]
+                text = f"## 要約\n{a['summary']}\n\n## カテゴリ\n{a['category']}\n\n## 重要度\n{a['importance']}"
+            else:
+                text = json.dumps(entries, ensure_ascii=False)
+            results.append({"text": text, "input_urls": request["urls"]})
+        return results
+
+
+@pytest.fixture
+def translator(monkeypatch, recorded_responses, tmp_path):
+    """build_cards が使う翻訳スタンドインと空の翻訳キャッシュ"""
+    monkeypatch.setattr(build, "TRANSLATE_TO_JA", True)
+    monkeypatch.setattr(build, "TRANSLATION_CACHE",
+                        TranslationCache(tmp_path / "translations.jsonl", legacy_path=None, autoload=False))
+    return RecordedTranslator(recorded_responses["translations"])
+
+
+@pytest.fixture
+def gemini_client(recorded_responses):
+    return RecordedGeminiClient(recorded_responses["x_post_analysis"])
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""`python -c "import build"` の所要時間（素の python 起動との差）が予算内に収まるか"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# import build にかけてよい時間（秒、インタープリター起動分を除く）。
+# 重い SDK（google-genai・翻訳ライブラリ）や requests/feedparser を import 時に読むと超える
+IMPORT_BUDGET_SECONDS = 0.25
+RUNS = 5
+
+
+def _median_seconds(code: str, cwd: Path) -> float:
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def test_import_build_within_budget(tmp_path):
+    _median_seconds("import build", tmp_path)  # .pyc を作っておく
+    baseline = _median_seconds("pass", tmp_path)
+    elapsed = _median_seconds("import build", tmp_path) - baseline
+    print(f"import build: {elapsed * 1000:.0f} ms (budget {IMPORT_BUDGET_SECONDS * 1000:.0f} ms)")
+    assert elapsed < IMPORT_BUDGET_SECONDS
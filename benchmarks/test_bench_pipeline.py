@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""ビルドパイプライン各段のスループット（記録済みフィード・CSV の再生、1×/10×/100×）"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import build
+from enhanced_x_processor import EnhancedXProcessor
+from news_item import NewsItem
+
+
+@pytest.fixture
+def gathered(replay_feeds):
+    """カテゴリ名 -> gather_items 済みの記事（スコア計算・重複除去・カード生成の入力）"""
+    return {category: build.gather_items(feeds, category) for category, feeds in replay_feeds.items()}
+
+
+def test_gather_items(benchmark, replay_feeds, rounds):
+    items = benchmark.pedantic(build.gather_items, args=(replay_feeds["Business"], "Business"), rounds=rounds)
+    assert items
+
+
+def test_extract_x_data_from_csv(benchmark, x_csv_bytes, rounds):
+    records = benchmark.pedantic(build._extract_x_data_from_csv, args=(x_csv_bytes,), rounds=rounds)
+    assert records
+
+
+def test_process_x_posts(benchmark, x_csv_bytes, gemini_client, tmp_path, rounds):
+    csv_path = tmp_path / "x_posts.csv"
+    csv_path.write_bytes(x_csv_bytes)
+    processor = EnhancedXProcessor.__new__(EnhancedXProcessor)
+    processor.gemini_client = gemini_client
+
+    posts = benchmark.pedantic(processor.process_x_posts, args=(str(csv_path),),
+                               kwargs={"max_posts": 10 ** 6}, rounds=rounds)
+    assert posts and posts[0]["_gemini_enhanced"]
+
+
+def test_scoring(benchmark, gathered, rounds):
+    raw = [(item.to_dict(), category) for category, items in gathered.items() for item in items]
+
+    def score_all():
+        return [build.to_news_item(dict(fields), category) for fields, category in raw]
+
+    items = benchmark.pedantic(score_all, rounds=rounds)
+    assert all(isinstance(item, NewsItem) and item.importance_score is not None for item in items)
+
+
+def test_story_dedup(benchmark, gathered, rounds):
+    items = [item for category_items in gathered.values() for item in category_items]
+    representatives = benchmark.pedantic(build.keep_story_representatives, args=(items,), rounds=rounds)
+    assert 0 < len(representatives) <= len(items)
+
+
+def test_build_cards(benchmark, gathered, translator, monkeypatch, rounds):
+    items = gathered["Business"]
+    # 表示件数の上限を外し、全記事のカードを生成する
+    monkeypatch.setattr(build, "MAX_ITEMS_PER_CATEGORY", len(items))
+
+    def reset_translation_cache():
+        build.TRANSLATION_CACHE.load()  # 保存していない一時パスなので空になる
+
+    def render():
+        build.prefetch_translations(items, translator)
+        return build.build_cards(items, translator, "business", "ビジネス")
+
+    # 毎回空のキャッシュから翻訳（スタンドイン）→ カード生成までを計測する
+    html_out = benchmark.pedantic(render, setup=reset_translation_cache, rounds=rounds)
+    assert html_out.count('<article class="news-card"') == len(items)
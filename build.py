@@ -3,9 +3,12 @@
 Daily AI News - static site generator (JST)
 - Summaries are translated to Japanese (no API key) using deep-translator.
 - Primary engine: GoogleTranslator (unofficial). Fallback: MyMemory (ja-JP).
-- Caches translations to _cache/translations.json to avoid repeated calls.
+- Caches translations to _cache/translations.jsonl (append-only log) to avoid repeated calls.
 - Reads RSS list from feeds.yml with categories: Business, Tools, Posts.
 - Injects X posts from a CSV file into the 'Posts' category.
+- Importing this module has no side effects: configure() reads/validates the env, creates _cache/
+  and loads the persisted caches; optional SDKs (Gemini, translators) load on first use.
+- index.html renders its cards from a JSON data island with a build-time search index (search_index.py).
 
 Env (optional):
   HOURS_LOOKBACK=24        # Fetch window in hours
@@ -13,101 +16,71 @@ Env (optional):
   TRANSLATE_TO_JA=1        # 1=enable JA summaries, 0=disable
   TRANSLATE_ENGINE=google  # google|mymemory
   X_POSTS_CSV=_sources/x_favorites.csv # Path to X posts CSV
+  FEED_FETCH_WORKERS=8     # Concurrent feed fetch workers
+  FEED_FETCH_PER_HOST=2    # Max concurrent fetches per host
+  FEED_CACHE_ENABLED=1     # 1=conditional GET with _cache/feeds.json
+  X_INCREMENTAL=1          # 1=only process X CSV rows added since last run (_cache/x_ingest.json)
+  HOST_BREAKER_ENABLED=1   # 1=skip hosts that keep failing (_cache/host_health.json)
+  BUILD_PROFILE=0          # 1=save cProfile stats to _cache/build_profile.prof (timings: _cache/build_metrics.json)
+  BUILD_FROM_SNAPSHOT=0    # 1=render from a fresh _cache/news_snapshot.jsonl.gz instead of re-fetching
   TZ=Asia/Tokyo            # for timestamps
 """
-import os, re, sys, json, time, html, csv, io, textwrap
+import os, re, sys, time, html, threading, importlib
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from urllib.parse import urlparse
-from urllib.request import urlopen
 
-import yaml
-import feedparser
-import requests
 import random
 
-# ---------------- Mojibake Repair Utilities ----------------
-def repair_mojibake(text: str) -> str:
-    """Attempt to repair common mojibake (garbled) text.
-    Tries several re-encode/decode strategies and picks the one with more Japanese characters
-    and fewer replacement characters. Always returns normalized (NFKC) single-line text.
+# yaml / feedparser / requests（http_client）は使う関数の中で読み込む（import build を軽くする）
+from feed_cache import FeedCache
+from host_health import HostHealth
+from translation_cache import TranslationCache, text_key, link_key
+
+from x_csv_parser import parse_x_csv
+from x_ingest import XIngestState
+from keyword_matcher import KeywordMatcher
+from news_item import NewsItem
+from near_duplicate import NearDuplicateIndex
+from story_clusters import cluster_stories
+from news_snapshot import CATEGORIES, feeds_digest, load_snapshot, write_snapshot
+from search_index import build_payload, json_island
+from build_metrics import get_metrics, reset_metrics, run_profiled, profiling_enabled
+
+# ---------- optional modules ----------
+@lru_cache(maxsize=None)
+def optional_import(module_name: str, name: str):
+    """
+    任意モジュールの属性を初回使用時に読み込む（読み込めなければ None）。
+    enhanced_x_processor（google-genai）・gemini_news_supplement などの重い SDK を import build で読まない
     """
-    if not text:
-        return text
     try:
-        import unicodedata, re
-        candidates = [text]
-        # Try common mis-decode patterns
-        try:
-            candidates.append(bytes(text, 'latin-1', errors='ignore').decode('utf-8', errors='ignore'))
-        except Exception:
-            pass
-        try:
-            candidates.append(bytes(text, 'cp1252', errors='ignore').decode('utf-8', errors='ignore'))
-        except Exception:
-            pass
-        try:
-            candidates.append(bytes(text, 'latin-1', errors='ignore').decode('cp932', errors='ignore'))
-        except Exception:
-            pass
-        try:
-            candidates.append(bytes(text, 'cp932', errors='ignore').decode('utf-8', errors='ignore'))
-        except Exception:
-            pass
-
-        def score(t: str) -> int:
-            jp = sum(1 for ch in t if ('\u3040' <= ch <= '\u30ff') or ('\u4e00' <= ch <= '\u9fff'))
-            bad = t.count('\ufffd') + t.count('�')
-            ctrl = sum(1 for ch in t if ord(ch) < 32 and ch not in '\n\r\t')
-            return jp * 2 - bad * 2 - ctrl
-
-        best = max(candidates, key=score)
-        best = unicodedata.normalize('NFKC', best)
-        # Replace common broken punctuation
-        for k, v in {
-            'â€“': '–', 'â€”': '—', 'â€˜': "'", 'â€™': "'",
-            'â€œ': '"', 'â€': '"', 'â€¢': '•', 'â€¦': '…'
-        }.items():
-            best = best.replace(k, v)
-        best = re.sub(r"\s+", " ", best).strip()
-        return best
-    except Exception:
-        return text
-# Enhanced X Processing Integration
-try:
-    from enhanced_x_processor import EnhancedXProcessor
-    ENHANCED_X_AVAILABLE = True
-    print("✅ Enhanced X Processor: Integrated")
-except ImportError:
-    ENHANCED_X_AVAILABLE = False
-    print("⚠️ Enhanced X Processor: Using fallback")
-
-try:
-    from gemini_news_supplement import GeminiNewsSupplementer
-    GEMINI_SUPPLEMENT_AVAILABLE = True
-    print("✅ Gemini News Supplement: Available")
-except ImportError:
-    GEMINI_SUPPLEMENT_AVAILABLE = False
-    print("⚠️ Gemini News Supplement: Unavailable")
-
-import time
-from urllib.parse import urljoin
-
-# URL フィルター機能をインポート
-try:
-    from url_filter import filter_403_urls, is_403_url
-    print("✅ URL フィルター機能: 有効")
-except ImportError:
-    print("⚠️ URL フィルター機能: 無効")
-    def filter_403_urls(items):
-        return items
-    def is_403_url(url):
-        return False
+        value = getattr(importlib.import_module(module_name), name)
+        print(f"✅ {module_name}.{name}: available")
+        return value
+    except ImportError as e:
+        print(f"⚠️ {module_name}.{name}: unavailable ({e})")
+        return None
+
+
+def filter_403_urls(items):
+    """url_filter.filter_403_urls（URL フィルターが無ければそのまま返す）"""
+    fn = optional_import("url_filter", "filter_403_urls")
+    return fn(items) if fn else items
+
+
+def is_403_url(url):
+    """url_filter.is_403_url（URL フィルターが無ければ False）"""
+    fn = optional_import("url_filter", "is_403_url")
+    return fn(url) if fn else False
 
 # ---------- config (改善版) ----------
-def get_config():
-    """設定読み込み（改善版）"""
+def get_config(verbose: bool = True):
+    """設定読み込み（改善版）。verbose=False なら不正値の警告・デバッグ表示をしない"""
+    log = print if verbose else (lambda *args: None)
     config = {
         'hours_lookback': int(os.getenv("HOURS_LOOKBACK", "24")),
         'max_items_per_category': int(os.getenv("MAX_ITEMS_PER_CATEGORY", "8")),
@@ -118,6 +91,12 @@ def get_config():
         'gemini_supplement_enabled': os.getenv("GEMINI_SUPPLEMENT_ENABLED", "0") == "1",
         'gemini_supplement_min_items': int(os.getenv("GEMINI_SUPPLEMENT_MIN_ITEMS", "8")),
         'gemini_supplement_max_items': int(os.getenv("GEMINI_SUPPLEMENT_MAX_ITEMS", "3")),
+        'feed_fetch_workers': int(os.getenv("FEED_FETCH_WORKERS", "8")),
+        'feed_fetch_per_host': int(os.getenv("FEED_FETCH_PER_HOST", "2")),
+        'feed_cache_enabled': os.getenv("FEED_CACHE_ENABLED", "1") == "1",
+        'host_breaker_enabled': os.getenv("HOST_BREAKER_ENABLED", "1") == "1",
+        'x_incremental': os.getenv("X_INCREMENTAL", "1") == "1",
+        'build_from_snapshot': os.getenv("BUILD_FROM_SNAPSHOT", "0") == "1",
         'debug_mode': os.getenv("DEBUG_MODE", "0") == "1"
     }
 
@@ -127,103 +106,129 @@ def get_config():
 
     # 設定値の検証
     if config['hours_lookback'] < 1 or config['hours_lookback'] > 168:  # 1時間～1週間
-        print(f"[WARN] Invalid HOURS_LOOKBACK: {config['hours_lookback']}, using default 24")
+        log(f"[WARN] Invalid HOURS_LOOKBACK: {config['hours_lookback']}, using default 24")
         config['hours_lookback'] = 24
 
     if config['max_items_per_category'] < 1 or config['max_items_per_category'] > 20:
-        print(f"[WARN] Invalid MAX_ITEMS_PER_CATEGORY: {config['max_items_per_category']}, using default 8")
+        log(f"[WARN] Invalid MAX_ITEMS_PER_CATEGORY: {config['max_items_per_category']}, using default 8")
         config['max_items_per_category'] = 8
 
     if config['gemini_supplement_min_items'] < 1 or config['gemini_supplement_min_items'] > 20:
-        print(f"[WARN] Invalid GEMINI_SUPPLEMENT_MIN_ITEMS: {config['gemini_supplement_min_items']}, using default 8")
+        log(f"[WARN] Invalid GEMINI_SUPPLEMENT_MIN_ITEMS: {config['gemini_supplement_min_items']}, using default 8")
         config['gemini_supplement_min_items'] = 8
 
     if config['gemini_supplement_max_items'] < 0 or config['gemini_supplement_max_items'] > 10:
-        print(f"[WARN] Invalid GEMINI_SUPPLEMENT_MAX_ITEMS: {config['gemini_supplement_max_items']}, using default 3")
+        log(f"[WARN] Invalid GEMINI_SUPPLEMENT_MAX_ITEMS: {config['gemini_supplement_max_items']}, using default 3")
         config['gemini_supplement_max_items'] = 3
 
+    if config['feed_fetch_workers'] < 1 or config['feed_fetch_workers'] > 32:
+        log(f"[WARN] Invalid FEED_FETCH_WORKERS: {config['feed_fetch_workers']}, using default 8")
+        config['feed_fetch_workers'] = 8
+
+    if config['feed_fetch_per_host'] < 1 or config['feed_fetch_per_host'] > 8:
+        log(f"[WARN] Invalid FEED_FETCH_PER_HOST: {config['feed_fetch_per_host']}, using default 2")
+        config['feed_fetch_per_host'] = 2
+
     # デバッグモード表示
     if config['debug_mode']:
-        print("[DEBUG] Debug mode enabled")
+        log("[DEBUG] Debug mode enabled")
 
     return config
 
-# 設定読み込み
-CONFIG = get_config()
-
-# グローバル変数設定
-HOURS_LOOKBACK = CONFIG['hours_lookback']
-MAX_ITEMS_PER_CATEGORY = CONFIG['max_items_per_category']
-TRANSLATE_TO_JA = CONFIG['translate_to_ja']
-TRANSLATE_ENGINE = CONFIG['translate_engine']
-X_POSTS_CSV = CONFIG['x_posts_csv']
-BLUESKY_CSV = os.getenv("BLUESKY_OUTPUT", "_sources/bluesky_posts.csv")
-GEMINI_SUPPLEMENT_ENABLED = CONFIG['gemini_supplement_enabled']
-GEMINI_SUPPLEMENT_MIN_ITEMS = CONFIG['gemini_supplement_min_items']
-GEMINI_SUPPLEMENT_MAX_ITEMS = CONFIG['gemini_supplement_max_items']
-
 JST = timezone(timedelta(hours=9))
+CACHE_DIR = Path("_cache")
+CACHE_FILE = CACHE_DIR / "translations.jsonl"
+LEGACY_CACHE_FILE = CACHE_DIR / "translations.json"
+NEWS_SNAPSHOT_FILE = CACHE_DIR / "news_snapshot.jsonl.gz"
+BLUESKY_CSV = os.getenv("BLUESKY_OUTPUT", "_sources/bluesky_posts.csv")
+FEED_FETCH_TIMEOUT = 8  # フィード取得（fetch_and_parse）のタイムアウト（秒）
+
+
+def _apply_config(config):
+    """設定値をモジュールのグローバル変数に反映"""
+    global CONFIG, HOURS_LOOKBACK, MAX_ITEMS_PER_CATEGORY, TRANSLATE_TO_JA, TRANSLATE_ENGINE, X_POSTS_CSV
+    global GEMINI_SUPPLEMENT_ENABLED, GEMINI_SUPPLEMENT_MIN_ITEMS, GEMINI_SUPPLEMENT_MAX_ITEMS
+    global FEED_FETCH_WORKERS, FEED_FETCH_PER_HOST
+    CONFIG = config
+    HOURS_LOOKBACK = config['hours_lookback']
+    MAX_ITEMS_PER_CATEGORY = config['max_items_per_category']
+    TRANSLATE_TO_JA = config['translate_to_ja']
+    TRANSLATE_ENGINE = config['translate_engine']
+    X_POSTS_CSV = config['x_posts_csv']
+    GEMINI_SUPPLEMENT_ENABLED = config['gemini_supplement_enabled']
+    GEMINI_SUPPLEMENT_MIN_ITEMS = config['gemini_supplement_min_items']
+    GEMINI_SUPPLEMENT_MAX_ITEMS = config['gemini_supplement_max_items']
+    FEED_FETCH_WORKERS = config['feed_fetch_workers']
+    FEED_FETCH_PER_HOST = config['feed_fetch_per_host']
+
+
+def configure(config=None):
+    """
+    設定を読み込んで（不正値は警告してデフォルトに戻す）グローバル変数に反映し、NOW を現在時刻にする。
+    _cache/ を作り、フィードキャッシュ・ホスト健全性・X 取り込み状態を読み込む。
+    main と、build の関数を直接使うスクリプトが最初に 1 回呼ぶ
+    """
+    global NOW, FEED_CACHE, HOST_HEALTH, X_INGEST
+    _apply_config(config or get_config())
+    NOW = datetime.now(JST)
+    CACHE_DIR.mkdir(exist_ok=True)
+    FEED_CACHE = FeedCache(CACHE_DIR / "feeds.json", enabled=CONFIG['feed_cache_enabled'])
+    HOST_HEALTH = HostHealth(CACHE_DIR / "host_health.json", enabled=CONFIG['host_breaker_enabled'])
+    X_INGEST = XIngestState(CACHE_DIR / "x_ingest.json", enabled=CONFIG['x_incremental'])
+    return CONFIG
+
+
+# import 時は環境変数の値を警告なしで反映するだけ（ファイル・ディレクトリには触れない）。
+# 永続キャッシュは configure() まで無効
+_apply_config(get_config(verbose=False))
 NOW = datetime.now(JST)
+FEED_CACHE = FeedCache(CACHE_DIR / "feeds.json", enabled=False)
+HOST_HEALTH = HostHealth(CACHE_DIR / "host_health.json", enabled=False)
+X_INGEST = XIngestState(CACHE_DIR / "x_ingest.json", enabled=False)
+
+# 翻訳キャッシュは translation_cache.TranslationCache（追記型 JSON Lines）で共有する。
+# キーは正規化した要約本文のダイジェスト。旧 translations.json から link 単位で回収した訳文は
+# link_key(link) に入っており、同じ link の要約を次に表示したときに本文キーへ付け替える。
+translation_cache_key = text_key
+
+
+def get_cached_translation(cache, link: str, text: str):
+    """キャッシュから訳文を取得。旧形式から回収した訳文はここで本文キーへ付け替える"""
+    key = translation_cache_key(text)
+    cached = cache.get(key)
+    if cached:
+        return cached
+    legacy = cache.pop(link_key(link)) if link else None
+    if legacy:
+        cache.set(key, legacy)
+        return legacy
+    return None
+
+
+def put_cached_translation(cache, text: str, translated: str):
+    cache.set(translation_cache_key(text), translated)
 
-CACHE_DIR = Path("_cache")
-CACHE_DIR.mkdir(exist_ok=True)
-CACHE_FILE = CACHE_DIR / "translations.json"
 
 def load_cache():
-    """キャッシュ読み込み（改善版）"""
+    """キャッシュ読み込み（追記ログを再生。初回は旧 translations.json を取り込む）"""
     try:
-        if CACHE_FILE.exists():
-            cache_data = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
-            cache_size = len(cache_data)
-            print(f"[INFO] Loaded cache with {cache_size} entries")
-            return cache_data
-        else:
-            print("[INFO] No cache file found, starting fresh")
-    except (json.JSONDecodeError, UnicodeDecodeError) as e:
-        print(f"[WARN] Cache file corrupted: {e}")
+        return TranslationCache(CACHE_FILE, legacy_path=LEGACY_CACHE_FILE)
     except Exception as e:
         print(f"[ERROR] Failed to load cache: {e}")
-    return {}
-
-def save_cache(cache):
-    """キャッシュ保存（改善版）"""
-    backup_file = None
-    try:
-        CACHE_DIR.mkdir(exist_ok=True)
-
-        # キャッシュサイズチェック
-        cache_size = len(cache)
-        if cache_size > 10000:  # 10,000エントリ以上は警告
-            print(f"[WARN] Large cache detected ({cache_size} entries)")
+    return TranslationCache(CACHE_FILE, legacy_path=None, autoload=False)
 
-        # バックアップ作成
-        if CACHE_FILE.exists():
-            backup_file = CACHE_FILE.with_suffix('.json.backup')
-            CACHE_FILE.rename(backup_file)
 
-        # 新しいキャッシュを保存
-        CACHE_FILE.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8")
+TRANSLATION_CACHE = TranslationCache(CACHE_FILE, legacy_path=None, autoload=False)
 
-        # 保存確認
-        saved_size = len(json.loads(CACHE_FILE.read_text(encoding="utf-8")))
-        if saved_size == cache_size:
-            print(f"[SUCCESS] Cache saved with {cache_size} entries")
-        else:
-            print(f"[WARN] Cache size mismatch: expected {cache_size}, got {saved_size}")
-
-        # 古いバックアップ削除
-        if backup_file and backup_file.exists():
-            backup_file.unlink()
-
-    except Exception as e:
-        print(f"[ERROR] Failed to save cache: {e}")
-        # バックアップから復元
-        if backup_file and backup_file.exists():
-            backup_file.rename(CACHE_FILE)
-            print("[INFO] Restored cache from backup")
+def save_cache(cache):
+    """キャッシュ保存（期限切れ・上限超過を削除し、差分のみ追記）"""
+    cache.save()
 
 def advanced_feed_fetch(url, name):
     """高度なHTTPリクエストでフィード取得 - Google News 403エラー対策"""
+    import feedparser
+    import http_client
+    get_metrics().incr("advanced_fetch")
     
     # 複数のUser-Agentを用意
     user_agents = [
@@ -233,18 +238,26 @@ def advanced_feed_fetch(url, name):
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/121.0'
     ]
+
+    # 前回成功した User-Agent から試す。直近の取得が失敗しているホストは 1 つだけ試す
+    preferred = HOST_HEALTH.preferred(url)
+    if preferred.get("user_agent") in user_agents:
+        user_agents.remove(preferred["user_agent"])
+        user_agents.insert(0, preferred["user_agent"])
+    degraded = HOST_HEALTH.degraded(url)
+    if degraded:
+        user_agents = user_agents[:1]
     
     for i, user_agent in enumerate(user_agents):
         try:
             print(f"[INFO] Advanced fetch attempt {i+1}/{len(user_agents)} for {name}")
             
-            # セッションを作成して詳細ヘッダーを設定
-            session = requests.Session()
-            session.headers.update({
+            # 詳細ヘッダーを設定（接続は共有 HTTP クライアントのプールを再利用する）
+            headers = {
                 'User-Agent': user_agent,
                 'Accept': 'application/rss+xml, application/xml, text/xml, */*',
                 'Accept-Language': 'ja,en-US;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
+                'Accept-Encoding': http_client.ACCEPT_ENCODING,
                 'DNT': '1',
                 'Connection': 'keep-alive',
                 'Upgrade-Insecure-Requests': '1',
@@ -252,11 +265,11 @@ def advanced_feed_fetch(url, name):
                 'Sec-Fetch-Mode': 'navigate',
                 'Sec-Fetch-Site': 'none',
                 'Cache-Control': 'max-age=0'
-            })
+            }
             
             # Google NewsまたはGoogle系のURLの場合、追加のヘッダーを設定
             if 'google.com' in url or 'news.google.com' in url:
-                session.headers.update({
+                headers.update({
                     'Referer': 'https://news.google.com/',
                     'Origin': 'https://news.google.com',
                     'Sec-Fetch-User': '?1'
@@ -268,18 +281,32 @@ def advanced_feed_fetch(url, name):
                 print(f"[INFO] Google service detected, applying {delay:.1f}s delay")
                 time.sleep(delay)
             
-            # リクエスト実行
-            response = session.get(url, timeout=30, allow_redirects=True)
+            # リクエスト実行（保存済みの ETag / Last-Modified があれば条件付き）
+            headers.update(FEED_CACHE.request_headers(url))
+            response = http_client.get(url, timeout=30, allow_redirects=True, headers=headers)
             
-            if response.status_code == 200:
+            if response.status_code == 304:
+                cached = FEED_CACHE.cached_feed(url)
+                if cached is not None:
+                    print(f"[INFO] {name} not modified, using cached entries")
+                    get_metrics().incr("feed_not_modified")
+                    HOST_HEALTH.remember(url, "advanced", user_agent)
+                    return cached
+                continue
+            elif response.status_code == 200:
                 print(f"[SUCCESS] {name} fetched successfully with User-Agent {i+1}")
                 # feedparserに渡すためにBytesIOオブジェクトを作成
                 import io
                 feed_data = io.BytesIO(response.content)
                 d = feedparser.parse(feed_data)
+                FEED_CACHE.store(url, d,
+                                 etag=response.headers.get('ETag'),
+                                 modified=response.headers.get('Last-Modified'))
+                HOST_HEALTH.remember(url, "advanced", user_agent)
                 return d
             elif response.status_code == 403:
                 print(f"[WARN] 403 Forbidden with User-Agent {i+1} for {name}")
+                get_metrics().incr("http_403")
                 continue
             else:
                 print(f"[WARN] HTTP {response.status_code} with User-Agent {i+1} for {name}")
@@ -290,13 +317,21 @@ def advanced_feed_fetch(url, name):
             continue
     
     print(f"[ERROR] All advanced fetch attempts failed for {name}")
-    
-    # 最後の手段: Gemini Web Fetcherを使用
+
+    # 失敗が続いているホストでは、前回 Gemini で取れていない限り Gemini Web Fetcher を呼ばない
+    if degraded and preferred.get("method") != "gemini":
+        print(f"[INFO] Skipping Gemini Web Fetcher for failing host: {name}")
+        return None
+    return gemini_feed_fetch(url, name)
+
+def gemini_feed_fetch(url, name):
+    """最後の手段: Gemini Web Fetcher で記事を取得し、feedparser ライクなオブジェクトで返す"""
     try:
         from gemini_web_fetcher import GeminiWebFetcher
         fetcher = GeminiWebFetcher()
         if fetcher.analyzer.enabled:
             print(f"[INFO] Trying Gemini Web Fetcher for {name}...")
+            get_metrics().incr("gemini_web_fetch")
             news_items = fetcher.fetch_from_problematic_source(url, name)
             if news_items:
                 # feedparserライクなオブジェクトを作成
@@ -312,6 +347,7 @@ def advanced_feed_fetch(url, name):
                     fake_feed.entries.append(entry)
                 
                 print(f"[SUCCESS] Gemini fetched {len(news_items)} items for {name}")
+                HOST_HEALTH.remember(url, "gemini")
                 return fake_feed
     except ImportError:
         print(f"[WARN] Gemini Web Fetcher not available")
@@ -348,11 +384,18 @@ def language_label(code: str) -> str:
     }.get(code, "その他")
 
 class JaTranslator:
+    # 1リクエストあたりの文字数上限（deep-translator: Google 5000字 / MyMemory 500字）
+    BATCH_CHAR_LIMITS = {"google": 4500, "mymemory": 450}
+    # バッチ内の区切りマーカー。翻訳エンジンが数字と角括弧をそのまま残すことを利用する
+    BATCH_MARKER = "[[{}]]"
+    BATCH_MARKER_RE = re.compile(r"\[\[\s*(\d+)\s*\]\]")
+
     def __init__(self, engine="google"):
         self.engine = engine
         self._gt = None
         self._mm = None
         self.warned = False
+        self.batch_requests = 0
 
     def _google(self, text: str) -> str:
         if self._gt is None:
@@ -367,161 +410,160 @@ class JaTranslator:
             self._mm = MyMemoryTranslator(source="en-GB", target="ja-JP")
         return self._mm.translate(text)
 
+    def _engines(self):
+        """(主エンジン, フォールバック)。google / unknown -> google then mymemory"""
+        return ("mymemory", "google") if self.engine == "mymemory" else ("google", "mymemory")
+
+    def _call(self, engine: str, text: str) -> str:
+        return self._mymemory(text) if engine == "mymemory" else self._google(text)
+
+    def _translate_with_fallback(self, text: str) -> str:
+        """エンジン順に翻訳を試みる（失敗時は例外を送出）"""
+        primary, fallback = self._engines()
+        try:
+            return self._call(primary, text)
+        except Exception:
+            return self._call(fallback, text)
+
     def translate(self, text: str) -> str:
         if not text or looks_japanese(text):
             return text
         try:
-            if self.engine == "google":
-                try:
-                    return self._google(text)
-                except Exception:
-                    return self._mymemory(text)
-            elif self.engine == "mymemory":
-                try:
-                    return self._mymemory(text)
-                except Exception:
-                    return self._google(text)
-            else:
-                # unknown -> google then mymemory
-                try:
-                    return self._google(text)
-                except Exception:
-                    return self._mymemory(text)
+            return self._translate_with_fallback(text)
         except Exception as e:
             if not self.warned:
                 print(f"[WARN] translation disabled due to error: {e.__class__.__name__}: {e}")
                 self.warned = True
             return text
 
+    def _batch_limit(self, engine: str = None) -> int:
+        return self.BATCH_CHAR_LIMITS.get(engine or self.engine, self.BATCH_CHAR_LIMITS["google"])
+
+    def _pack_batches(self, indexed_texts, limit: int = None):
+        """(index, text) の列を文字数上限（省略時は主エンジンの上限）に収まるバッチに詰める。上限超えの単体は単独バッチ"""
+        limit = limit or self._batch_limit()
+        batch, size = [], 0
+        for idx, text in indexed_texts:
+            cost = len(text) + len(self.BATCH_MARKER.format(len(batch))) + 2
+            if batch and size + cost > limit:
+                yield batch
+                batch, size = [], 0
+            batch.append((idx, text))
+            size += cost
+        if batch:
+            yield batch
+
+    def _translate_packed(self, batch, engine: str):
+        """1バッチを engine への1リクエストで翻訳。区切りが崩れた場合は None（エンジンの失敗は例外を送出）"""
+        packed = "\n".join(
+            f"{self.BATCH_MARKER.format(pos)}\n{text}" for pos, (_, text) in enumerate(batch)
+        )
+        self.batch_requests += 1
+        translated = self._call(engine, packed)
+        if not translated:
+            return None
+        parts = self.BATCH_MARKER_RE.split(translated)
+        # parts = [前置き, "0", 訳0, "1", 訳1, ...]
+        if parts[0].strip() or len(parts) != 2 * len(batch) + 1:
+            return None
+        results = []
+        for pos in range(len(batch)):
+            if parts[1 + 2 * pos] != str(pos):
+                return None
+            results.append(re.sub(r"\s+", " ", parts[2 + 2 * pos]).strip())
+        if not all(results):
+            return None
+        return results
+
+    def translate_batch(self, texts):
+        """複数テキストをまとめて翻訳する。戻り値は texts と同じ長さのリスト。
+        主エンジンで失敗したバッチはフォールバックエンジンの上限で詰め直して送り、
+        区切りマーカーを含むテキスト・上限超えのテキスト・区切りが崩れたバッチは1件ずつ翻訳する"""
+        results = list(texts)
+        pending = []
+        for idx, text in enumerate(texts):
+            if not text or looks_japanese(text):
+                continue
+            if self.BATCH_MARKER_RE.search(text) or len(text) > self._batch_limit():
+                results[idx] = self.translate(text)
+                continue
+            pending.append((idx, re.sub(r"\s+", " ", text).strip()))
+
+        primary, fallback = self._engines()
+        for batch in self._pack_batches(pending):
+            translated = None
+            if len(batch) > 1:
+                try:
+                    translated = self._translate_packed(batch, primary)
+                except Exception as e:
+                    print(f"[WARN] Batch translation failed ({len(batch)} items): {e.__class__.__name__}: {e}")
+                    # フォールバックエンジンは上限が違う（MyMemory 450字）ので詰め直してから送る
+                    translated = self._translate_repacked(batch, fallback)
+                if translated is None:
+                    print(f"[INFO] Falling back to per-item translation for {len(batch)} items")
+            if translated is None:
+                translated = [self.translate(texts[idx]) for idx, _ in batch]
+            for (idx, _), ja in zip(batch, translated):
+                results[idx] = ja
+        return results
+
+    def _translate_repacked(self, batch, engine: str):
+        """主エンジンで失敗したバッチを engine の文字数上限で詰め直して翻訳。
+        失敗・区切り崩れの小バッチは1件ずつ翻訳する"""
+        limit = self._batch_limit(engine)
+        print(f"[INFO] Retrying {len(batch)} items with {engine} in batches of up to {limit} chars")
+        results = []
+        for part in self._pack_batches(batch, limit):
+            translated = None
+            if len(part) > 1:
+                try:
+                    translated = self._translate_packed(part, engine)
+                except Exception as e:
+                    print(f"[WARN] Batch translation failed ({len(part)} items): {e.__class__.__name__}: {e}")
+            results.extend(translated or [self.translate(text) for _, text in part])
+        return results
+
 # ---------- X (Twitter) post injection ----------
 def _read_csv_bytes(path_or_url: str) -> bytes:
     if re.match(r'^https?://', path_or_url, re.I):
-        # requestsを使用してエンコーディングを適切に処理
-        import requests
-        response = requests.get(path_or_url, timeout=30)
+        import http_client
+        # requestsを使用してエンコーディングを適切に処理（共有 HTTP クライアント）
+        response = http_client.get(path_or_url, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'  # UTF-8を明示的に設定
         return response.content
     with open(path_or_url, 'rb') as f:
         return f.read()
 
-def _extract_x_data_from_csv(raw: bytes) -> list[dict]:
-    # 文字コード自動判定(UTF-8 BOM優先→UTF-8→CP932)
-    for enc in ('utf-8-sig','utf-8','cp932'):
-        try:
-            txt = raw.decode(enc)
-            break
-        except Exception:
-            continue
-    else:
-        txt = raw.decode('utf-8', errors='ignore')
+def _x_post_records(posts) -> list[dict]:
+    """共通パーサー(x_csv_parser)の XPost を build 用の dict に変換"""
+    data = []
+    for post in posts:
+        tweet_url = post.url
+        if not tweet_url:
+            # 最後の手段：ユーザーページのURLを使用
+            username_clean = post.username.replace('@', '').replace('"', '')
+            tweet_url = f"https://x.com/{username_clean}" if username_clean else "https://x.com"
+        data.append({
+            'url': tweet_url,
+            'username': post.username,
+            'text': post.text,
+            'datetime': post.dt,
+            'debug_info': f"Row {post.row}: {post.date_str} | {post.username} | {post.text[:50]}..."
+        })
+    return data
 
+def _extract_x_data_from_csv(raw: bytes) -> list[dict]:
     # CSV形式: "日付", "@ユーザー", "テキスト", "画像URL", "ツイートURL"
     data = []
     try:
-        rdr = csv.reader(io.StringIO(txt))
-        row_count = 0
-        for row in rdr:
-            row_count += 1
-            if row_count == 1:  # ヘッダー行をスキップ
-                continue
-                
-            if len(row) >= 3:  # 最低3列あれば処理
-                date_str = row[0].strip('"').strip() if len(row) > 0 else ""
-                username = row[1].strip('"').strip() if len(row) > 1 else ""
-                text = row[2].strip('"').strip() if len(row) > 2 else ""
-                tweet_url = row[4].strip('"').strip() if len(row) > 4 else ""
-                
-                # HTMLエンティティをデコード
-                text = html.unescape(text)
-                username = html.unescape(username)
-                
-                # 追加の文字化け対策
-                # 全角文字の正規化
-                import unicodedata
-                text = unicodedata.normalize('NFKC', text)
-                username = unicodedata.normalize('NFKC', username)
-                
-                # 不正な文字や制御文字を除去
-                text = ''.join(char for char in text if char.isprintable() or char in '\n\r\t')
-                
-                # 連続する空白を正規化
-                text = repair_mojibake(text)
-                text = re.sub(r'\s+', ' ', text).strip()
-                
-                # URL抽出を改善（テキストからも検索）
-                if not tweet_url:
-                    # テキスト内からX/TwitterのURLを抽出
-                    url_matches = re.findall(r'https?://(?:x\.com|twitter\.com)/[^\s,;"\']+', text)
-                    if url_matches:
-                        tweet_url = url_matches[0]  # 最初に見つかったURLを使用
-                        print(f"[DEBUG] URL extracted from text: {tweet_url}")
-                    
-                    # まだURLがない場合、全ての列からURL検索
-                    if not tweet_url and len(row) > 3:
-                        for col_idx in range(len(row)):
-                            col_content = row[col_idx].strip('"').strip()
-                            col_url_matches = re.findall(r'https?://(?:x\.com|twitter\.com)/[^\s,;"\']+', col_content)
-                            if col_url_matches:
-                                tweet_url = col_url_matches[0]
-                                print(f"[DEBUG] URL found in column {col_idx}: {tweet_url}")
-                                break
-                    
-                    # 最後の手段：ダミーURLを生成
-                    if not tweet_url:
-                        if username:
-                            username_clean = username.replace('@', '').replace('"', '')
-                            tweet_url = f"https://x.com/{username_clean}"  # statusを削除
-                        else:
-                            tweet_url = "https://x.com"  # より安全なフォールバック
-                
-                # 有効なテキストがあれば処理（条件を大幅に緩和）
-                if text and len(text.strip()) > 5:  # 5文字以上あれば処理
-                    # デバッグ出力: 投稿データの詳細を表示
-                    print(f"[DEBUG] Processing post: user={username}, text_len={len(text)}, text='{text[:50]}...'")
-                    
-                    # 日付をパース（複数フォーマットに対応）
-                    dt = None
-                    # 複数の日付フォーマットを試す
-                    date_formats = [
-                        "%B %d, %Y at %I:%M%p",  # "August 10, 2025 at 02:41AM"
-                        "%B %d, %Y",             # "August 13, 2025"
-                        "%Y-%m-%d %H:%M:%S",     # "2025-08-18 14:30:00"
-                        "%Y-%m-%d",              # "2025-08-18"
-                        "%Y年%m月%d日",           # "2025年8月18日"
-                        "%m/%d/%Y",              # "8/18/2025"
-                    ]
-                    for fmt in date_formats:
-                        try:
-                            dt = datetime.strptime(date_str, fmt)
-                            dt = dt.replace(tzinfo=JST)  # JSTとして扱う
-                            break
-                        except:
-                            continue
-                    
-                    # パースに失敗した場合はスキップ（古い投稿が最新扱いされるのを防止）
-                    if dt is None:
-                        print(f"[WARN] Date parse failed for '{date_str}', skipping post (username={username})")
-                        continue
-                    
-                    # 常に投稿を追加（デバッグ情報も含む）
-                    data.append({
-                        'url': tweet_url,
-                        'username': username,
-                        'text': text,
-                        'datetime': dt,
-                        'debug_info': f"Row {row_count}: {date_str} | {username} | {text[:50]}..."
-                    })
-                    print(f"[DEBUG] Added X post {len(data)}: {username} -> {tweet_url}")
-                    print(f"[DEBUG] Text preview: {text[:100]}...")
-                else:
-                    print(f"[DEBUG] Skipping invalid post: user={username}, text_len={len(text) if text else 0}")
+        data = _x_post_records(parse_x_csv(raw, min_text_len=6))  # 5文字超のみ
     except Exception as e:
         print(f"[WARN] CSV parsing error: {e}")
-        pass
 
     # 古い形式のフォールバック（URL抽出のみ）
     if not data:
+        txt = raw.decode('utf-8', errors='ignore')
         urls = re.findall(r'https?://(?:x|twitter)\.com/[^\s,"]+', txt)
         for url in urls:
             data.append({
@@ -554,15 +596,28 @@ def _author_from_url(u: str) -> str:
         return 'X'
 
 
+X_ENHANCED_MAX_POSTS = 25  # Enhanced X 処理で返す投稿数（前回までの投稿とのマージ後に適用）
+
 def enhanced_gather_x_posts_implementation(csv_path: str) -> list[dict]:
     """Enhanced X Posts - 重複除去とGemini強化"""
-    if ENHANCED_X_AVAILABLE:
+    EnhancedXProcessor = optional_import("enhanced_x_processor", "EnhancedXProcessor")
+    if EnhancedXProcessor:
         try:
             processor = EnhancedXProcessor()
-            posts = processor.process_x_posts(csv_path, max_posts=25)
+            # 前回実行以降に追加された行だけを重複除去・Gemini強化し、処理済みの投稿とマージ
+            cutoff = NOW - timedelta(hours=HOURS_LOOKBACK * 2)
+            rows, window = X_INGEST.read_rows(csv_path, "enhanced", cutoff)
+            # ウォーターマークは読んだ行の末尾まで進むので、新規行はここで全件処理する
+            # （途中で打ち切ると残りの行は次回以降も読まれない）。件数はマージ後に絞る
+            posts = processor.process_x_posts(
+                rows, max_posts=len(rows), known_texts=[item.get('_full_text', '') for item in window]
+            )
+            processor.close()  # Gemini 強化はここまで（接続とイベントループを閉じる）
+            build_items = X_INGEST.commit(csv_path, "enhanced", processor.convert_to_build_format(posts), cutoff,
+                                          limit=X_ENHANCED_MAX_POSTS)
+            build_items.sort(key=lambda x: x.get('_priority', 0), reverse=True)
             
-            if posts:
-                build_items = processor.convert_to_build_format(posts)
+            if build_items:
                 print(f"✅ Enhanced X処理: {len(build_items)}件 (重複除去・Gemini強化済み)")
                 
                 # 統計表示
@@ -682,13 +737,21 @@ def original_gather_x_posts(csv_path: str) -> list[dict]:
         print(f"[INFO] Loading X posts from local file: {csv_path}")
     items = []
     try:
-        raw = _read_csv_bytes(csv_path)
-        x_data = _extract_x_data_from_csv(raw)
+        # 時間窓(LOOKBACK×2)より古い行は正規化前に捨て、前回実行以降に追加された行だけを処理
+        cutoff = NOW - timedelta(hours=HOURS_LOOKBACK * 2)
+        rows, window = X_INGEST.read_rows(csv_path, "original", cutoff, min_text_len=6)  # 5文字超のみ
+        x_data = _x_post_records(rows)
         print(f"[INFO] Extracted {len(x_data)} X posts from CSV.")
         
-        # 重複除去のためのセット
-        seen_urls = set()
-        seen_username_text = set()
+        # 重複除去のためのセット（処理済みの投稿も含める）
+        seen_urls = {item['link'] for item in window}
+        seen_username_text = {
+            f"{item['title'].removeprefix('Xポスト ')}:{item.get('_full_text', '')[:50]}" for item in window
+        }
+        # 言い回しだけ違う投稿（引用・再投稿）は MinHash/LSH の近似重複で除外
+        similar_index = NearDuplicateIndex()
+        for item in window:
+            similar_index.add(item['link'], item.get('_full_text', ''))
         
         for data in x_data:
             url = data['url']
@@ -710,6 +773,11 @@ def original_gather_x_posts(csv_path: str) -> list[dict]:
                 print(f"[DEBUG] Skipping duplicate content from {username}")
                 continue
             
+            # 3. 内容がほぼ同じ投稿は除外（類似が無ければここで索引に登録）
+            if similar_index.add_if_new(url, full_text) is not None:
+                print(f"[DEBUG] Skipping similar content from {username}")
+                continue
+            
             # 重複チェックを通過した投稿のみ追加
             seen_urls.add(url)
             seen_username_text.add(username_text_key)
@@ -726,6 +794,7 @@ def original_gather_x_posts(csv_path: str) -> list[dict]:
                     "_dt": post_date,  # 実際の投稿日時を使用
                 })
         
+        items = X_INGEST.commit(csv_path, "original", items, cutoff)
         print(f"[INFO] Created {len(items)} X post items (filtered to {HOURS_LOOKBACK*2}h).")
     except Exception as e:
         print(f"[WARN] Failed to process X posts CSV: {e}")
@@ -793,7 +862,7 @@ CARD_TMPL = """
     <p class="news-card__summary">{summary}</p>
     <div class="news-card__taglist">
 {tags_html}
-    </div>
+    </div>{also_covered_html}
   </div>
   <footer class="news-card__footer">
     <dl class="news-card__details">
@@ -862,6 +931,7 @@ def pick_summary(entry) -> str:
     return clean_html(entry.get("title", ""))
 
 def parse_feeds():
+    import yaml
     raw = yaml.safe_load(Path("feeds.yml").read_text(encoding="utf-8"))
     return raw or {}
 
@@ -892,6 +962,176 @@ GOVERNANCE_KEYWORDS = frozenset([
     '規制', '政策', 'コンプライアンス', '倫理', 'ガバナンス', '法律'
 ])
 
+# AI関連度: 高関連度キーワード（これらがあれば必ず含める）
+AI_HIGH_RELEVANCE_KEYWORDS = [
+    'artificial intelligence', 'machine learning', 'deep learning', 'neural network',
+    'gpt', 'llm', 'large language model', 'transformer', 'bert', 'claude',
+    'chatgpt', 'gemini', 'copilot', 'anthropic', 'openai', 'deepmind',
+    'computer vision', 'natural language processing', 'nlp', 'reinforcement learning',
+    'generative ai', 'ai model', 'ai research', 'ai breakthrough',
+    '人工知能', '機械学習', 'ディープラーニング', 'ニューラルネット',
+    '人工知能', '機械学習', 'ディープラーニング', 'ニューラルネット',
+    'ＡＩ', 'AI', 'ML', 'DL', '生成AI', 'ジェネレーティブAI',
+    'チャットGPT', 'ChatGPT', 'GPT', 'LLM', '大規模言語モデル',
+    'Claude', 'Gemini', 'Copilot', 'Bard',
+    '自然言語処理', 'コンピュータビジョン', '画像認識', '音声認識',
+    'ロボティクス', '自動運転', '予測分析', 'データサイエンス',
+    'アルゴリズム', '最適化', 'レコメンデーション',
+    'スタートアップ', '資金調達', '投資', 'ファンド', 'IPO', 'M&A',
+    'ソフトバンク', 'トヨタ', 'NTT', 'ソニー', '日立', '富士通', 'NEC',
+    'パナソニック', '楽天', 'リクルート', 'メルカリ', 'LINE',
+]
+
+# AI関連度: 中関連度キーワード（複数あれば含める）
+AI_MEDIUM_RELEVANCE_KEYWORDS = [
+    'algorithm', 'automation', 'robot', 'autonomous', 'prediction',
+    'data science', 'analytics', 'intelligent', 'smart system',
+    'cognitive', 'inference', 'classification', 'recognition',
+    'generation', 'synthesis', 'optimization', 'recommendation',
+    'アルゴリズム', '自動化', 'ロボット', '自律', '予測',
+    'データサイエンス', '分析', 'インテリジェント', 'スマート',
+    '認識', '生成', '最適化', 'レコメンド'
+]
+
+# AI関連度: 除外キーワード（これらがあれば除外）
+AI_EXCLUDE_KEYWORDS = [
+    'cryptocurrency', 'crypto', 'blockchain', 'bitcoin', 'nft',
+    'gaming', 'game', 'sports', 'entertainment', 'music', 'movie',
+    'politics', 'political', 'election', 'government policy',
+    'weather', 'climate change', 'environmental',
+    '暗号通貨', 'ゲーム', 'スポーツ', '娯楽', '音楽', '映画',
+    '暗号通貨', 'ゲーム', 'スポーツ', '娯楽', '音楽', '映画',
+    '政治', '選挙', '天気', '気候変動', '環境',
+    'アニメ', 'マンガ', '芸能', 'タレント', 'アイドル',
+    '恋愛', '結婚', 'グルメ', '料理', '旅行', 'ファッション'
+]
+
+# 重要度: 企業・組織の重要度（大手企業ほど高スコア、表の先頭から最初のヒットのみ適用）
+MAJOR_COMPANY_POINTS = {
+    'openai': 100, 'anthropic': 100, 'google': 90, 'microsoft': 90,
+    'meta': 85, 'nvidia': 85, 'apple': 80, 'amazon': 80,
+    'tesla': 75, 'deepmind': 95, 'cohere': 70, 'hugging face': 70,
+    'mistral': 65, 'stability ai': 65, 'midjourney': 60
+}
+
+# 重要度: 重要キーワード（画期的な発表ほど高スコア）
+HIGH_IMPACT_POINTS = {
+    'breakthrough': 80, 'launch': 70, 'release': 65, 'announce': 60,
+    'unveil': 75, 'introduce': 60, 'partnership': 55, 'acquisition': 85,
+    'funding': 70, 'investment': 65, 'ipo': 90, 'valuation': 60,
+    'gpt-5': 100, 'gpt-4': 80, 'claude': 70, 'gemini': 70,
+    'billion': 75, 'million': 50, 'record': 65, 'first': 60
+}
+
+# 重要度: ソースの信頼性・影響力（最初のヒットのみ適用）
+SOURCE_CREDIBILITY_POINTS = {
+    'techcrunch': 80, 'bloomberg': 90, 'reuters': 85, 'wsj': 85,
+    'financial times': 80, 'the verge': 70, 'wired': 70,
+    'mit technology review': 85, 'nature': 95, 'science': 95,
+    'anthropic': 90, 'openai': 90, 'google': 85, 'meta': 80
+}
+
+# 重要度: 技術的重要度
+TECH_IMPORTANCE_POINTS = {
+    'artificial general intelligence': 100, 'agi': 100,
+    'multimodal': 70, 'reasoning': 60, 'safety': 65,
+    'alignment': 70, 'robotics': 60, 'autonomous': 55,
+    'quantum': 70, 'neural network': 50, 'transformer': 60
+}
+
+# SNS重要度: 企業・組織アカウントの重要度（公式アカウントほど高スコア、最初のヒットのみ適用）
+SNS_ACCOUNT_POINTS = {
+    '@openai': 100, '@anthropic': 100, '@google': 90, '@microsoft': 90,
+    '@meta': 85, '@nvidia': 85, '@apple': 80, '@amazon': 80,
+    '@deepmind': 95, '@huggingface': 80, '@langchainai': 75,
+    '@cohereai': 70, '@stabilityai': 70, '@midjourney': 65,
+    # 日本企業アカウント
+    '@softbank': 80, '@toyota': 75, '@nttcom': 70, '@sony': 70,
+    '@hitachi_ltd': 65, '@fujitsu_global': 65, '@nec_corp': 65,
+    '@rakuten': 60, '@recruit_jp': 55, '@mercari_jp': 50,
+    # AI研究者・インフルエンサー
+    '@ylecun': 90, '@karpathy': 90, '@jeffdean': 85, '@goodfellow_ian': 85,
+    '@elonmusk': 75, '@satyanadella': 80, '@sundarpichai': 80,
+    '@sama': 95, '@darioacemoglu': 80, '@fchollet': 85,
+    '@hardmaru': 75, '@adcock_brett': 70, '@minimaxir': 65,
+    # 日本のAI研究者・インフルエンサー
+    '@karaage0703': 70, '@shi3z': 65, '@yukihiko_n': 60,
+    '@npaka': 65, '@ohtaman': 60, '@toukubo': 55,
+    # その他の著名人
+    '@windsurf': 60, '@oikon48': 55, '@godofprompt': 50,
+    '@newsfromgoogle': 70, '@suh_sunaneko': 50, '@pop_ikeda': 45
+}
+
+# SNS重要度: コンテンツの重要度（技術的な内容ほど高スコア）
+SNS_VALUE_POINTS = {
+    'breakthrough': 50, 'release': 40, 'launch': 40, 'announce': 35,
+    'gpt-5': 80, 'gpt-4': 60, 'claude': 50, 'gemini': 50,
+    'research': 40, 'paper': 35, 'model': 30, 'ai': 20,
+    'artificial intelligence': 40, 'machine learning': 35,
+    'deep learning': 35, 'neural network': 30,
+    # 日本語キーワード
+    '人工知能': 35, '機械学習': 30, 'ディープラーニング': 30,
+    '生成ai': 45, 'chatgpt': 40, '大規模言語モデル': 35,
+    '研究': 30, '論文': 25, 'モデル': 20, 'ブレークスルー': 45,
+    '資金調達': 40, '投資': 35, 'スタートアップ': 30
+}
+
+# SNS重要度: エンゲージメント指標
+SNS_ENGAGEMENT_POINTS = {
+    'thread': 15, 'important': 20, 'must read': 25, 'breaking': 30,
+    'update': 10, 'new': 15, 'latest': 10, 'just': 10,
+    '重要': 20, '必見': 25, '最新': 10, '速報': 30, '更新': 10,
+    '解決': 20, 'ついに': 15, '問題': 10
+}
+
+# ソース種別の判定キーワード（categorize_source で上から順に判定）
+OFFICIAL_SOURCE_KEYWORDS = ['openai', 'anthropic', 'google', 'microsoft', 'meta', 'nvidia', 'amazon', 'apple', 'deepmind']
+RESEARCH_SOURCE_KEYWORDS = ['arxiv', 'nature', 'science', 'university', 'laboratory', 'lab', '研究', '論文']
+MEDIA_SOURCE_KEYWORDS = [
+    'techcrunch', 'venturebeat', 'the verge', 'wired', 'bloomberg', 'reuters', 'forbes', 'cnbc', 'axios',
+    'financial times', 'ainow', 'ledge.ai', 'generative ai media', 'businessinsider', '日経', 'itmedia',
+    'publickey', 'techno-edge', 'g-gen'
+]
+COMMUNITY_SOURCE_KEYWORDS = ['reddit', 'github', 'x / sns', 'x.com', 'twitter', 'note', 'はてな', 'zenn']
+PRESS_SOURCE_KEYWORDS = ['press', 'pr times']
+
+# 記事本文（タイトル+要約）・ソース名・アカウント名それぞれの全キーワード表を1つのマッチャーにまとめる
+# （1テキストにつき1回の走査で、関連度判定・重要度スコア・分類のヒットをすべて取り出す）
+CONTENT_MATCHER = KeywordMatcher({
+    'ai_high': AI_HIGH_RELEVANCE_KEYWORDS,
+    'ai_medium': AI_MEDIUM_RELEVANCE_KEYWORDS,
+    'ai_exclude': AI_EXCLUDE_KEYWORDS,
+    'company': MAJOR_COMPANY_POINTS,
+    'impact': HIGH_IMPACT_POINTS,
+    'tech': TECH_IMPORTANCE_POINTS,
+    'sns_value': SNS_VALUE_POINTS,
+    'sns_engagement': SNS_ENGAGEMENT_POINTS,
+    'investment': INVESTMENT_KEYWORDS,
+    'strategy': STRATEGY_KEYWORDS,
+    'governance': GOVERNANCE_KEYWORDS,
+})
+
+SOURCE_MATCHER = KeywordMatcher({
+    'credibility': SOURCE_CREDIBILITY_POINTS,
+    'official': OFFICIAL_SOURCE_KEYWORDS,
+    'research': RESEARCH_SOURCE_KEYWORDS,
+    'media': MEDIA_SOURCE_KEYWORDS,
+    'community': COMMUNITY_SOURCE_KEYWORDS,
+    'press': PRESS_SOURCE_KEYWORDS,
+})
+
+# "@openai" を含むユーザー名は "openai" も含むため、@ を外した名前だけで判定すれば十分
+ACCOUNT_MATCHER = KeywordMatcher({
+    'accounts': {account.replace('@', ''): points for account, points in SNS_ACCOUNT_POINTS.items()},
+})
+
+
+@lru_cache(maxsize=4096)
+def scan_content(content: str):
+    """小文字化済みのタイトル+要約を走査（同じ記事の関連度判定・スコア計算・分類で結果を共有）"""
+    return CONTENT_MATCHER.scan(content)
+
+
 def categorize_business_news(item, feeds_info):
     """ビジネスニュースをサブカテゴリに分類（最適化版）"""
     try:
@@ -904,12 +1144,13 @@ def categorize_business_news(item, feeds_info):
         if business_category in ['strategy', 'investment', 'japan_business', 'governance']:
             return business_category
 
-        # キーワードベースの高速分類（set lookup）
-        if any(kw in content for kw in INVESTMENT_KEYWORDS):
+        # キーワードベースの高速分類（1回の走査結果を参照）
+        hits = scan_content(content)
+        if hits.any('investment'):
             return 'investment'
-        if any(kw in content for kw in STRATEGY_KEYWORDS):
+        if hits.any('strategy'):
             return 'strategy'
-        if any(kw in content for kw in GOVERNANCE_KEYWORDS):
+        if hits.any('governance'):
             return 'governance'
 
         return 'general'
@@ -951,68 +1192,18 @@ def is_ai_relevant(title: str, summary: str) -> bool:
     AIに関連性の高いコンテンツかどうかを判定
     より厳格なフィルタリングで質の高いニュースのみを選別
     """
-    content = f"{title} {summary}".lower()
-    
-    # 高関連度キーワード（これらがあれば必ず含める）
-    high_relevance = [
-        'artificial intelligence', 'machine learning', 'deep learning', 'neural network',
-        'gpt', 'llm', 'large language model', 'transformer', 'bert', 'claude',
-        'chatgpt', 'gemini', 'copilot', 'anthropic', 'openai', 'deepmind',
-        'computer vision', 'natural language processing', 'nlp', 'reinforcement learning',
-        'generative ai', 'ai model', 'ai research', 'ai breakthrough',
-        '人工知能', '機械学習', 'ディープラーニング', 'ニューラルネット',
-                '人工知能', '機械学習', 'ディープラーニング', 'ニューラルネット',
-        'ＡＩ', 'AI', 'ML', 'DL', '生成AI', 'ジェネレーティブAI',
-        'チャットGPT', 'ChatGPT', 'GPT', 'LLM', '大規模言語モデル',
-        'Claude', 'Gemini', 'Copilot', 'Bard',
-        '自然言語処理', 'コンピュータビジョン', '画像認識', '音声認識',
-        'ロボティクス', '自動運転', '予測分析', 'データサイエンス',
-        'アルゴリズム', '最適化', 'レコメンデーション',
-        'スタートアップ', '資金調達', '投資', 'ファンド', 'IPO', 'M&A',
-        'ソフトバンク', 'トヨタ', 'NTT', 'ソニー', '日立', '富士通', 'NEC',
-        'パナソニック', '楽天', 'リクルート', 'メルカリ', 'LINE',
-    ]
-    
-    # 中関連度キーワード（複数あれば含める）
-    medium_relevance = [
-        'algorithm', 'automation', 'robot', 'autonomous', 'prediction',
-        'data science', 'analytics', 'intelligent', 'smart system',
-        'cognitive', 'inference', 'classification', 'recognition',
-        'generation', 'synthesis', 'optimization', 'recommendation',
-        'アルゴリズム', '自動化', 'ロボット', '自律', '予測',
-        'データサイエンス', '分析', 'インテリジェント', 'スマート',
-        '認識', '生成', '最適化', 'レコメンド'
-    ]
-    
-    # 除外キーワード（これらがあれば除外）
-    exclude_keywords = [
-        'cryptocurrency', 'crypto', 'blockchain', 'bitcoin', 'nft',
-        'gaming', 'game', 'sports', 'entertainment', 'music', 'movie',
-        'politics', 'political', 'election', 'government policy',
-        'weather', 'climate change', 'environmental',
-        '暗号通貨', 'ゲーム', 'スポーツ', '娯楽', '音楽', '映画',
-                '暗号通貨', 'ゲーム', 'スポーツ', '娯楽', '音楽', '映画',
-        '政治', '選挙', '天気', '気候変動', '環境',
-        'アニメ', 'マンガ', '芸能', 'タレント', 'アイドル',
-        '恋愛', '結婚', 'グルメ', '料理', '旅行', 'ファッション'
-    ]
+    hits = scan_content(f"{title} {summary}".lower())
     
     # 除外キーワードチェック
-    for keyword in exclude_keywords:
-        if keyword in content:
-            return False
+    if hits.any('ai_exclude'):
+        return False
     
     # 高関連度キーワードチェック
-    high_score = sum(1 for keyword in high_relevance if keyword in content)
-    if high_score >= 1:
+    if hits.count('ai_high') >= 1:
         return True
     
     # 中関連度キーワードチェック（2つ以上で採用）
-    medium_score = sum(1 for keyword in medium_relevance if keyword in content)
-    if medium_score >= 2:
-        return True
-    
-    return False
+    return hits.count('ai_medium') >= 2
 
 
 def calculate_importance_score(item):
@@ -1023,60 +1214,26 @@ def calculate_importance_score(item):
     title = item.get("title", "").lower()
     summary = item.get("_summary", "").lower()
     source = item.get("_source", "").lower()
-    content = f"{title} {summary}"
+    hits = scan_content(f"{title} {summary}")
+    source_hits = SOURCE_MATCHER.scan(source)
     
     score = 0
     
-    # 1. 企業・組織の重要度（大手企業ほど高スコア）
-    major_companies = {
-        'openai': 100, 'anthropic': 100, 'google': 90, 'microsoft': 90,
-        'meta': 85, 'nvidia': 85, 'apple': 80, 'amazon': 80,
-        'tesla': 75, 'deepmind': 95, 'cohere': 70, 'hugging face': 70,
-        'mistral': 65, 'stability ai': 65, 'midjourney': 60
-    }
+    # 1. 企業・組織の重要度（大手企業ほど高スコア、最初のヒットのみ適用）
+    company = hits.first('company')
+    if company:
+        score += company[1]
     
-    for company, points in major_companies.items():
-        if company in content:
-            score += points
-            break  # 最高スコアのみ適用
+    # 2. 重要キーワード（重複を避けるため0.5倍）
+    score += hits.total('impact') * 0.5
     
-    # 2. 重要キーワード（画期的な発表ほど高スコア）
-    high_impact_keywords = {
-        'breakthrough': 80, 'launch': 70, 'release': 65, 'announce': 60,
-        'unveil': 75, 'introduce': 60, 'partnership': 55, 'acquisition': 85,
-        'funding': 70, 'investment': 65, 'ipo': 90, 'valuation': 60,
-        'gpt-5': 100, 'gpt-4': 80, 'claude': 70, 'gemini': 70,
-        'billion': 75, 'million': 50, 'record': 65, 'first': 60
-    }
-    
-    for keyword, points in high_impact_keywords.items():
-        if keyword in content:
-            score += points * 0.5  # 重複を避けるため0.5倍
-    
-    # 3. ソースの信頼性・影響力
-    source_credibility = {
-        'techcrunch': 80, 'bloomberg': 90, 'reuters': 85, 'wsj': 85,
-        'financial times': 80, 'the verge': 70, 'wired': 70,
-        'mit technology review': 85, 'nature': 95, 'science': 95,
-        'anthropic': 90, 'openai': 90, 'google': 85, 'meta': 80
-    }
-    
-    for src, points in source_credibility.items():
-        if src in source:
-            score += points * 0.3  # ソース信頼性は30%の重み
-            break
+    # 3. ソースの信頼性・影響力（30%の重み）
+    credibility = source_hits.first('credibility')
+    if credibility:
+        score += credibility[1] * 0.3
     
     # 4. 技術的重要度
-    tech_importance = {
-        'artificial general intelligence': 100, 'agi': 100,
-        'multimodal': 70, 'reasoning': 60, 'safety': 65,
-        'alignment': 70, 'robotics': 60, 'autonomous': 55,
-        'quantum': 70, 'neural network': 50, 'transformer': 60
-    }
-    
-    for tech, points in tech_importance.items():
-        if tech in content:
-            score += points * 0.4
+    score += hits.total('tech') * 0.4
     
     # 5. 新鮮度ボーナス（新しいニュースにボーナス）
     dt = item.get("_dt")
@@ -1111,66 +1268,19 @@ def calculate_sns_importance_score(item):
     if "xポスト" in title:
         username = title.replace("xポスト", "").strip().lower()
     
-    content = f"{title} {summary}"
+    hits = scan_content(f"{title} {summary}")
     score = 0
     
-    # 1. 企業・組織アカウントの重要度（公式アカウントほど高スコア）
-    enterprise_accounts = {
-        '@openai': 100, '@anthropic': 100, '@google': 90, '@microsoft': 90,
-        '@meta': 85, '@nvidia': 85, '@apple': 80, '@amazon': 80,
-        '@deepmind': 95, '@huggingface': 80, '@langchainai': 75,
-        '@cohereai': 70, '@stabilityai': 70, '@midjourney': 65,
-        # 日本企業アカウント  
-        '@softbank': 80, '@toyota': 75, '@nttcom': 70, '@sony': 70,
-        '@hitachi_ltd': 65, '@fujitsu_global': 65, '@nec_corp': 65,
-        '@rakuten': 60, '@recruit_jp': 55, '@mercari_jp': 50,
-        # AI研究者・インフルエンサー
-        '@ylecun': 90, '@karpathy': 90, '@jeffdean': 85, '@goodfellow_ian': 85,
-        '@elonmusk': 75, '@satyanadella': 80, '@sundarpichai': 80,
-        '@sama': 95, '@darioacemoglu': 80, '@fchollet': 85,
-        '@hardmaru': 75, '@adcock_brett': 70, '@minimaxir': 65,
-        # 日本のAI研究者・インフルエンサー
-        '@karaage0703': 70, '@shi3z': 65, '@yukihiko_n': 60,
-        '@npaka': 65, '@ohtaman': 60, '@toukubo': 55,
-        # その他の著名人
-        '@windsurf': 60, '@oikon48': 55, '@godofprompt': 50,
-        '@newsfromgoogle': 70, '@suh_sunaneko': 50, '@pop_ikeda': 45
-    }
+    # 1. 企業・組織アカウントの重要度（公式アカウントほど高スコア、最初のヒットのみ適用）
+    account = ACCOUNT_MATCHER.scan(username).first('accounts')
+    if account:
+        score += account[1]
     
-    for account, points in enterprise_accounts.items():
-        if account in username or account.replace('@', '') in username:
-            score += points
-            break  # 最高スコアのみ適用
-    
-    # 2. コンテンツの重要度（技術的な内容ほど高スコア）
-    high_value_keywords = {
-        'breakthrough': 50, 'release': 40, 'launch': 40, 'announce': 35,
-        'gpt-5': 80, 'gpt-4': 60, 'claude': 50, 'gemini': 50,
-        'research': 40, 'paper': 35, 'model': 30, 'ai': 20,
-        'artificial intelligence': 40, 'machine learning': 35,
-        'deep learning': 35, 'neural network': 30,
-        # 日本語キーワード
-        '人工知能': 35, '機械学習': 30, 'ディープラーニング': 30,
-        '生成ai': 45, 'chatgpt': 40, '大規模言語モデル': 35,
-        '研究': 30, '論文': 25, 'モデル': 20, 'ブレークスルー': 45,
-        '資金調達': 40, '投資': 35, 'スタートアップ': 30
-    }
-    
-    for keyword, points in high_value_keywords.items():
-        if keyword in content:
-            score += points * 0.3  # 重複を避けるため0.3倍
+    # 2. コンテンツの重要度（重複を避けるため0.3倍）
+    score += hits.total('sns_value') * 0.3
     
     # 3. エンゲージメント指標
-    engagement_indicators = {
-        'thread': 15, 'important': 20, 'must read': 25, 'breaking': 30,
-        'update': 10, 'new': 15, 'latest': 10, 'just': 10,
-        '重要': 20, '必見': 25, '最新': 10, '速報': 30, '更新': 10,
-        '解決': 20, 'ついに': 15, '問題': 10
-    }
-    
-    for indicator, points in engagement_indicators.items():
-        if indicator in content:
-            score += points * 0.2
+    score += hits.total('sns_engagement') * 0.2
     
     # 4. 投稿の新鮮度（8/14以降の新しさを重視）
     dt = item.get("_dt")
@@ -1218,25 +1328,16 @@ def categorize_source(source_name: str) -> str:
     """ソースの種類を判別"""
     if not source_name:
         return "その他"
-    lower = source_name.lower()
-    official_keywords = ['openai', 'anthropic', 'google', 'microsoft', 'meta', 'nvidia', 'amazon', 'apple', 'deepmind']
-    research_keywords = ['arxiv', 'nature', 'science', 'university', 'laboratory', 'lab', '研究', '論文']
-    media_keywords = [
-        'techcrunch', 'venturebeat', 'the verge', 'wired', 'bloomberg', 'reuters', 'forbes', 'cnbc', 'axios',
-        'financial times', 'ainow', 'ledge.ai', 'generative ai media', 'businessinsider', '日経', 'itmedia',
-        'publickey', 'techno-edge', 'g-gen'
-    ]
-    community_keywords = ['reddit', 'github', 'x / sns', 'x.com', 'twitter', 'note', 'はてな', 'zenn']
-
-    if any(keyword in lower for keyword in official_keywords):
+    hits = SOURCE_MATCHER.scan(source_name.lower())
+    if hits.any('official'):
         return "公式リリース"
-    if any(keyword in lower for keyword in research_keywords):
+    if hits.any('research'):
         return "研究・論文"
-    if any(keyword in lower for keyword in media_keywords):
+    if hits.any('media'):
         return "テックメディア"
-    if any(keyword in lower for keyword in community_keywords):
+    if hits.any('community'):
         return "コミュニティ・SNS"
-    if 'press' in lower or 'pr times' in lower:
+    if hits.any('press'):
         return "プレスリリース"
     return "その他"
 
@@ -1256,9 +1357,9 @@ def describe_importance(level: str, score: float, source_category: str) -> tuple
     return "参考メモ", "小さめの更新や補足的な話題"
 
 
-def describe_source_reliability(source_name: str, trust: int) -> tuple[str, str]:
-    """Return a user-facing source label and short explanation."""
-    category = categorize_source(source_name)
+def describe_source_reliability(source_name: str, trust: int, category: str = None) -> tuple[str, str]:
+    """Return a user-facing source label and short explanation (category: precomputed categorize_source)."""
+    category = category or categorize_source(source_name)
     if category == "公式リリース":
         return "一次情報", "企業や開発元の公式発表"
     if category == "研究・論文":
@@ -1298,7 +1399,7 @@ def build_source_list_html(counter: Counter, details: dict, total_items: int) ->
         detail = details.get(source, {})
         trust = int(round(detail.get("trust", 50)))
         category = detail.get("category", "その他")
-        trust_label, _ = describe_source_reliability(source, trust)
+        trust_label, _ = describe_source_reliability(source, trust, category)
         share = (count / total_items * 100) if total_items else 0
         share_text = f"{share:.1f}%"
 
@@ -1371,37 +1472,102 @@ def normalize_importance_score(raw_score) -> float:
         value = value / 10.0
     return max(value, 0.0)
 
-def build_cards(items, translator, category_slug: str, category_label: str):
-    """改善版カード生成関数"""
-    cards = []
+def card_summary_text(item) -> str:
+    """カードに表示する要約の原文（build_cards と翻訳の先読みで共通）"""
+    return html.unescape(item.get("_summary") or "")
+
+
+def prefetch_translations(items, translator):
+    """キャッシュに無い要約だけをまとめて翻訳し、TRANSLATION_CACHE に格納する"""
+    if not (TRANSLATE_TO_JA and translator):
+        return 0
+    misses = {}
+    for it in items:
+        raw_summary = card_summary_text(it)
+        if not raw_summary or looks_japanese(raw_summary):
+            continue
+        if get_cached_translation(TRANSLATION_CACHE, it.get("link") or "#", raw_summary):
+            continue
+        misses.setdefault(translation_cache_key(raw_summary), raw_summary)
+    if not misses:
+        return 0
+
+    sources = list(misses.values())
+    print(f"[INFO] Translating {len(sources)} uncached summaries in batch mode...")
+    translated = translator.translate_batch(sources)
+    stored = 0
+    for raw_summary, ja in zip(sources, translated):
+        if ja and ja != raw_summary:
+            put_cached_translation(TRANSLATION_CACHE, raw_summary, ja)
+            stored += 1
+    print(f"[INFO] Batch translation: {stored}/{len(sources)} summaries "
+          f"in {getattr(translator, 'batch_requests', 0)} batch requests")
+    return stored
+
+
+def get_freshness_bucket(dt) -> str:
+    """鮮度フィルター用の区分（24h / 72h / 168h / all）"""
+    if not dt:
+        return "all"
+    hours_old = (NOW - dt).total_seconds() / 3600
+    if hours_old <= 24:
+        return "24h"
+    if hours_old <= 72:
+        return "72h"
+    if hours_old <= 168:
+        return "168h"
+    return "all"
+
+
+def score_item(item, category_name: str):
+    """カテゴリに応じた重要度スコア（Business / Posts 以外は既存値か既定値 50）"""
+    if category_name == "Business":
+        return calculate_importance_score(item)
+    if category_name == "Posts":
+        return calculate_sns_importance_score(item)
+    return item.get("_importance_score", 50)
+
+
+def to_news_item(item, category_name: str = None) -> NewsItem:
+    """
+    dict 形式のアイテムを NewsItem に変換し、スコア・鮮度・言語・ソース種別をここで 1 回だけ計算する
+    （以降のソート・重複除去・カード生成・集計は計算済みの値を使う）
+
+    category_name を省略した場合は dict の _importance_score をそのまま使う（X 投稿など算出済みのもの）
+    """
+    if isinstance(item, NewsItem):
+        return item
+    news = NewsItem.from_dict(item)
+    if category_name is not None:
+        news.importance_score = score_item(item, category_name)
+    news.freshness_bucket = get_freshness_bucket(news.dt)
+    news.freshness_score = calculate_freshness_score(news.dt) if news.dt else 50
+    news.lang_code = detect_language_code(card_summary_text(news))
+    news.source_category = categorize_source(html.unescape(news.source or ""))
+    return news
+
+
+def build_card_records(items, translator, category_slug: str, category_label: str) -> list[dict]:
+    """カードの表示データ（エスケープ前の値）。render_card と index.html のデータアイランドで共用"""
+    records = []
     for idx, it in enumerate(items[:MAX_ITEMS_PER_CATEGORY], start=1):
-        title = html.unescape(it.get("title") or "(no title)")
-        link = it.get("link") or "#"
-        src = html.unescape(it.get("_source") or "")
-        dt = it.get("_dt")
-        raw_summary = html.unescape(it.get("_summary") or "")
-        normalized_score = normalize_importance_score(it.get("_importance_score"))
-        source_category = categorize_source(src)
+        it = to_news_item(it)
+        title = html.unescape(it.title or "(no title)")
+        link = it.link or "#"
+        src = html.unescape(it.source or "")
+        dt = it.dt
+        raw_summary = card_summary_text(it)
+        normalized_score = normalize_importance_score(it.importance_score)
+        source_category = it.source_category
 
         # ソース信頼度計算
         source_trust = int(round(calculate_source_trust(src)))
         source_trust_percent = max(0, min(100, source_trust))
-        source_trust_label, source_trust_note = describe_source_reliability(src, source_trust)
+        source_trust_label, source_trust_note = describe_source_reliability(src, source_trust, source_category)
 
-        # 鮮度計算
-        freshness_score = calculate_freshness_score(dt) if dt else 50
-        if dt:
-            hours_old = (NOW - dt).total_seconds() / 3600
-            if hours_old <= 24:
-                freshness_bucket = "24h"
-            elif hours_old <= 72:
-                freshness_bucket = "72h"
-            elif hours_old <= 168:
-                freshness_bucket = "168h"
-            else:
-                freshness_bucket = "all"
-        else:
-            freshness_bucket = "all"
+        # 鮮度（取り込み時に計算済み）
+        freshness_score = it.freshness_score
+        freshness_bucket = it.freshness_bucket
         freshness_indicator = describe_freshness_bucket(freshness_bucket)
 
         # 翻訳処理
@@ -1409,8 +1575,7 @@ def build_cards(items, translator, category_slug: str, category_label: str):
         did_translate = False
 
         if TRANSLATE_TO_JA and translator and raw_summary and not looks_japanese(raw_summary):
-            cache_key = f"{link}::{hash(raw_summary)}"
-            cached = TRANSLATION_CACHE.get(cache_key)
+            cached = get_cached_translation(TRANSLATION_CACHE, link, raw_summary)
             if cached:
                 ja_summary = cached
                 did_translate = True
@@ -1419,7 +1584,7 @@ def build_cards(items, translator, category_slug: str, category_label: str):
                     ja = translator.translate(raw_summary)
                     if ja and ja != raw_summary:
                         ja_summary = ja
-                        TRANSLATION_CACHE[cache_key] = ja_summary
+                        put_cached_translation(TRANSLATION_CACHE, raw_summary, ja_summary)
                         did_translate = True
                 except Exception as e:
                     print(f"[WARN] Translation failed for {link[:50]}: {e}")
@@ -1433,9 +1598,9 @@ def build_cards(items, translator, category_slug: str, category_label: str):
         min_read_time = estimate_reading_time(final_summary)
         reading_time_text = f"{min_read_time}分で読めます"
 
-        original_lang_code = detect_language_code(raw_summary)
-        translated_lang_code = detect_language_code(ja_summary if did_translate else raw_summary)
+        original_lang_code = it.lang_code
         if did_translate:
+            translated_lang_code = detect_language_code(ja_summary)
             translation_badge = f"翻訳: {language_label(translated_lang_code)} / 原文: {language_label(original_lang_code)}"
         else:
             translation_badge = f"原文: {language_label(original_lang_code)}"
@@ -1446,9 +1611,6 @@ def build_cards(items, translator, category_slug: str, category_label: str):
         )
         score_value = f"{normalized_score:.2f}"
 
-        rank_display = f"{idx:02d}"
-        rank_aria = str(idx)
-
         # タグ生成
         source_slug = re.sub(r"[^a-z0-9]+", "", src.lower())
 
@@ -1462,125 +1624,314 @@ def build_cards(items, translator, category_slug: str, category_label: str):
         if source_category in {"公式リリース", "研究・論文"}:
             tags.append("一次情報")
 
-        tags_html = "\n".join(
-            f'      <span class="news-card__tag">{html.escape(tag)}</span>'
-            for tag in tags
-        ) or '      <span class="news-card__tag">その他</span>'
-        tags_filter = ",".join(tag.lower() for tag in tags)
-
         if dt:
             dt_local = dt.astimezone(JST)
-            published_iso = dt_local.isoformat()
-            published_display_full = dt_local.strftime("%Y-%m-%d %H:%M JST")
-            published_display_short = dt_local.strftime("%m/%d %H:%M")
-            published_text = f'<time datetime="{html.escape(published_iso)}" title="{html.escape(published_display_full)}">{html.escape(published_display_short)}</time>'
+            published = {
+                "iso": dt_local.isoformat(),
+                "full": dt_local.strftime("%Y-%m-%d %H:%M JST"),
+                "short": dt_local.strftime("%m/%d %H:%M"),
+            }
             published_ms = int(dt.timestamp() * 1000)
         else:
-            published_text = "日時不明"
+            published = None
             published_ms = 0
 
-        translation_badge_safe = html.escape(translation_badge, quote=False)
-
-        cards.append(CARD_TMPL.format(
-            category_slug=html.escape(category_slug, quote=False),
-            importance_level=importance_level,
-            score_value=score_value,
-            freshness_score=f"{freshness_score:.0f}",
-            freshness_label=freshness_indicator,
-            freshness_bucket=freshness_bucket,
-            published_ms=str(published_ms),
-            rank_original=str(idx),
-            rank_display=rank_display,
-            rank_aria=rank_aria,
-            link=html.escape(link, quote=True),
-            title=html.escape(title, quote=False),
-            summary=html.escape(final_summary, quote=False),
-            source_name=html.escape(src, quote=False),
-            translation_badge=translation_badge_safe,
-            reading_time_text=html.escape(reading_time_text, quote=False),
-            published_text=published_text,
-            importance_label=importance_label,
-            importance_note=html.escape(importance_note, quote=False),
-            tags_html=tags_html,
-            tags_filter=html.escape(tags_filter, quote=True),
-            source_trust_label=html.escape(source_trust_label, quote=False),
-            source_trust_note=html.escape(source_trust_note, quote=False),
-            source_trust_percent=str(source_trust_percent),
-            source_slug=html.escape(source_slug, quote=True)
-        ))
+        # 同じストーリーを報じた他のソース
+        also_covered = it.get("_also_covered_by") or []
+
+        records.append({
+            "category_slug": category_slug,
+            "importance_level": importance_level,
+            "importance_label": importance_label,
+            "importance_note": importance_note,
+            "score_value": score_value,
+            "freshness_score": f"{freshness_score:.0f}",
+            "freshness_label": freshness_indicator,
+            "freshness_bucket": freshness_bucket,
+            "published": published,
+            "published_ms": published_ms,
+            "rank": idx,
+            "link": link,
+            "title": title,
+            "summary": final_summary,
+            "source_name": src,
+            "translation_badge": translation_badge,
+            "reading_time_text": reading_time_text,
+            "tags": tags,
+            "source_trust_label": source_trust_label,
+            "source_trust_note": source_trust_note,
+            "source_trust_percent": source_trust_percent,
+            "source_slug": source_slug,
+            "also_covered": [{"name": c["source"] or c["title"], "link": c["link"] or "#"}
+                             for c in also_covered[:5]],
+            "also_covered_more": max(0, len(also_covered) - 5),
+        })
+
+    return records
+
+
+def render_card(record: dict) -> str:
+    """build_card_records の 1 件を CARD_TMPL の HTML にする"""
+    tags_html = "\n".join(
+        f'      <span class="news-card__tag">{html.escape(tag)}</span>'
+        for tag in record["tags"]
+    ) or '      <span class="news-card__tag">その他</span>'
+    tags_filter = ",".join(tag.lower() for tag in record["tags"])
+
+    published = record["published"]
+    if published:
+        published_text = f'<time datetime="{html.escape(published["iso"])}" title="{html.escape(published["full"])}">{html.escape(published["short"])}</time>'
+    else:
+        published_text = "日時不明"
+
+    also_covered_html = ""
+    if record["also_covered"]:
+        also_links = "、".join(
+            f'<a href="{html.escape(c["link"], quote=True)}" target="_blank" rel="noopener">'
+            f'{html.escape(c["name"], quote=False)}</a>'
+            for c in record["also_covered"]
+        )
+        more = f" ほか{record['also_covered_more']}件" if record["also_covered_more"] else ""
+        also_covered_html = f'\n    <p class="news-card__also">他の報道: {also_links}{more}</p>'
+
+    return CARD_TMPL.format(
+        category_slug=html.escape(record["category_slug"], quote=False),
+        importance_level=record["importance_level"],
+        score_value=record["score_value"],
+        freshness_score=record["freshness_score"],
+        freshness_label=record["freshness_label"],
+        freshness_bucket=record["freshness_bucket"],
+        published_ms=str(record["published_ms"]),
+        rank_original=str(record["rank"]),
+        rank_display=f"{record['rank']:02d}",
+        rank_aria=str(record["rank"]),
+        link=html.escape(record["link"], quote=True),
+        title=html.escape(record["title"], quote=False),
+        summary=html.escape(record["summary"], quote=False),
+        source_name=html.escape(record["source_name"], quote=False),
+        translation_badge=html.escape(record["translation_badge"], quote=False),
+        reading_time_text=html.escape(record["reading_time_text"], quote=False),
+        published_text=published_text,
+        importance_label=record["importance_label"],
+        importance_note=html.escape(record["importance_note"], quote=False),
+        tags_html=tags_html,
+        tags_filter=html.escape(tags_filter, quote=True),
+        source_trust_label=html.escape(record["source_trust_label"], quote=False),
+        source_trust_note=html.escape(record["source_trust_note"], quote=False),
+        source_trust_percent=str(record["source_trust_percent"]),
+        source_slug=html.escape(record["source_slug"], quote=True),
+        also_covered_html=also_covered_html
+    )
 
+
+def build_cards(items, translator, category_slug: str, category_label: str):
+    """改善版カード生成関数"""
+    cards = [render_card(r) for r in build_card_records(items, translator, category_slug, category_label)]
     return "\n".join(cards) if cards else EMPTY_TMPL
 
+
+def card_payload(record: dict) -> list:
+    """データアイランドに載せる 1 件分（キーを繰り返さない配列。並びはテンプレートの CARD_FIELDS と同じ）"""
+    published = record["published"] or {}
+    return [
+        record["category_slug"], record["importance_level"], record["importance_label"], record["importance_note"],
+        record["score_value"], record["freshness_bucket"], record["freshness_label"], record["published_ms"],
+        published.get("iso", ""), published.get("full", ""), published.get("short", ""), record["rank"],
+        record["link"], record["title"], record["summary"], record["source_name"], record["translation_badge"],
+        record["reading_time_text"], record["tags"], record["source_trust_label"], record["source_trust_note"],
+        record["source_trust_percent"], [[c["name"], c["link"]] for c in record["also_covered"]],
+        record["also_covered_more"],
+    ]
+
+
+def card_search_text(record: dict) -> str:
+    """検索インデックスに入れるテキスト（カードに表示される語）"""
+    return " ".join([
+        record["title"], record["summary"], record["source_name"], " ".join(record["tags"]),
+        record["importance_label"], record["importance_note"], record["freshness_label"],
+        record["source_trust_label"], " ".join(c["name"] for c in record["also_covered"]),
+    ])
+
+def fetch_and_parse(url, headers):
+    """
+    共有 HTTP クライアントで取得して feedparser でパースする（同じホストの接続を再利用）。
+    feedparser.parse(url) と同じく status / href / etag / modified を付ける
+    """
+    import feedparser
+    import http_client
+    response = http_client.get(url, headers=headers, timeout=FEED_FETCH_TIMEOUT, allow_redirects=True)
+    if response.status_code == 304:
+        d = feedparser.FeedParserDict(entries=[], bozo=0)
+    else:
+        d = feedparser.parse(response.content,
+                             response_headers={k.lower(): v for k, v in response.headers.items()})
+    d['status'] = response.status_code
+    d['href'] = response.url
+    if response.headers.get('ETag'):
+        d['etag'] = response.headers['ETag']
+    if response.headers.get('Last-Modified'):
+        d['modified'] = response.headers['Last-Modified']
+    return d
+
+
+def fetch_feed(url, name):
+    """1フィードを取得（リトライ・403時の高度な取得込み）。取得できなければ None"""
+    # User-Agentを設定してアクセス拒否を回避
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    }
+
+    # 前回 advanced / Gemini でしか取れなかったホストは、403 になる直接取得を省いてその方法から試す
+    preferred = HOST_HEALTH.preferred(url).get("method")
+    degraded = HOST_HEALTH.degraded(url)
+    if preferred == "advanced" and not degraded:
+        return advanced_feed_fetch(url, name)
+    if preferred == "gemini" and not degraded:
+        d = gemini_feed_fetch(url, name)
+        if d is not None:
+            return d
+
+    # 403エラー対策: リトライ機能付きでフィード取得（直近の取得が失敗しているホストはリトライしない）
+    retry_count = 0
+    max_retries = 0 if degraded else 2
+    d = None
+
+    while retry_count <= max_retries:
+        try:
+            # 保存済みの ETag / Last-Modified があれば条件付きリクエストにする
+            d = fetch_and_parse(url, {**headers, **FEED_CACHE.request_headers(url)})
+
+            if getattr(d, 'status', None) == 304:
+                cached = FEED_CACHE.cached_feed(url)
+                if cached is not None:
+                    print(f"[INFO] {name} not modified, using cached entries")
+                    get_metrics().incr("feed_not_modified")
+                    HOST_HEALTH.remember(url, "feedparser")
+                    return cached
+                d = fetch_and_parse(url, headers)
+
+            # HTTPステータスコードチェック
+            if hasattr(d, 'status') and d.status == 403:
+                print(f"[WARN] 403 Forbidden for {name}, trying advanced fetch...")
+                get_metrics().incr("http_403")
+                # 高度なHTTPリクエストで再試行
+                d = advanced_feed_fetch(url, name)
+                if d is None:
+                    print(f"[ERROR] Advanced fetch also failed for {name}")
+                    break
+            elif getattr(d, 'status', None) == 200 and d.get('entries'):
+                FEED_CACHE.store(url, d)
+                HOST_HEALTH.remember(url, "feedparser")
+            break
+        except Exception as retry_e:
+            retry_count += 1
+            if retry_count <= max_retries:
+                print(f"[WARN] Retry {retry_count}/{max_retries} for {name}: {retry_e}")
+                get_metrics().incr("feed_retries")
+                # 高度な取得を試行
+                if 'google.com' in url:
+                    print(f"[INFO] Trying advanced fetch for Google service: {name}")
+                    d = advanced_feed_fetch(url, name)
+                    if d is not None:
+                        break
+                time.sleep(2)  # 2秒待機
+            elif degraded:
+                raise retry_e
+            else:
+                # 最後の手段として高度な取得を試行
+                print(f"[INFO] Final attempt with advanced fetch for {name}")
+                d = advanced_feed_fetch(url, name)
+                if d is None:
+                    raise retry_e
+
+    if d and d.bozo:
+        print(f"[WARN] Feed parse warning for {name}: {getattr(d, 'bozo_exception', 'unknown')}")
+    return d
+
+
+def feed_fetch_ok(d) -> bool:
+    """取得結果が成功か（HTTP エラー・パースできない本文は失敗としてホストの健全性に記録する）"""
+    if d is None:
+        return False
+    status = getattr(d, 'status', None) or 200
+    has_entries = bool(getattr(d, 'entries', None))
+    return status < 400 and (has_entries or status == 304 or not getattr(d, 'bozo', 0))
+
+
+def fetch_feeds_concurrently(feeds, workers=None, per_host=None):
+    """
+    フィード群をスレッドプールで並列取得する。
+    同一ホストへの同時接続数は per_host で制限する。
+    戻り値は feeds と同じ順序の (feed, parsed or None) のリスト。
+    """
+    workers = workers or FEED_FETCH_WORKERS
+    per_host = per_host or FEED_FETCH_PER_HOST
+    targets = [f for f in feeds if f.get("url")]
+    for f in feeds:
+        if not f.get("url"):
+            print(f"[WARN] No URL for feed: {f.get('name')}")
+    if not targets:
+        return []
+
+    host_limits = {}
+    for f in targets:
+        host = urlparse(f["url"]).netloc.lower()
+        if host not in host_limits:
+            host_limits[host] = threading.BoundedSemaphore(per_host)
+
+    def _fetch(f):
+        url = f["url"]
+        name = f.get("name", url)
+        # 失敗が続いてサーキットが開いているホストは取得しない
+        if not HOST_HEALTH.allow(url):
+            print(f"[INFO] Skipping {name}: circuit open for {urlparse(url).netloc}")
+            get_metrics().incr("circuit_open")
+            return None
+        started = time.time()
+        status = None
+        with host_limits[urlparse(url).netloc.lower()]:
+            try:
+                print(f"[INFO] Fetching: {name}")
+                d = fetch_feed(url, name)
+            except Exception as e:
+                print(f"[ERROR] feed parse error: {name}: {e}")
+                d = None
+                status = type(e).__name__
+        elapsed = time.time() - started
+        if CONFIG['debug_mode']:
+            print(f"[DEBUG] Fetched {name} in {elapsed:.2f}s")
+        get_metrics().record_feed(name, url, elapsed, d is not None, len(getattr(d, 'entries', None) or []))
+        HOST_HEALTH.record(url, feed_fetch_ok(d), elapsed,
+                           status=status or getattr(d, 'status', None) or ("ok" if d is not None else "failed"))
+        return d
+
+    # タイムアウトは fetch_and_parse がリクエストごとに指定する
+    with ThreadPoolExecutor(max_workers=min(workers, len(targets))) as pool:
+        results = list(pool.map(_fetch, targets))
+
+    return list(zip(targets, results))
+
+
 def gather_items(feeds, category_name):
     items = []
-    print(f"[INFO] Processing {len(feeds)} feeds for {category_name}")
-    for f in feeds:
+    print(f"[INFO] Processing {len(feeds)} feeds for {category_name} "
+          f"(workers={FEED_FETCH_WORKERS}, per_host={FEED_FETCH_PER_HOST})")
+    fetch_start = time.time()
+    with get_metrics().stage(f"fetch:{category_name}"):
+        fetched = fetch_feeds_concurrently(feeds)
+    print(f"[INFO] {category_name}: fetched {len(fetched)} feeds in {time.time() - fetch_start:.2f}s")
+    FEED_CACHE.save()
+    HOST_HEALTH.save()
+
+    for f, d in fetched:
         url = f.get("url")
         name = f.get("name", url)
-        if not url: 
-            print(f"[WARN] No URL for feed: {name}")
-            continue
-        try:
-            print(f"[INFO] Fetching: {name}")
-            # User-Agentを設定してアクセス拒否を回避
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
-            
-            # 403エラー対策: リトライ機能付きでフィード取得
-            retry_count = 0
-            max_retries = 2
-            d = None
-            
-            while retry_count <= max_retries:
-                try:
-                    # タイムアウト制限付きでフィード取得
-                    import socket
-                    original_timeout = socket.getdefaulttimeout()
-                    socket.setdefaulttimeout(8)  # 8秒タイムアウト
-                    
-                    d = feedparser.parse(url, agent=headers['User-Agent'])
-                    
-                    socket.setdefaulttimeout(original_timeout)
-                    # HTTPステータスコードチェック
-                    if hasattr(d, 'status') and d.status == 403:
-                        print(f"[WARN] 403 Forbidden for {name}, trying advanced fetch...")
-                        # 高度なHTTPリクエストで再試行
-                        d = advanced_feed_fetch(url, name)
-                        if d is None:
-                            print(f"[ERROR] Advanced fetch also failed for {name}")
-                            break
-                    break
-                except Exception as retry_e:
-                    retry_count += 1
-                    if retry_count <= max_retries:
-                        print(f"[WARN] Retry {retry_count}/{max_retries} for {name}: {retry_e}")
-                        # 高度な取得を試行
-                        if 'google.com' in url:
-                            print(f"[INFO] Trying advanced fetch for Google service: {name}")
-                            d = advanced_feed_fetch(url, name)
-                            if d is not None:
-                                break
-                        import time
-                        time.sleep(2)  # 2秒待機
-                    else:
-                        # 最後の手段として高度な取得を試行
-                        print(f"[INFO] Final attempt with advanced fetch for {name}")
-                        d = advanced_feed_fetch(url, name)
-                        if d is None:
-                            raise retry_e
-            
-            if d and d.bozo:
-                print(f"[WARN] Feed parse warning for {name}: {getattr(d, 'bozo_exception', 'unknown')}")
-        except Exception as e:
-            print(f"[ERROR] feed parse error: {name}: {e}")
-            continue
-        
+
         # フィード取得が失敗した場合はスキップ
         if not d or not hasattr(d, 'entries'):
             print(f"[WARN] No valid feed data for {name}, skipping...")
             continue
-            
+
         entry_count = 0
         filtered_count = 0
         for e in d.entries:
@@ -1605,30 +1956,14 @@ def gather_items(feeds, category_name):
                 continue
                 
             entry_count += 1
-            # 重要度スコア計算
-            importance_score = 50  # デフォルト値
-            if category_name == "Business":
-                importance_score = calculate_importance_score({
-                    "title": title,
-                    "_summary": summary,
-                    "_source": name,
-                    "_dt": dt
-                })
-            elif category_name == "Posts":
-                importance_score = calculate_sns_importance_score({
-                    "title": title,
-                    "_summary": summary,
-                    "_dt": dt
-                })
-
-            items.append({
+            # 重要度スコア・鮮度などは取り込み時に 1 回だけ計算
+            items.append(to_news_item({
                 "title": title,
                 "link": link_url,
                 "_summary": summary,
                 "_source": name,
-                "_dt": dt,
-                "_importance_score": importance_score
-            })
+                "_dt": dt
+            }, category_name))
         if entry_count > 0:
             if filtered_count > 0:
                 print(f"[INFO] Found {entry_count} recent items from {name} (filtered out {filtered_count} non-AI items)")
@@ -1648,25 +1983,40 @@ def gather_items(feeds, category_name):
     return items
 
 
+def story_rank(item) -> tuple:
+    """ストーリーの代表を選ぶ順序（ソース信頼度 → 重要度スコア）"""
+    credibility = SOURCE_MATCHER.scan((item.source or "").lower()).first('credibility')
+    trust = max(calculate_source_trust(item.source), credibility[1] if credibility else 0)
+    return trust, item.importance_score or 0
+
+
+def keep_story_representatives(items):
+    """同じストーリーの記事をまとめ、代表記事だけを元の順序で返す（他は代表の _also_covered_by に付与）"""
+    representative_ids = {id(item) for item in cluster_stories(items, story_rank).representatives}
+    return [item for item in items if id(item) in representative_ids]
+
+
 def sort_items_for_category(items, category_name):
+    """取り込み時に計算済みのスコアで並べ替え（ソート中にスコアを再計算しない。スコアの無いアイテムは 0 扱い）"""
     if category_name == "Business":
-        items.sort(key=lambda x: (calculate_importance_score(x), x["_dt"]), reverse=True)
+        items.sort(key=lambda x: (x.importance_score or 0, x.dt), reverse=True)
         print(f"[INFO] {category_name}: Sorted by importance score")
     elif category_name == "Posts":
-        items.sort(key=lambda x: (calculate_sns_importance_score(x), x["_dt"]), reverse=True)
+        items.sort(key=lambda x: (x.importance_score or 0, x.dt), reverse=True)
         print(f"[INFO] {category_name}: Sorted by SNS importance score")
     else:
-        items.sort(key=lambda x: x["_dt"], reverse=True)
+        items.sort(key=lambda x: x.dt, reverse=True)
     return items
 
 
 def supplement_items_with_gemini_search(items, category_name, seen_links, seen_titles):
     if not GEMINI_SUPPLEMENT_ENABLED:
         return items
-    if not GEMINI_SUPPLEMENT_AVAILABLE:
-        return items
     if len(items) >= GEMINI_SUPPLEMENT_MIN_ITEMS:
         return items
+    GeminiNewsSupplementer = optional_import("gemini_news_supplement", "GeminiNewsSupplementer")
+    if not GeminiNewsSupplementer:
+        return items
 
     needed = min(GEMINI_SUPPLEMENT_MAX_ITEMS, GEMINI_SUPPLEMENT_MIN_ITEMS - len(items))
     if needed <= 0:
@@ -1690,18 +2040,12 @@ def supplement_items_with_gemini_search(items, category_name, seen_links, seen_t
 
     added_count = 0
     for item in supplemental_items:
-        link = (item.get("link") or "").strip()
-        title = (item.get("title") or "").lower().strip()
+        item = to_news_item(item, category_name)
+        link = item.link_key
+        title = item.title_key
         if (link and link in seen_links) or (title and title in seen_titles):
             continue
 
-        if category_name == "Business":
-            item["_importance_score"] = calculate_importance_score(item)
-        elif category_name == "Posts":
-            item["_importance_score"] = calculate_sns_importance_score(item)
-        else:
-            item["_importance_score"] = item.get("_importance_score", 50)
-
         items.append(item)
         if link:
             seen_links.add(link)
@@ -1717,9 +2061,56 @@ def supplement_items_with_gemini_search(items, category_name, seen_links, seen_t
 
     return items
 
+def collect_items(feeds_conf, reuse=False, include_x=True):
+    """
+    収集ステージ: Business / Tools / Posts を取得・スコア計算し（include_x なら X 投稿も）、
+    _cache/news_snapshot.jsonl.gz に保存して セクション名 -> アイテムのリスト を返す。
+    カテゴリをまたぐ重複除去・ストーリーのクラスタリングはまだ行っていない
+    （使う側で cluster_stories / keep_story_representatives を通す）。
+    reuse=True のときは同じ条件で収集した新しいスナップショットがあればそれを返す（取得しない）
+    """
+    meta = {"hours_lookback": HOURS_LOOKBACK, "feeds": feeds_digest()}
+    if include_x:
+        # 別の X の CSV から収集したスナップショットは使わない
+        meta["x_source"] = X_POSTS_CSV
+    sections = CATEGORIES + (("X",) if include_x else ())
+    if reuse:
+        snapshot = load_snapshot(NEWS_SNAPSHOT_FILE, require=sections, **meta)
+        if snapshot is not None:
+            for name in sections:
+                print(f"[INFO] {name}: {len(snapshot.sections[name])} items from snapshot")
+            return snapshot.sections
+
+    collected = {}
+    for category_name in CATEGORIES:
+        try:
+            collected[category_name] = gather_items(get_category(feeds_conf, category_name), category_name)
+            print(f"[INFO] Gathered {len(collected[category_name])} {category_name} items")
+        except Exception as e:
+            print(f"[ERROR] Failed to gather {category_name} items: {e}")
+            collected[category_name] = []
+
+    if include_x:
+        collected["X"] = []
+        with get_metrics().stage("collect:x_posts"):
+            if X_POSTS_CSV:
+                try:
+                    collected["X"] = [to_news_item(post) for post in gather_x_posts(X_POSTS_CSV)]
+                except Exception as e:
+                    print(f"[WARN] Failed to process X posts: {e}")
+
+    try:
+        write_snapshot(collected, meta, NEWS_SNAPSHOT_FILE)
+    except Exception as e:
+        print(f"[WARN] Failed to write news snapshot: {e}")
+    return collected
+
+
 def main():
     """メイン処理（改善版）"""
     start_time = time.time()
+    configure()
+    metrics = reset_metrics()
 
     print(f"\n{'='*60}")
     print(f"🚀 Daily AI News Build Started")
@@ -1745,114 +2136,80 @@ def main():
         print(f"[ERROR] Failed to parse feeds.yml: {e}")
         feeds_conf = {}
     
-    # Gather items with error handling
-    try:
-        business = gather_items(get_category(feeds_conf, "Business"), "Business")
-        print(f"[INFO] Gathered {len(business)} Business items")
-    except Exception as e:
-        print(f"[ERROR] Failed to gather Business items: {e}")
-        business = []
+    # Gather items with error handling（収集結果はスナップショットに保存し、ダッシュボード生成でも再利用する）
+    collected = collect_items(feeds_conf, reuse=CONFIG['build_from_snapshot'])
+    business, tools, posts = (collected[name] for name in CATEGORIES)
     
-    try:
-        tools = gather_items(get_category(feeds_conf, "Tools"), "Tools")
-        print(f"[INFO] Gathered {len(tools)} Tools items")
-    except Exception as e:
-        print(f"[ERROR] Failed to gather Tools items: {e}")
-        tools = []
-    
-    try:
-        posts = gather_items(get_category(feeds_conf, "Posts"), "Posts")
-        print(f"[INFO] Gathered {len(posts)} Posts items")
-    except Exception as e:
-        print(f"[ERROR] Failed to gather Posts items: {e}")
-        posts = []
-    
-    # Remove global duplicates across all categories first
-    print(f"[INFO] Removing duplicates across all categories...")
-    all_items = business + tools + posts
-    print(f"[INFO] Before deduplication: {len(all_items)} total items")
-    
-    seen_links = set()
-    seen_titles = set()
-    unique_business = []
-    unique_tools = []
-    unique_posts = []
-    
-    # Process each category and remove duplicates
-    for item in business:
-        link = item.get('link', '')
-        title = item.get('title', '').lower().strip()
-        if link not in seen_links and title not in seen_titles:
-            unique_business.append(item)
-            seen_links.add(link)
-            seen_titles.add(title)
-    
-    for item in tools:
-        link = item.get('link', '')
-        title = item.get('title', '').lower().strip()
-        if link not in seen_links and title not in seen_titles:
-            unique_tools.append(item)
-            seen_links.add(link)
-            seen_titles.add(title)
-    
-    for item in posts:
-        link = item.get('link', '')
-        title = item.get('title', '').lower().strip()
-        if link not in seen_links and title not in seen_titles:
-            unique_posts.append(item)
-            seen_links.add(link)
-            seen_titles.add(title)
-    
-    # Update with deduplicated items
-    business = unique_business
-    tools = unique_tools  
-    posts = unique_posts
-    
-    print(f"[INFO] After deduplication: Business={len(business)}, Tools={len(tools)}, Posts={len(posts)}")
+    with metrics.stage("cluster"):
+        # 同じ発表を複数ソースが報じた記事をストーリー単位にまとめ、代表記事だけを残す
+        # （他のソースは代表の「他の報道」に表示し、翻訳・Gemini処理は代表だけに行う）
+        print("[INFO] Clustering stories across all categories...")
+        all_items = business + tools + posts
+        print(f"[INFO] Before clustering: {len(all_items)} total items")
+
+        stories = cluster_stories(all_items, story_rank)
+        representative_ids = {id(item) for item in stories.representatives}
+        seen_links = {item.link_key for item in all_items}
+        seen_titles = {item.title_key for item in all_items}
+
+        business, tools, posts = (
+            [item for item in category_items if id(item) in representative_ids]
+            for category_items in (business, tools, posts)
+        )
+
+        print(f"[INFO] After clustering: Business={len(business)}, Tools={len(tools)}, Posts={len(posts)} "
+              f"({len(all_items) - len(representative_ids)} items merged into {len(representative_ids)} stories)")
 
-    business = supplement_items_with_gemini_search(business, "Business", seen_links, seen_titles)
-    tools = supplement_items_with_gemini_search(tools, "Tools", seen_links, seen_titles)
-    posts = supplement_items_with_gemini_search(posts, "Posts", seen_links, seen_titles)
+    with metrics.stage("gemini_supplement"):
+        business = supplement_items_with_gemini_search(business, "Business", seen_links, seen_titles)
+        tools = supplement_items_with_gemini_search(tools, "Tools", seen_links, seen_titles)
+        posts = supplement_items_with_gemini_search(posts, "Posts", seen_links, seen_titles)
     
     # Inject X posts
-    if X_POSTS_CSV:
-        try:
-            x_posts = gather_x_posts(X_POSTS_CSV)
-            if x_posts:
-                print(f"[INFO] Adding {len(x_posts)} X posts")
-                # Only add X posts that aren't already in posts
-                for x_post in x_posts:
-                    x_link = x_post.get('link', '')
-                    x_title = x_post.get('title', '').lower().strip()
-                    if x_link not in seen_links and x_title not in seen_titles:
-                        posts.append(x_post)
-                        seen_links.add(x_link)
-                        seen_titles.add(x_title)
-            else:
-                print(f"[INFO] No X posts to add")
-            posts = sorted(posts, key=lambda x: x.get('_dt', NOW), reverse=True)
-        except Exception as e:
-            print(f"[WARN] Failed to process X posts: {e}")
+    with metrics.stage("merge_x_posts"):
+        if X_POSTS_CSV:
+            try:
+                x_posts = collected["X"]
+                if x_posts:
+                    print(f"[INFO] Adding {len(x_posts)} X posts")
+                    # Only add X posts that aren't already in posts
+                    for x_post in x_posts:
+                        x_post = to_news_item(x_post)
+                        x_link = x_post.link_key
+                        x_title = x_post.title_key
+                        if x_link not in seen_links and x_title not in seen_titles \
+                                and stories.attach(x_post) is None:
+                            posts.append(x_post)
+                            seen_links.add(x_link)
+                            seen_titles.add(x_title)
+                else:
+                    print(f"[INFO] No X posts to add")
+                posts = sorted(posts, key=lambda x: x.dt or NOW, reverse=True)
+            except Exception as e:
+                print(f"[WARN] Failed to process X posts: {e}")
 
     # Inject Bluesky posts
-    if Path(BLUESKY_CSV).exists():
-        try:
-            bsky_posts = original_gather_x_posts(BLUESKY_CSV)
-            if bsky_posts:
-                print(f"[INFO] Adding {len(bsky_posts)} Bluesky posts")
-                for bp in bsky_posts:
-                    bp['_source'] = 'Bluesky'
-                    b_link = bp.get('link', '')
-                    b_title = bp.get('title', '').lower().strip()
-                    if b_link not in seen_links and b_title not in seen_titles:
-                        posts.append(bp)
-                        seen_links.add(b_link)
-                        seen_titles.add(b_title)
-                posts = sorted(posts, key=lambda x: x.get('_dt', NOW), reverse=True)
-        except Exception as e:
-            print(f"[WARN] Failed to process Bluesky posts: {e}")
-    else:
-        print(f"[INFO] No Bluesky CSV found at {BLUESKY_CSV}, skipping")
+    with metrics.stage("bluesky"):
+        if Path(BLUESKY_CSV).exists():
+            try:
+                bsky_posts = original_gather_x_posts(BLUESKY_CSV)
+                if bsky_posts:
+                    print(f"[INFO] Adding {len(bsky_posts)} Bluesky posts")
+                    for bp in bsky_posts:
+                        bp['_source'] = 'Bluesky'
+                        bp = to_news_item(bp)
+                        b_link = bp.link_key
+                        b_title = bp.title_key
+                        if b_link not in seen_links and b_title not in seen_titles \
+                                and stories.attach(bp) is None:
+                            posts.append(bp)
+                            seen_links.add(b_link)
+                            seen_titles.add(b_title)
+                    posts = sorted(posts, key=lambda x: x.dt or NOW, reverse=True)
+            except Exception as e:
+                print(f"[WARN] Failed to process Bluesky posts: {e}")
+        else:
+            print(f"[INFO] No Bluesky CSV found at {BLUESKY_CSV}, skipping")
 
     try:
         translator = JaTranslator(engine=TRANSLATE_ENGINE)
@@ -1864,24 +2221,29 @@ def main():
     selected_tools = tools[:MAX_ITEMS_PER_CATEGORY]
     selected_posts = posts[:MAX_ITEMS_PER_CATEGORY]
 
-    sections_html = []
-    try:
-        sections_html.append(build_cards(selected_business, translator, "business", "ビジネス"))
-    except Exception as e:
-        print(f"[ERROR] Failed to build Business section: {e}")
-        sections_html.append(EMPTY_TMPL)
-    
-    try:
-        sections_html.append(build_cards(selected_tools, translator, "tools", "ツール"))
-    except Exception as e:
-        print(f"[ERROR] Failed to build Tools section: {e}")
-        sections_html.append(EMPTY_TMPL)
-    
-    try:
-        sections_html.append(build_cards(selected_posts, translator, "posts", "SNS/論文"))
-    except Exception as e:
-        print(f"[ERROR] Failed to build Posts section: {e}")
-        sections_html.append(EMPTY_TMPL)
+    # キャッシュに無い要約をまとめて翻訳してから各カテゴリのカードを生成する
+    with metrics.stage("translate"):
+        try:
+            prefetch_translations(selected_business + selected_tools + selected_posts, translator)
+        except Exception as e:
+            print(f"[WARN] Batch translation prefetch failed: {e}")
+
+    with metrics.stage("render_cards"):
+        sections_html = []
+        card_records = []
+        for selected, slug, label, name in ((selected_business, "business", "ビジネス", "Business"),
+                                            (selected_tools, "tools", "ツール", "Tools"),
+                                            (selected_posts, "posts", "SNS/論文", "Posts")):
+            try:
+                records = build_card_records(selected, translator, slug, label)
+                sections_html.append("\n".join(render_card(r) for r in records) or EMPTY_TMPL)
+                card_records.extend(records)
+            except Exception as e:
+                print(f"[ERROR] Failed to build {name} section: {e}")
+                sections_html.append(EMPTY_TMPL)
+        # index.html はカード HTML ではなく表示データと検索インデックスの JSON から描画する
+        news_data_json = json_island(build_payload([card_payload(r) for r in card_records],
+                                                   [card_search_text(r) for r in card_records]))
 
     # 統計情報表示（改善版）
     final_business = len(selected_business)
@@ -1908,27 +2270,27 @@ def main():
     if total_final > 0:
         avg_time_per_item = processing_time / total_final
         print(f"   Average per item: {avg_time_per_item:.3f} seconds")
+    metrics.print_summary()
     print(f"{'='*60}\n")
 
     displayed_items = selected_business + selected_tools + selected_posts
     source_counter = Counter()
     source_details = {}
     for item in displayed_items:
-        src = (item.get("_source") or "").strip()
+        src = (item.source or "").strip()
         if not src:
             continue
         source_counter[src] += 1
         if src not in source_details:
             source_details[src] = {
                 "trust": calculate_source_trust(src),
-                "category": categorize_source(src)
+                "category": item.source_category
             }
     unique_sources = set(source_counter.keys())
     high_priority_count = sum(1 for item in displayed_items if is_high_priority_item(item))
     lookback_label = f"{HOURS_LOOKBACK}h"
     page_title = f"Daily AI News — {NOW.strftime('%Y-%m-%d %H:%M JST')}"
     generated_at = NOW.strftime("%Y-%m-%d %H:%M:%S JST")
-    legacy_sections_for_modern = textwrap.indent("\n".join(sections_html).strip(), "      ")
     source_sample = "、".join(sorted(unique_sources)[:10])
     if not source_sample:
         source_sample = "現在の対象期間ではソース情報が取得できません"
@@ -1936,72 +2298,88 @@ def main():
         source_counter, source_details, max(total_final, 1)
     )
 
-    html_out = PAGE_TMPL.format(
-        updated_title=NOW.strftime("%Y-%m-%d %H:%M JST"),
-        updated_full=NOW.strftime("%Y-%m-%d %H:%M JST"),
-        lookback=HOURS_LOOKBACK,
-        cnt_business=final_business,
-        cnt_tools=final_tools,
-        cnt_posts=final_posts,
-        sections="".join(sections_html),
-        source_summary=legacy_source_html
-    )
-    # Remove stray backslashes that broke markup
-    html_out = html_out.replace("\\", "")
-
-    try:
-        Path("news_detail.html").write_text(html_out, encoding="utf-8")
-        print(f"[SUCCESS] Wrote news_detail.html ({len(html_out)} bytes)")
-    except Exception as e:
-        print(f"[ERROR] Failed to write news_detail.html: {e}")
-        raise
-
-    # Use Bootstrap 5 template for reliable tab functionality
-    modern_template_path = Path("templates/bootstrap_template.html")
-    modern_replacements = {
-        "%%PAGE_TITLE%%": page_title,
-        "%%GENERATED_AT%%": generated_at,
-        "%%UPDATED_FULL%%": NOW.strftime("%Y-%m-%d %H:%M JST"),
-        "%%LOOKBACK_HOURS%%": str(HOURS_LOOKBACK),
-        "%%LOOKBACK_LABEL%%": lookback_label,
-        "%%TOTAL_ITEMS%%": str(len(displayed_items)),
-        "%%HIGH_PRIORITY_ITEMS%%": str(high_priority_count),
-        "%%SOURCE_COUNT%%": str(len(unique_sources)),
-        "%%BUSINESS_COUNT%%": str(final_business),
-        "%%TOOLS_COUNT%%": str(final_tools),
-        "%%POSTS_COUNT%%": str(final_posts),
-        "%%RESULT_COUNT%%": str(total_final),
-        "%%SOURCE_SAMPLE%%": source_sample,
-        "%%SOURCE_LIST%%": source_list_html,
-        "%%LEGACY_SECTIONS%%": legacy_sections_for_modern + ("\n" if legacy_sections_for_modern else "    <!-- 記事データなし -->\n"),
-    }
+    with metrics.stage("write_html"):
+        html_out = PAGE_TMPL.format(
+            updated_title=NOW.strftime("%Y-%m-%d %H:%M JST"),
+            updated_full=NOW.strftime("%Y-%m-%d %H:%M JST"),
+            lookback=HOURS_LOOKBACK,
+            cnt_business=final_business,
+            cnt_tools=final_tools,
+            cnt_posts=final_posts,
+            sections="".join(sections_html),
+            source_summary=legacy_source_html
+        )
+        # Remove stray backslashes that broke markup
+        html_out = html_out.replace("\\", "")
 
-    if modern_template_path.exists():
         try:
-            modern_html = modern_template_path.read_text(encoding="utf-8")
-            for token, value in modern_replacements.items():
-                modern_html = modern_html.replace(token, value)
-            Path("index.html").write_text(modern_html, encoding="utf-8")
-            print(f"[SUCCESS] Wrote index.html ({len(modern_html)} bytes) using modern template")
+            Path("news_detail.html").write_text(html_out, encoding="utf-8")
+            print(f"[SUCCESS] Wrote news_detail.html ({len(html_out)} bytes)")
         except Exception as e:
-            print(f"[WARN] Failed to build modern index: {e}")
+            print(f"[ERROR] Failed to write news_detail.html: {e}")
+            raise
+
+        # Use Bootstrap 5 template for reliable tab functionality
+        modern_template_path = Path("templates/bootstrap_template.html")
+        modern_replacements = {
+            "%%PAGE_TITLE%%": page_title,
+            "%%GENERATED_AT%%": generated_at,
+            "%%UPDATED_FULL%%": NOW.strftime("%Y-%m-%d %H:%M JST"),
+            "%%LOOKBACK_HOURS%%": str(HOURS_LOOKBACK),
+            "%%LOOKBACK_LABEL%%": lookback_label,
+            "%%TOTAL_ITEMS%%": str(len(displayed_items)),
+            "%%HIGH_PRIORITY_ITEMS%%": str(high_priority_count),
+            "%%SOURCE_COUNT%%": str(len(unique_sources)),
+            "%%BUSINESS_COUNT%%": str(final_business),
+            "%%TOOLS_COUNT%%": str(final_tools),
+            "%%POSTS_COUNT%%": str(final_posts),
+            "%%RESULT_COUNT%%": str(total_final),
+            "%%SOURCE_SAMPLE%%": source_sample,
+            "%%SOURCE_LIST%%": source_list_html,
+            "%%NEWS_DATA%%": news_data_json,
+        }
+
+        if modern_template_path.exists():
+            try:
+                modern_html = modern_template_path.read_text(encoding="utf-8")
+                for token, value in modern_replacements.items():
+                    modern_html = modern_html.replace(token, value)
+                Path("index.html").write_text(modern_html, encoding="utf-8")
+                print(f"[SUCCESS] Wrote index.html ({len(modern_html)} bytes, news data {len(news_data_json)} bytes) "
+                      f"using modern template")
+            except Exception as e:
+                print(f"[WARN] Failed to build modern index: {e}")
+                try:
+                    Path("index.html").write_text(html_out, encoding="utf-8")
+                    print("[INFO] Fallback: wrote legacy markup to index.html")
+                except Exception as fallback_error:
+                    print(f"[ERROR] Failed to write fallback index.html: {fallback_error}")
+        else:
             try:
                 Path("index.html").write_text(html_out, encoding="utf-8")
-                print("[INFO] Fallback: wrote legacy markup to index.html")
+                print("[WARN] Modern template not found; wrote legacy markup to index.html")
             except Exception as fallback_error:
                 print(f"[ERROR] Failed to write fallback index.html: {fallback_error}")
-    else:
-        try:
-            Path("index.html").write_text(html_out, encoding="utf-8")
-            print("[WARN] Modern template not found; wrote legacy markup to index.html")
-        except Exception as fallback_error:
-            print(f"[ERROR] Failed to write fallback index.html: {fallback_error}")
 
     try:
         save_cache(TRANSLATION_CACHE)
-        print(f"[SUCCESS] Saved {len(TRANSLATION_CACHE)} translations to cache")
+        print(f"[SUCCESS] Saved {len(TRANSLATION_CACHE)} translations to cache "
+              f"(hits={TRANSLATION_CACHE.hits}, misses={TRANSLATION_CACHE.misses})")
     except Exception as e:
         print(f"[WARN] Failed to save cache: {e}")
 
+    metrics.incr("translation_cache_hits", TRANSLATION_CACHE.hits)
+    metrics.incr("translation_cache_misses", TRANSLATION_CACHE.misses)
+    metrics.set("items", {"business": len(business), "tools": len(tools), "posts": len(posts),
+                          "displayed": total_final})
+    metrics.set("failing_hosts", HOST_HEALTH.summary())
+    try:
+        metrics.write()
+    except Exception as e:
+        print(f"[WARN] Failed to write build metrics: {e}")
+
 if __name__ == "__main__":
-    main()
+    if profiling_enabled():
+        run_profiled(main)
+    else:
+        main()
@@ -19,6 +19,10 @@ import feedparser
 import requests
 import random
 
+from translation_cache import TranslationCache, text_key
+from news_snapshot import feeds_digest, load_snapshot
+from keyword_matcher import KeywordMatcher
+
 # Enhanced X Processing Integration
 try:
     from enhanced_x_processor import EnhancedXProcessor
@@ -114,6 +118,25 @@ class EngineerRankingSystem:
         'aws.amazon.com': 1.3
     }
     
+    # コード/実装・論文の判定語とカテゴリー検出語
+    CODE_INDICATORS = ['```', 'github.com', 'code example', 'implementation']
+    RESEARCH_WORDS = ['paper', 'research', 'study']
+    CATEGORY_WORDS = {
+        'AI/ML': ['ai', 'ml', 'machine learning', 'deep learning', 'neural', 'gpt', 'llm'],
+        'Infrastructure': ['docker', 'kubernetes', 'aws', 'cloud', 'devops'],
+        'Web Dev': ['web', 'frontend', 'backend', 'api', 'react', 'vue'],
+        'Data': ['data', 'database', 'analytics', 'visualization'],
+    }
+    
+    # 上記のキーワード表をまとめたマッチャー（1記事につき1回の走査で全表を判定）
+    MATCHER = KeywordMatcher({
+        **{f'tech:{category}': config['keywords'] for category, config in TECH_KEYWORDS.items()},
+        **{f'business:{category}': keywords for category, keywords in BUSINESS_KEYWORDS.items()},
+        **{f'category:{name}': words for name, words in CATEGORY_WORDS.items()},
+        'code': CODE_INDICATORS,
+        'research': RESEARCH_WORDS,
+    })
+    
     @classmethod
     def calculate_engineer_score(cls, item):
         """エンジニア関連度スコアを計算"""
@@ -123,14 +146,14 @@ class EngineerRankingSystem:
         source = item.get('source', '').lower()
         
         content = f"{title} {summary}".lower()
+        hits = cls.MATCHER.scan(content)
         score = 0.0
         
         # 技術キーワードスコア
         for category, config in cls.TECH_KEYWORDS.items():
-            keywords = config['keywords']
             weight = config['weight']
             
-            matches = sum(1 for keyword in keywords if keyword in content)
+            matches = hits.count(f'tech:{category}')
             if matches > 0:
                 # 複数マッチにボーナス（上限あり）
                 match_bonus = min(matches * 0.3, 1.0)
@@ -144,7 +167,7 @@ class EngineerRankingSystem:
                 break
         
         # コード/実装関連の特別ボーナス
-        if any(indicator in content for indicator in ['```', 'github.com', 'code example', 'implementation']):
+        if hits.any('code'):
             score *= 1.5
         
         # 数値データ・ベンチマーク（エンジニアが重視）
@@ -152,14 +175,13 @@ class EngineerRankingSystem:
             score *= 1.3
         
         # 論文・研究（学術的価値）
-        if 'arxiv' in url or any(word in content for word in ['paper', 'research', 'study']):
+        if 'arxiv' in url or hits.any('research'):
             score *= 1.2
         
         # ビジネス系でも技術的価値があるものは除外しない
         business_score = 0
-        for category, keywords in cls.BUSINESS_KEYWORDS.items():
-            business_matches = sum(1 for keyword in keywords if keyword in content)
-            if business_matches > 0:
+        for category in cls.BUSINESS_KEYWORDS:
+            if hits.any(f'business:{category}'):
                 business_score += 0.3
         
         # 純粋なビジネスニュースは重み軽減（ただし完全排除はしない）
@@ -192,21 +214,10 @@ class EngineerRankingSystem:
         if re.search(r'\b(python|javascript|rust|go|c\+\+|java)\b', content):
             categories.append('Programming')
         
-        # AI/ML
-        if any(word in content for word in ['ai', 'ml', 'machine learning', 'deep learning', 'neural', 'gpt', 'llm']):
-            categories.append('AI/ML')
-        
-        # インフラ
-        if any(word in content for word in ['docker', 'kubernetes', 'aws', 'cloud', 'devops']):
-            categories.append('Infrastructure')
-        
-        # Web開発
-        if any(word in content for word in ['web', 'frontend', 'backend', 'api', 'react', 'vue']):
-            categories.append('Web Dev')
-        
-        # データ
-        if any(word in content for word in ['data', 'database', 'analytics', 'visualization']):
-            categories.append('Data')
+        hits = cls.MATCHER.scan(content)
+        for name in cls.CATEGORY_WORDS:
+            if hits.any(f'category:{name}'):
+                categories.append(name)
         
         return categories[:3]  # 最大3つまで
 
@@ -236,6 +247,34 @@ def load_feeds():
     with open(feeds_file, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
+def snapshot_articles(snapshot, config):
+    """build.py の収集スナップショットから記事（と同じ CSV の X 投稿）を作る"""
+    items = []
+    for category in ('Business', 'Tools'):
+        for news in snapshot.sections[category]:
+            items.append({
+                'title': news.title or 'No title',
+                'url': news.link,
+                'summary': clean_html(news.summary),
+                'published': news.dt,
+                'source': news.source,
+                'category': category,
+                'is_x_post': False
+            })
+    if snapshot.meta.get('x_source') == config['X_POSTS_CSV']:
+        for post in snapshot.sections.get('X', []):
+            text = post.get('_full_text') or post.summary
+            items.append({
+                'title': text[:100] + '...',
+                'summary': text,
+                'url': post.link,
+                'published': post.dt,
+                'source': 'X (Twitter)',
+                'category': 'Posts',
+                'is_x_post': True
+            })
+    return items
+
 def fetch_and_rank_articles(config, feeds):
     """記事を取得してランキング"""
     all_items = []
@@ -243,6 +282,17 @@ def fetch_and_rank_articles(config, feeds):
     
     print(f"📰 記事取得開始: {config['HOURS_LOOKBACK']}時間以内")
     
+    # build.py が直前に保存した収集スナップショットがあればフィードを取り直さない
+    snapshot = load_snapshot(hours_lookback=config['HOURS_LOOKBACK'], feeds=feeds_digest())
+    if snapshot is not None:
+        all_items = snapshot_articles(snapshot, config)
+        for item in all_items:
+            item['engineer_score'] = EngineerRankingSystem.calculate_engineer_score(item)
+            item['priority_icon'], item['priority_class'], item['priority_text'] = EngineerRankingSystem.get_priority_level(item['engineer_score'])
+            item['tech_categories'] = EngineerRankingSystem.detect_tech_categories(item)
+        print(f"✅ 収集スナップショットから {len(all_items)}件")
+        feeds = {}
+    
     # RSS フィードから記事取得
     for category, feed_list in feeds.items():
         if category == 'Posts':  # X posts は後で処理
@@ -295,9 +345,9 @@ def fetch_and_rank_articles(config, feeds):
             except Exception as e:
                 print(f"    ❌ エラー: {e}")
     
-    # X posts を追加
+    # X posts を追加（スナップショットに同じ CSV の投稿があれば取得済み）
     try:
-        x_posts = fetch_x_posts(config['X_POSTS_CSV'])
+        x_posts = [] if any(item['is_x_post'] for item in all_items) else fetch_x_posts(config['X_POSTS_CSV'])
         for post in x_posts:
             post['engineer_score'] = EngineerRankingSystem.calculate_engineer_score(post)
             post['priority_icon'], post['priority_class'], post['priority_text'] = EngineerRankingSystem.get_priority_level(post['engineer_score'])
@@ -372,17 +422,8 @@ def translate_summaries(items, config):
     if not config['TRANSLATE_TO_JA'] or not TRANSLATE_AVAILABLE:
         return
     
-    cache_file = Path('_cache/translations.json')
-    cache_file.parent.mkdir(exist_ok=True)
-    
-    # キャッシュ読み込み
-    cache = {}
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
-        except:
-            cache = {}
+    # キャッシュ読み込み（build.py と共通の translation_cache を使用）
+    cache = TranslationCache()
     
     # 翻訳エンジン設定
     if config['TRANSLATE_ENGINE'] == 'mymemory':
@@ -396,7 +437,7 @@ def translate_summaries(items, config):
         if not summary or len(summary) < 10:
             continue
         
-        cache_key = f"{config['TRANSLATE_ENGINE']}:{hash(summary)}"
+        cache_key = f"{config['TRANSLATE_ENGINE']}:{text_key(summary)}"
         
         if cache_key in cache:
             item['summary'] = cache[cache_key]
@@ -415,11 +456,7 @@ def translate_summaries(items, config):
                 print(f"翻訳エラー: {e}")
     
     # キャッシュ保存
-    try:
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"キャッシュ保存エラー: {e}")
+    cache.save()
     
     print(f"🔤 新規翻訳: {translated_count}件")
 
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ビルドのステージ別計測（処理時間・カウンタ）
+- metrics.stage("fetch:Business") のようにコンテキストマネージャで各ステージの所要時間を記録
+- フィードごとの取得時間と結果、キャッシュヒット・リトライ・403 などのカウンタを集計
+- 実行ごとに _cache/build_metrics.json を書き出し、_cache/build_metrics_history.json に直近の実行を残す
+  （過去の中央値より大幅に遅くなったステージを警告表示する）
+- BUILD_PROFILE=1 のときは cProfile の結果を _cache/build_profile.prof に保存
+
+Env (optional):
+  BUILD_METRICS_FILE=_cache/build_metrics.json  # 書き出し先
+  BUILD_METRICS_HISTORY=30                      # 履歴に残す実行数
+  BUILD_PROFILE=0                               # 1 で cProfile を保存
+"""
+import os
+import statistics
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from json_store import atomic_write_json, load_json
+
+DEFAULT_METRICS_PATH = Path(os.getenv("BUILD_METRICS_FILE", str(Path("_cache") / "build_metrics.json")))
+DEFAULT_HISTORY_PATH = Path("_cache") / "build_metrics_history.json"
+DEFAULT_PROFILE_PATH = Path("_cache") / "build_profile.prof"
+DEFAULT_HISTORY_SIZE = 30
+# 過去の中央値の 1.5 倍以上かつ 1 秒以上遅くなったステージを退行として報告する
+REGRESSION_RATIO = 1.5
+REGRESSION_MIN_SECONDS = 1.0
+# 中央値を取るのに必要な過去の実行数
+REGRESSION_MIN_RUNS = 3
+
+
+class BuildMetrics:
+    """1 回のビルドのステージ時間・フィード取得時間・カウンタ（スレッドセーフ）"""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, float]] = {}  # 名前 -> {"seconds", "calls"}（記録順）
+        self.feeds: List[Dict[str, Any]] = []
+        self.counters: Counter = Counter()
+        self.values: Dict[str, Any] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """with ブロックの所要時間を name のステージとして記録（同名は合算）"""
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_stage_time(name, time.perf_counter() - started)
+
+    def add_stage_time(self, name: str, seconds: float):
+        with self._lock:
+            stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+            stage["seconds"] += seconds
+            stage["calls"] += 1
+
+    def record_feed(self, name: str, url: str, seconds: float, ok: bool, entries: int = 0):
+        """1 フィードの取得結果"""
+        with self._lock:
+            self.feeds.append({"name": name, "url": url, "seconds": round(seconds, 3),
+                               "ok": ok, "entries": entries})
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def set(self, name: str, value: Any):
+        with self._lock:
+            self.values[name] = value
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "total_seconds": round(self.total_seconds, 3),
+                "stages": {name: {"seconds": round(s["seconds"], 3), "calls": s["calls"]}
+                           for name, s in self.stages.items()},
+                "counters": dict(sorted(self.counters.items())),
+                "values": dict(self.values),
+                # 遅いフィードから順に並べる
+                "feeds": sorted(self.feeds, key=lambda f: f["seconds"], reverse=True),
+            }
+
+    def print_summary(self, slowest_feeds: int = 5):
+        """ステージ別の時間と割合、遅いフィード、カウンタを表示"""
+        data = self.to_dict()
+        total = max(data["total_seconds"], 1e-9)
+        print("⏱️  Stage timings:")
+        for name, stage in data["stages"].items():
+            calls = f" x{stage['calls']}" if stage["calls"] > 1 else ""
+            print(f"   {name:<24} {stage['seconds']:8.2f}s {stage['seconds'] / total:6.1%}{calls}")
+        if data["feeds"]:
+            print("🐢 Slowest feeds:")
+            for feed in data["feeds"][:slowest_feeds]:
+                status = "ok" if feed["ok"] else "failed"
+                print(f"   {feed['name'][:40]:<40} {feed['seconds']:6.2f}s ({status})")
+        if data["counters"]:
+            print("🔢 Counters: " + ", ".join(f"{k}={v}" for k, v in data["counters"].items()))
+
+    def write(self, path: Optional[Path] = None, history_path: Optional[Path] = DEFAULT_HISTORY_PATH,
+              history_size: Optional[int] = None) -> List[str]:
+        """
+        _cache/build_metrics.json を書き出し、履歴に追記する。
+        過去の中央値より大幅に遅くなったステージ名のリストを返す（履歴が足りなければ空）
+        """
+        data = self.to_dict()
+        atomic_write_json(Path(path or DEFAULT_METRICS_PATH), data, indent=2)
+        print(f"[INFO] Wrote build metrics to {path or DEFAULT_METRICS_PATH}")
+        if history_path is None:
+            return []
+
+        history_path = Path(history_path)
+        history = load_history(history_path)
+        regressions = find_regressions(data, history)
+        for name in regressions:
+            print(f"[WARN] Stage '{name}' took {data['stages'][name]['seconds']:.2f}s "
+                  f"(median of recent runs: {_median_seconds(history, name):.2f}s)")
+
+        history.append({
+            "started_at": data["started_at"],
+            "total_seconds": data["total_seconds"],
+            "stages": {name: stage["seconds"] for name, stage in data["stages"].items()},
+            "counters": data["counters"],
+        })
+        size = history_size or int(os.getenv("BUILD_METRICS_HISTORY", DEFAULT_HISTORY_SIZE))
+        atomic_write_json(history_path, {"runs": history[-size:]}, indent=2)
+        return regressions
+
+
+def load_history(path: Path = DEFAULT_HISTORY_PATH) -> List[Dict[str, Any]]:
+    """過去の実行の記録（古い順）。無い・壊れている場合は空"""
+    runs = (load_json(path, "Build metrics history") or {}).get("runs", [])
+    return runs if isinstance(runs, list) else []
+
+
+def _median_seconds(history: List[Dict[str, Any]], stage: str) -> Optional[float]:
+    samples = [run["stages"][stage] for run in history if stage in run.get("stages", {})]
+    if len(samples) < REGRESSION_MIN_RUNS:
+        return None
+    return statistics.median(samples)
+
+
+def find_regressions(data: Dict[str, Any], history: List[Dict[str, Any]]) -> List[str]:
+    """過去の中央値の REGRESSION_RATIO 倍以上、かつ REGRESSION_MIN_SECONDS 以上遅いステージ"""
+    regressions = []
+    for name, stage in data["stages"].items():
+        median = _median_seconds(history, name)
+        if median is None:
+            continue
+        if stage["seconds"] >= median * REGRESSION_RATIO and stage["seconds"] - median >= REGRESSION_MIN_SECONDS:
+            regressions.append(name)
+    return regressions
+
+
+def run_profiled(fn: Callable[[], Any], path: Path = DEFAULT_PROFILE_PATH) -> Any:
+    """fn を cProfile 付きで実行し、結果を path に保存する（python -m pstats で確認できる）"""
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return fn()
+    finally:
+        profiler.disable()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+        print(f"[INFO] Saved cProfile stats to {path}")
+
+
+def profiling_enabled() -> bool:
+    return os.getenv("BUILD_PROFILE", "").lower() in ("1", "true", "yes")
+
+
+# プロセス内で共有する計測（ビルド開始時に reset_metrics で作り直す）
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> BuildMetrics:
+    """シングルトンの計測オブジェクトを取得"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = BuildMetrics()
+        return _metrics
+
+
+def reset_metrics() -> BuildMetrics:
+    """新しいビルドの計測を開始する"""
+    global _metrics
+    with _metrics_lock:
+        _metrics = BuildMetrics()
+        return _metrics
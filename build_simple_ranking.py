@@ -18,10 +18,14 @@ from urllib.parse import urlparse
 from urllib.request import urlopen
 import yaml
 import feedparser
-import requests
+import http_client
 import random
 from bs4 import BeautifulSoup
 
+from translation_cache import TranslationCache
+from keyword_matcher import KeywordMatcher
+from x_csv_parser import JST, parse_x_csv
+
 # 蝓ｺ譛ｬ險ｭ螳・HOURS_LOOKBACK = int(os.getenv('HOURS_LOOKBACK', '24'))
 MAX_ITEMS_PER_CATEGORY = int(os.getenv('MAX_ITEMS_PER_CATEGORY', '25'))
 TOP_PICKS_COUNT = int(os.getenv('TOP_PICKS_COUNT', '10'))
@@ -74,6 +78,20 @@ class SimpleEngineerRanking:
         'salesforce.com', 'atlassian.com', 'ibm.com'
     ]
     
+    # ハウツー・コード系の判定語
+    HOWTO_INDICATORS = [
+        'how to', 'step-by-step', 'guide', 'tutorial', 'best practices',
+        'チュートリアル', '手順', '入門', '使い方', '導入事例', '活用事例'
+    ]
+    CODE_INDICATORS = ['```', 'code example', 'implementation', 'github.com', 'gist.github.com']
+    
+    # キーワード表をまとめたマッチャー（本文・タイトルをそれぞれ1回だけ走査）
+    MATCHER = KeywordMatcher({
+        'tech': TECH_KEYWORDS,
+        'efficiency': EFFICIENCY_KEYWORDS,
+        'indicators': HOWTO_INDICATORS + CODE_INDICATORS,
+    })
+    
     @classmethod
     def calculate_score(cls, item):
         """AI繧ｨ繝ｳ繧ｸ繝九い/讌ｭ蜍吝柑邇・喧縺ｮ譛臥畑蠎ｦ繧ｹ繧ｳ繧｢ (0-10)"""
@@ -82,19 +100,13 @@ class SimpleEngineerRanking:
         url = item.get('url', '').lower()
         
         content = f"{title} {summary}"
+        hits = cls.MATCHER.scan(content)
+        title_hits = cls.MATCHER.scan(title)
         score = 0.0
         
         # 繧ｭ繝ｼ繝ｯ繝ｼ繝峨・繝・メ繝ｳ繧ｰ
-        for keyword, weight in cls.TECH_KEYWORDS.items():
-            if keyword in content:
-                score += weight
-                if keyword in title:
-                    score += weight * 0.5
-        for keyword, weight in cls.EFFICIENCY_KEYWORDS.items():
-            if keyword in content:
-                score += weight
-                if keyword in title:
-                    score += weight * 0.6
+        score += hits.total('tech') + title_hits.total('tech') * 0.5
+        score += hits.total('efficiency') + title_hits.total('efficiency') * 0.6
         
         # 菫｡鬆ｼ縺ｧ縺阪ｋ繧ｽ繝ｼ繧ｹ繝懊・繝翫せ
         domain = urlparse(url).netloc.lower()
@@ -104,35 +116,19 @@ class SimpleEngineerRanking:
                 break
         
         # 螳溯｣・繝上え繝・・/繧ｳ繝ｼ繝峨・迚ｹ蛻･繝懊・繝翫せ
-        howto_indicators = [
-            'how to', 'step-by-step', 'guide', 'tutorial', 'best practices',
-            'チュートリアル', '手順', '入門', '使い方', '導入事例', '活用事例'
-        ]
-        code_indicators = ['```', 'code example', 'implementation', 'github.com', 'gist.github.com']
-        if any(x in content for x in howto_indicators + code_indicators):
+        if hits.any('indicators'):
             score *= 1.15
         
         # 10轤ｹ貅轤ｹ縺ｫ豁｣隕丞喧
         return min(score, 10.0)
 
 def load_translation_cache():
-    """鄙ｻ險ｳ繧ｭ繝｣繝・す繝･繧定ｪｭ縺ｿ霎ｼ縺ｿ"""
-    cache_file = Path('_cache/translations.json')
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            pass
-    return {}
+    """翻訳キャッシュを読み込み（build.py と共通の translation_cache を使用）"""
+    return TranslationCache()
 
 def save_translation_cache(cache):
-    """鄙ｻ險ｳ繧ｭ繝｣繝・す繝･繧剃ｿ晏ｭ・"""
-    cache_dir = Path('_cache')
-    cache_dir.mkdir(exist_ok=True)
-    cache_file = cache_dir / 'translations.json'
-    with open(cache_file, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+    """翻訳キャッシュを保存（差分のみ追記・期限切れは削除）"""
+    cache.save()
 
 def translate_text(text, target_lang='ja', cache=None):
     """繝・く繧ｹ繝医ｒ鄙ｻ險ｳ・医く繝｣繝・す繝･蟇ｾ蠢懶ｼ・"""
@@ -276,7 +272,7 @@ def _fetch_og_title(url: str, timeout: int = 8) -> str | None:
         return None
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (compatible; AI-News-Bot/1.0)'}
-        resp = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+        resp = http_client.get(url, headers=headers, timeout=timeout, allow_redirects=True)
         if resp.status_code != 200:
             return None
         soup = BeautifulSoup(resp.text, 'html.parser')
@@ -344,7 +340,7 @@ def fetch_x_posts():
     try:
         print(f"導 X謚慕ｨｿ蜿門ｾ嶺ｸｭ: {X_POSTS_CSV}")
         
-        response = requests.get(X_POSTS_CSV, timeout=30)
+        response = http_client.get(X_POSTS_CSV, timeout=30)
         print(f"倹 HTTP Response: {response.status_code}")
         if response.status_code != 200:
             print(f"笶・HTTP Status: {response.status_code}")
@@ -370,48 +366,21 @@ def fetch_x_posts():
 def fetch_x_posts_from_csv(csv_content):
     """CSV蠖｢蠑上・X繝昴せ繝医ｒ蜃ｦ逅・"""
     try:
-        # CSV繝輔ぃ繧､繝ｫ縺ｫ蛻怜錐縺後↑縺・ｴ蜷医↓蟇ｾ蠢懶ｼ医う繝ｳ繝・ャ繧ｯ繧ｹ繝吶・繧ｹ縺ｧ蜃ｦ逅・ｼ・        lines = csv_content.strip().split('\n')
+        # 共通のストリーミングパーサー(x_csv_parser)で読み込み、HOURS_LOOKBACK より古い行は正規化前に捨てる
         posts = []
         og_cache: dict[str, str] = {}
+        cutoff = datetime.now(JST) - timedelta(hours=HOURS_LOOKBACK)
         
-        print(f"剥 DEBUG: CSV陦梧焚: {len(lines)}")
-        print(f"剥 DEBUG: 譛蛻昴・3陦・")
-        for i, line in enumerate(lines[:3]):
-            print(f"  陦鶏i}: {line[:100]}...")
-        
-        for i, line in enumerate(lines):
+        for i, post in enumerate(parse_x_csv(io.StringIO(csv_content), cutoff=cutoff)):
             try:
-                # CSV繧呈焔蜍輔〒隗｣譫撰ｼ亥・蜷阪↑縺励ｒ諠ｳ螳夲ｼ・                parts = list(csv.reader([line]))[0]
-                
-                if len(parts) < 3:  # 譛菴・蛻怜ｿ・ｦ・                    continue
-                
-                # CSV蠖｢蠑・ [timestamp, username, content, image_url, tweet_url]
-                timestamp_str = parts[0].strip()
-                username = parts[1].strip().lstrip('@')  # @險伜捷繧帝勁蜴ｻ
-                tweet_content = parts[2].strip()
-                
-                # 繝・う繝ｼ繝・RL縺ｯ4蛻礼岼縺ｾ縺溘・5蛻礼岼
-                tweet_url = ''
-                if len(parts) > 4:
-                    tweet_url = parts[4].strip()
-                elif len(parts) > 3:
-                    tweet_url = parts[3].strip()
-                
-                print(f"剥 DEBUG: 陦鶏i+1} - 繝ｦ繝ｼ繧ｶ繝ｼ: @{username}, 繧ｳ繝ｳ繝・Φ繝・ {tweet_content[:50]}..., URL: {tweet_url}")
+                # CSV形式: [timestamp, username, content, image_url, tweet_url]
+                timestamp_str = post.date_str
+                username = post.username.lstrip('@')
+                tweet_content = post.text
+                tweet_url = post.url or post.media_url
                 
                 if not tweet_content or not username:
                     continue
-                
-                # 譌･莉倥メ繧ｧ繝・け
-                try:
-                    from dateutil import parser
-                    post_date = parser.parse(timestamp_str)
-                    if not is_recent(post_date.strftime('%Y-%m-%d %H:%M:%S'), HOURS_LOOKBACK):
-                        print(f"剥 DEBUG: 蜿､縺・兜遞ｿ繧偵せ繧ｭ繝・・: {timestamp_str}")
-                        continue
-                except Exception as e:
-                    print(f"笞・・譌･莉倩ｧ｣譫舌お繝ｩ繝ｼ: {timestamp_str} - {e}")
-                    continue
 
                 # 繝・く繧ｹ繝医け繝ｪ繝ｼ繝九Φ繧ｰ
                 cleaned = _clean_tweet_text(tweet_content)
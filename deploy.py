@@ -73,8 +73,8 @@ def main():
         sys.exit(1)
     
     # Also add cache if it exists
-    if Path('_cache/translations.json').exists():
-        run_command(['git', 'add', '_cache/translations.json'], "Add translation cache")
+    if Path('_cache/translations.jsonl').exists():
+        run_command(['git', 'add', '_cache/translations.jsonl'], "Add translation cache")
     
     # Check if there are changes to commit
     result = subprocess.run(['git', 'status', '--porcelain'], capture_output=True, text=True)
@@ -175,58 +175,62 @@ class EnhancedNewsCollector:
         return ai_articles
     
     def _analyze_with_gemini(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Gemini URL contextによる記事分析"""
+        """Gemini URL contextによる記事分析（バッチごとのリクエストを並列実行）"""
         if not self.gemini_client:
             return articles
         
-        enhanced_articles = []
         batch_size = 5  # 一度に分析するURL数
-        
-        # バッチ処理
-        for i in range(0, len(articles), batch_size):
-            batch = articles[i:i + batch_size]
+        batches = [articles[i:i + batch_size] for i in range(0, len(articles), batch_size)]
+        prompt = self.gemini_client.news_summary_prompt(
+            ["技術トレンド", "企業動向", "市場インパクト", "日本への影響"]
+        )
+        
+        # URLを持つバッチだけをまとめて送信（同時実行数は GEMINI_URL_CONTEXT_CONCURRENCY で制限）
+        requests_by_batch = {}
+        for n, batch in enumerate(batches):
             batch_urls = [article['link'] for article in batch if article.get('link')]
-            
-            if not batch_urls:
+            if batch_urls:
+                requests_by_batch[n] = {"prompt": prompt, "urls": batch_urls, "enable_search": False}
+        
+        logger.info(f"🧠 {len(requests_by_batch)}バッチ（{len(articles)}記事）を並列分析中...")
+        try:
+            results = self.gemini_client.gather_from_urls(list(requests_by_batch.values()))
+        except Exception as e:
+            logger.error(f"❌ Gemini分析エラー: {e}")
+            results = [{"error": str(e)} for _ in requests_by_batch]
+        results_by_batch = dict(zip(requests_by_batch, results))
+        
+        enhanced_articles = []
+        for n, batch in enumerate(batches):
+            analysis_result = results_by_batch.get(n)
+            if analysis_result is None:
                 enhanced_articles.extend(batch)
                 continue
             
-            try:
-                logger.info(f"🧠 バッチ{i//batch_size + 1}: {len(batch_urls)}記事を分析中...")
-                
-                # Gemini分析実行
-                analysis_result = self.gemini_client.summarize_news_articles(
-                    article_urls=batch_urls,
-                    focus_topics=["技術トレンド", "企業動向", "市場インパクト", "日本への影響"]
-                )
-                
-                # 結果をバッチ記事に統合
-                for j, article in enumerate(batch):
-                    enhanced_article = article.copy()
-                    
-                    # Gemini分析結果を追加
-                    enhanced_article.update({
-                        'gemini_analysis': analysis_result.get('text', ''),
-                        'analysis_metadata': {
-                            'url_context': analysis_result.get('url_context_metadata'),
-                            'usage': analysis_result.get('usage_metadata'),
-                            'timestamp': analysis_result.get('timestamp')
-                        },
-                        'enhanced': True
-                    })
-                    
-                    enhanced_articles.append(enhanced_article)
-                
-                # レート制限対策
-                import time
-                time.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"❌ Gemini分析エラー (batch {i//batch_size + 1}): {e}")
+            if "error" in analysis_result:
+                logger.error(f"❌ Gemini分析エラー (batch {n + 1}): {analysis_result['error']}")
                 # 分析失敗時は元記事をそのまま追加
                 for article in batch:
                     article['enhanced'] = False
                 enhanced_articles.extend(batch)
+                continue
+            
+            # 結果をバッチ記事に統合
+            for article in batch:
+                enhanced_article = article.copy()
+                
+                # Gemini分析結果を追加
+                enhanced_article.update({
+                    'gemini_analysis': analysis_result.get('text', ''),
+                    'analysis_metadata': {
+                        'url_context': analysis_result.get('url_context_metadata'),
+                        'usage': analysis_result.get('usage_metadata'),
+                        'timestamp': analysis_result.get('timestamp')
+                    },
+                    'enhanced': True
+                })
+                
+                enhanced_articles.append(enhanced_article)
         
         logger.info(f"✅ Gemini分析完了: {len(enhanced_articles)}件")
         return enhanced_articles
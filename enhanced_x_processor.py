@@ -2,18 +2,19 @@
 # -*- coding: utf-8 -*-
 """
 Enhanced X Posts Processor - 重複除去と詳細要約の改善
+
+Env (optional):
+  X_ENHANCE_PACK_SIZE=20   # 1回の Gemini URL context 呼び出しにまとめる投稿数（1 で投稿ごとに呼び出す）
 """
 import os
 import re
-import csv
-import io
+import json
 import hashlib
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
 JST = timezone(timedelta(hours=9))
 from urllib.parse import urlparse
-import requests
 
 # Gemini URL contextが利用可能かチェック
 try:
@@ -22,6 +23,14 @@ try:
 except ImportError:
     GEMINI_AVAILABLE = False
 
+from llm_cache import get_llm_cache
+from x_csv_parser import parse_x_csv
+from near_duplicate import NearDuplicateIndex, extract_features, jaccard
+
+# generate_from_urls が 1 回で受け付ける URL 数の上限
+MAX_PACK_SIZE = 20
+DEFAULT_PACK_SIZE = MAX_PACK_SIZE
+
 def load_env():
     """環境変数を.envファイルから読み込み"""
     env_path = Path('.env')
@@ -45,6 +54,11 @@ class EnhancedXProcessor:
                 print(f"⚠️ Gemini client initialization failed: {e}")
                 self.gemini_client = None
         
+    def close(self):
+        """Gemini クライアントの接続とイベントループを閉じる"""
+        if self.gemini_client:
+            self.gemini_client.close()
+    
     def create_content_hash(self, text: str) -> str:
         """投稿内容のハッシュを作成（重複検出用）"""
         # テキストを正規化
@@ -57,171 +71,240 @@ class EnhancedXProcessor:
         return hashlib.md5(normalized.encode('utf-8')).hexdigest()[:12]
     
     def is_similar_content(self, text1: str, text2: str, threshold: float = 0.7) -> bool:
-        """2つの投稿内容が類似しているかチェック"""
-        def extract_keywords(text):
-            # 日本語と英語のキーワードを抽出
-            words = set()
-            # 英語の単語
-            english_words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-            words.update(english_words)
-            # 日本語の単語（簡易版）
-            japanese_words = re.findall(r'[ぁ-ゟ一-龯]{2,}', text)
-            words.update(japanese_words)
-            return words
+        """2つの投稿内容が類似しているかチェック（英単語 + 日本語 2-gram の Jaccard 係数）"""
+        return jaccard(extract_features(text1), extract_features(text2)) > threshold
+    
+    def enhance_post_with_gemini(self, post_data: dict) -> dict:
+        """Gemini URL contextを使って投稿を強化"""
+        if not self.gemini_client:
+            return post_data
         
-        keywords1 = extract_keywords(text1)
-        keywords2 = extract_keywords(text2)
+        try:
+            request = self._enhancement_request(post_data)
+            if request:
+                self._apply_enhancement(post_data, self.gemini_client.generate_from_urls(**request))
+        except Exception as e:
+            print(f"⚠️ Gemini enhancement failed for post: {e}")
         
-        if not keywords1 or not keywords2:
-            return False
+        return post_data
+    
+    def enhance_posts_with_gemini(self, posts: list) -> list:
+        """複数の投稿を Gemini URL context で並列に強化（同時実行数は GEMINI_URL_CONTEXT_CONCURRENCY）"""
+        if not self.gemini_client:
+            return posts
         
-        intersection = len(keywords1 & keywords2)
-        union = len(keywords1 | keywords2)
+        targets = []
+        for post_data in posts:
+            request = self._enhancement_request(post_data)
+            if request:
+                targets.append((post_data, request))
+        if not targets:
+            return posts
         
-        similarity = intersection / union if union > 0 else 0
-        return similarity > threshold
+        print(f"🧠 Enhancing {len(targets)} X posts with Gemini concurrently")
+        try:
+            results = self.gemini_client.gather_from_urls([request for _, request in targets])
+        except Exception as e:
+            print(f"⚠️ Gemini enhancement failed for posts: {e}")
+            return posts
+        
+        for (post_data, _), result in zip(targets, results):
+            try:
+                self._apply_enhancement(post_data, result)
+            except Exception as e:
+                print(f"⚠️ Gemini enhancement failed for post: {e}")
+        return posts
     
-    def enhance_post_with_gemini(self, post_data: dict) -> dict:
-        """Gemini URL contextを使って投稿を強化"""
+    def enhance_posts_packed(self, posts: list, pack_size: int = None) -> list:
+        """
+        最大 pack_size 件（上限 20）の投稿を 1 回の URL context 呼び出しにまとめて強化する
+        
+        投稿ごとの要約・カテゴリ・重要度を URL をキーにした JSON 配列で返させ、URL で投稿に対応付ける。
+        応答に含まれなかった・解析できなかった投稿だけを投稿単位のリクエストで再試行する。
+        """
         if not self.gemini_client:
-            return post_data
+            return posts
+        if pack_size is None:
+            pack_size = int(os.getenv("X_ENHANCE_PACK_SIZE", DEFAULT_PACK_SIZE))
+        pack_size = max(1, min(pack_size, MAX_PACK_SIZE))
+        if pack_size == 1:
+            return self.enhance_posts_with_gemini(posts)
         
+        targets = [post for post in posts if self._enhancement_request(post)]
+        if not targets:
+            return posts
+        
+        packs = [targets[i:i + pack_size] for i in range(0, len(targets), pack_size)]
+        print(f"🧠 Enhancing {len(targets)} X posts with Gemini in {len(packs)} packed requests")
         try:
-            # 投稿URLがある場合は、そのコンテキストを分析
-            post_url = post_data.get('url', '')
-            original_text = post_data.get('text', '')
-            
-            if post_url and original_text:
-                prompt = f"""
-                以下のX投稿の内容を分析し、300文字以内の簡潔な要約を日本語で作成してください：
+            results = self.gemini_client.gather_from_urls([self._packed_request(pack) for pack in packs])
+        except Exception as e:
+            print(f"⚠️ Packed Gemini enhancement failed: {e}")
+            results = [{} for _ in packs]
+        
+        failed = []
+        for pack, result in zip(packs, results):
+            analyses = self._parse_packed_result(result)
+            if not analyses and result.get('cache_key'):
+                # 解析できない応答をキャッシュに残すと、次回も同じ応答で投稿単位の再試行になる
+                get_llm_cache().delete(result['cache_key'])
+            for post_data in pack:
+                analysis = analyses.get(self._url_key(post_data['url']))
+                if analysis:
+                    self._apply_fields(post_data, analysis.get('summary'),
+                                       analysis.get('category'), analysis.get('importance'))
+                if not post_data.get('_gemini_enhanced'):
+                    failed.append(post_data)
+        
+        if failed:
+            print(f"🔁 Retrying {len(failed)} X posts individually")
+            self.enhance_posts_with_gemini(failed)
+        return posts
+    
+    def _packed_request(self, pack: list) -> dict:
+        """複数投稿をまとめた分析リクエスト（JSON 配列で投稿ごとの結果を返させる）"""
+        lines = []
+        for n, post_data in enumerate(pack, 1):
+            text = re.sub(r'\s+', ' ', post_data.get('text', '')).strip()
+            lines.append(f"{n}. URL: {post_data['url']}\n   投稿内容: {text}")
+        posts_text = "\n".join(lines)
+        prompt = f"""
+以下の{len(pack)}件のX投稿をそれぞれ分析し、投稿ごとの結果をJSON配列だけで出力してください（説明文は不要）。
 
-                投稿内容: {original_text}
+各要素の形式:
+{{"url": "投稿URL（そのまま）", "summary": "投稿の核心的な内容の日本語要約（200文字以内、改行なし）", "category": "AI技術/ビジネス/開発ツール/その他のいずれか", "importance": "高/中/低のいずれか"}}
 
-                以下の形式で回答してください：
-                ## 要約
-                投稿の核心的な内容を200文字以内で簡潔に要約（改行なし）
+投稿:
+{posts_text}
+""".strip()
+        return {'prompt': prompt, 'urls': [post_data['url'] for post_data in pack], 'enable_search': False}
+    
+    @staticmethod
+    def _url_key(url: str) -> str:
+        """応答の URL と投稿 URL を突き合わせるためのキー（スキーム・www・クエリ・末尾スラッシュの差を無視）"""
+        key = re.sub(r'^https?://(www\.)?', '', (url or '').strip().lower())
+        key = key.split('?', 1)[0].split('#', 1)[0].rstrip('/')
+        if key.startswith('twitter.com/'):
+            key = 'x.com/' + key[len('twitter.com/'):]
+        return key
+    
+    def _parse_packed_result(self, result: dict) -> dict:
+        """まとめたリクエストの応答から {URL キー: 投稿ごとの結果} を取り出す（解析できなければ空）"""
+        text = result.get('text') or ''
+        if 'error' in result or not text:
+            return {}
+        start, end = text.find('['), text.rfind(']')
+        if start < 0 or end <= start:
+            return {}
+        try:
+            entries = json.loads(text[start:end + 1])
+        except ValueError:
+            return {}
+        analyses = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if isinstance(entry, dict) and isinstance(entry.get('url'), str):
+                analyses[self._url_key(entry['url'])] = entry
+        return analyses
+    
+    def _enhancement_request(self, post_data: dict):
+        """投稿の分析リクエスト（generate_from_urls の引数）。分析できない投稿は None"""
+        # 投稿URLがある場合は、そのコンテキストを分析
+        post_url = post_data.get('url', '')
+        original_text = post_data.get('text', '')
+        
+        if not (post_url and original_text and post_url.startswith('http')):
+            return None
+        
+        prompt = f"""
+        以下のX投稿の内容を分析し、300文字以内の簡潔な要約を日本語で作成してください：
 
-                ## カテゴリ
-                [AI技術/ビジネス/開発ツール/その他]のいずれか
+        投稿内容: {original_text}
 
-                ## 重要度
-                [高/中/低]
+        以下の形式で回答してください：
+        ## 要約
+        投稿の核心的な内容を200文字以内で簡潔に要約（改行なし）
 
-                要約は必ず300文字以内で、簡潔で読みやすくしてください。
-                """
-                
-                result = self.gemini_client.generate_from_urls(
-                    prompt=prompt,
-                    urls=[post_url] if post_url.startswith('http') else [],
-                    enable_search=False
-                )
-                
-                if result.get('text') and 'error' not in result:
-                    # Gemini分析結果をパース
-                    analysis = result['text']
-                    
-                    # 要約部分を抽出
-                    summary_match = re.search(r'## 要約\s*\n(.+?)(?=\n##|\n$|$)', analysis, re.DOTALL)
-                    if summary_match:
-                        enhanced_summary = summary_match.group(1).strip()
-                        # 300文字制限を適用
-                        if len(enhanced_summary) > 300:
-                            enhanced_summary = enhanced_summary[:300] + '...'
-                        # 改行を削除して一行にまとめる
-                        enhanced_summary = re.sub(r'\s+', ' ', enhanced_summary).strip()
-                        post_data['_enhanced_summary'] = enhanced_summary
-                        post_data['_gemini_enhanced'] = True
-                    
-                    # カテゴリを抽出
-                    category_match = re.search(r'## カテゴリ\s*\n(.+?)(?=\n##|\n$|$)', analysis, re.DOTALL)
-                    if category_match:
-                        category = category_match.group(1).strip()
-                        post_data['_category'] = category
-                    
-                    # 重要度を抽出
-                    importance_match = re.search(r'## 重要度\s*\n(.+?)(?=\n##|\n$|$)', analysis, re.DOTALL)
-                    if importance_match:
-                        importance = importance_match.group(1).strip()
-                        post_data['_importance'] = importance
-                
-        except Exception as e:
-            print(f"⚠️ Gemini enhancement failed for post: {e}")
+        ## カテゴリ
+        [AI技術/ビジネス/開発ツール/その他]のいずれか
+
+        ## 重要度
+        [高/中/低]
+
+        要約は必ず300文字以内で、簡潔で読みやすくしてください。
+        """
         
-        return post_data
+        return {'prompt': prompt, 'urls': [post_url], 'enable_search': False}
+    
+    def _apply_enhancement(self, post_data: dict, result: dict):
+        """Gemini の分析結果（要約・カテゴリ・重要度）を投稿データに反映"""
+        if not (result.get('text') and 'error' not in result):
+            return
+        
+        # Gemini分析結果をパース
+        analysis = result['text']
+        
+        # 要約・カテゴリ・重要度の各セクションを抽出
+        sections = {}
+        for name in ('要約', 'カテゴリ', '重要度'):
+            match = re.search(rf'## {name}\s*\n(.+?)(?=\n##|\n$|$)', analysis, re.DOTALL)
+            sections[name] = match.group(1) if match else None
+        self._apply_fields(post_data, sections['要約'], sections['カテゴリ'], sections['重要度'])
+    
+    @staticmethod
+    def _apply_fields(post_data: dict, summary, category, importance):
+        """要約（300文字・一行に整形）・カテゴリ・重要度を投稿データに設定"""
+        if isinstance(summary, str) and summary.strip():
+            enhanced_summary = summary.strip()
+            # 300文字制限を適用
+            if len(enhanced_summary) > 300:
+                enhanced_summary = enhanced_summary[:300] + '...'
+            # 改行を削除して一行にまとめる
+            enhanced_summary = re.sub(r'\s+', ' ', enhanced_summary).strip()
+            post_data['_enhanced_summary'] = enhanced_summary
+            post_data['_gemini_enhanced'] = True
+        
+        if isinstance(category, str) and category.strip():
+            post_data['_category'] = category.strip()
+        
+        if isinstance(importance, str) and importance.strip():
+            post_data['_importance'] = importance.strip()
     
-    def process_x_posts(self, csv_url: str, max_posts: int = 50) -> list:
-        """X投稿を処理して重複除去と要約強化を実行"""
-        print(f"🔄 Processing X posts from: {csv_url}")
+    def process_x_posts(self, csv_url, max_posts: int = 50, cutoff: datetime = None,
+                        known_texts: list = None) -> list:
+        """
+        X投稿を処理して重複除去と要約強化を実行（cutoff より古い投稿は読み飛ばす）
+        
+        csv_url には CSV のパス/URL のほか、パース済みの XPost リスト（差分取り込みの新規行）も渡せる。
+        known_texts は処理済み投稿の本文で、これらと重複・類似する投稿は除外する。
+        """
+        is_parsed = isinstance(csv_url, list)
+        print(f"🔄 Processing X posts from: {f'{len(csv_url)} new rows' if is_parsed else csv_url}")
         
         try:
-            # CSV データを取得（エンコーディングを明示的に指定）
-            response = requests.get(csv_url, timeout=30)
-            response.raise_for_status()
-            
-            # エンコーディングを明示的にUTF-8に設定
-            response.encoding = 'utf-8'
-            
-            # CSV をパース  
-            content = response.text
-            
-            # まず通常のCSVリーダーでデータを確認
-            lines = content.strip().split('\n')
-            print(f"[DEBUG] First 3 CSV lines:")
-            for i, line in enumerate(lines[:3], 1):
-                print(f"   {i}: {line}")
-            
-            # ヘッダーなしのCSVとして処理
-            reader = csv.reader(io.StringIO(content))
-            
-            # CSV列名を手動設定
-            expected_columns = ['Date', 'Username', 'Tweet Text', 'Media URL', 'Tweet URL']
-            print(f"[DEBUG] Expected columns: {expected_columns}")
-            
+            # 共通のストリーミングパーサーで1行ずつ読み込む（ヘッダーなしのCSV）
+            # CSV列: 'Date', 'Username', 'Tweet Text', 'Media URL', 'Tweet URL'
             posts = []
             seen_hashes = set()
-            seen_texts = []
+            # 類似判定は MinHash/LSH の索引で候補だけと比較（全投稿との総当たりをしない）
+            similar_index = NearDuplicateIndex()
+            for i, known_text in enumerate(known_texts or []):
+                seen_hashes.add(self.create_content_hash(known_text))
+                similar_index.add(('known', i), known_text)
             processed_count = 0
-            total_rows = 0
+            stats = {}
+            rows = csv_url if is_parsed else parse_x_csv(csv_url, cutoff=cutoff, stats=stats)
             
-            for row in reader:
-                total_rows += 1
+            for post in rows:
                 if processed_count >= max_posts:
                     break
                 
-                # 行に十分な列があることを確認
-                if len(row) < 5:
-                    print(f"[DEBUG] Skipping row {total_rows}: insufficient columns ({len(row)})")
-                    continue
-                
-                # インデックスベースでデータを抽出
-                date_str = row[0].strip('"').strip() if len(row) > 0 else ''
-                username = row[1].strip('"').strip() if len(row) > 1 else ''
-                text = row[2].strip('"').strip() if len(row) > 2 else ''
-                media_url = row[3].strip('"').strip() if len(row) > 3 else ''
-                post_url = row[4].strip('"').strip() if len(row) > 4 else ''
-                
-                # HTMLエンティティをデコード
-                import html
-                text = html.unescape(text)
-                username = html.unescape(username)
-                
-                # 追加の文字化け対策
-                # 全角文字の正規化
-                import unicodedata
-                text = unicodedata.normalize('NFKC', text)
-                username = unicodedata.normalize('NFKC', username)
-                
-                # 不正な文字や制御文字を除去
-                text = ''.join(char for char in text if char.isprintable() or char in '\n\r\t')
-                
-                # 連続する空白を正規化
-                import re
-                text = re.sub(r'\s+', ' ', text).strip()
-                
-                print(f"[DEBUG] Row {total_rows}: date={date_str[:20]}..., user={username}, text_len={len(text)}")
+                username = post.username
+                text = post.text
+                date_str = post.date_str
+                post_url = post.url
                 
                 if not text or not username or len(text.strip()) < 5:
-                    print(f"[DEBUG] Skipping row {total_rows}: invalid data")
+                    print(f"[DEBUG] Skipping row {post.row}: invalid data")
                     continue
                 
                 # 重複チェック1: ハッシュベース
@@ -230,57 +313,36 @@ class EnhancedXProcessor:
                     print(f"[DEBUG] Skipping duplicate hash: {username}")
                     continue
                 
-                # 重複チェック2: 類似コンテンツ
-                is_similar = any(self.is_similar_content(text, seen_text) for seen_text in seen_texts)
-                if is_similar:
+                # 重複チェック2: 類似コンテンツ（類似が無ければここで索引に登録）
+                if similar_index.add_if_new(content_hash, text) is not None:
                     print(f"[DEBUG] Skipping similar content: {username}")
                     continue
                 
-                # 日付パース（失敗した投稿はスキップ）
-                dt = None
-                date_formats = [
-                    "%B %d, %Y at %I:%M%p",
-                    "%B %d, %Y",
-                    "%Y-%m-%d %H:%M:%S",
-                    "%Y-%m-%d",
-                    "%Y年%m月%d日",
-                    "%m/%d/%Y",
-                ]
-                for fmt in date_formats:
-                    try:
-                        dt = datetime.strptime(date_str, fmt).replace(tzinfo=JST)
-                        break
-                    except (ValueError, TypeError):
-                        continue
-                if dt is None:
-                    print(f"[WARN] Date parse failed for '{date_str}', skipping post (user={username})")
-                    continue
-
                 # 基本的な投稿データを作成
                 post_data = {
                     'username': username.replace('@', ''),
                     'text': text,
                     'url': post_url,
                     'date': date_str,
-                    '_parsed_dt': dt,
+                    '_parsed_dt': post.dt,
                     '_content_hash': content_hash,
                     '_gemini_enhanced': False
                 }
                 
-                # Geminiで強化
-                post_data = self.enhance_post_with_gemini(post_data)
-                
                 # 重複チェックセットに追加
                 seen_hashes.add(content_hash)
-                seen_texts.append(text)
                 
                 posts.append(post_data)
                 processed_count += 1
                 
                 print(f"[INFO] Processed post {processed_count}: {username}")
             
+            # Geminiで強化（最大 20 件を 1 回の呼び出しにまとめ、失敗した投稿だけ個別に再試行）
+            posts = self.enhance_posts_packed(posts)
+            
             print(f"📊 Processing summary:")
-            print(f"   Total CSV rows: {total_rows}")
+            print(f"   Total CSV rows: {stats.get('rows', len(csv_url) if is_parsed else 0)} "
+                  f"(older than cutoff: {stats.get('skipped_old', 0)})")
             print(f"   Valid posts processed: {processed_count}")
             print(f"   Final unique posts: {len(posts)}")
             print(f"✅ Processed {len(posts)} unique X posts")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RSS/Atom フィードの条件付き取得キャッシュ（ETag / Last-Modified）
+- フィードごとに ETag・Last-Modified・パース済みエントリを _cache/feeds.json に保存
+- 次回取得時に If-None-Match / If-Modified-Since を送り、304 なら保存済みエントリを再利用
+"""
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from json_store import atomic_write_json, load_versioned_json
+
+if TYPE_CHECKING:
+    import feedparser
+
+CACHE_VERSION = 1
+
+# gather_items / pick_summary が参照するエントリのキーのみ保存する
+ENTRY_KEYS = ("title", "link", "summary", "subtitle", "description")
+TIME_KEYS = ("published_parsed", "updated_parsed")
+
+
+def _serialize_entry(entry) -> Dict[str, Any]:
+    # FeedParserDict.get はキーの別名解決（updated_parsed → published_parsed 等）を行うため、
+    # 実際に格納されているキーだけを dict.get で取り出す
+    getter = dict.get if isinstance(entry, dict) else (lambda e, k: getattr(e, k, None))
+    data = {}
+    for key in ENTRY_KEYS:
+        value = getter(entry, key)
+        if value:
+            data[key] = value
+    for key in TIME_KEYS:
+        value = getter(entry, key)
+        if value:
+            data[key] = list(value)[:9]
+    return data
+
+
+def _deserialize_entry(data: Dict[str, Any]) -> "feedparser.FeedParserDict":
+    from feedparser import FeedParserDict
+    entry = FeedParserDict()
+    for key, value in data.items():
+        if key in TIME_KEYS:
+            entry[key] = time.struct_time(tuple(value))
+        else:
+            entry[key] = value
+    return entry
+
+
+class FeedCache:
+    """フィード単位の条件付き取得キャッシュ（スレッドセーフ）"""
+
+    def __init__(self, path: Path, enabled: bool = True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.hits = 0
+        if enabled:
+            self.load()
+
+    def load(self):
+        """キャッシュファイルを読み込み（壊れていれば空で開始）"""
+        raw = load_versioned_json(self.path, CACHE_VERSION, "Feed cache")
+        self._feeds = raw.get("feeds", {}) if raw else {}
+        if raw:
+            print(f"[INFO] Loaded feed cache with {len(self._feeds)} feeds")
+
+    def save(self):
+        """変更があればアトミックに書き出す"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                atomic_write_json(self.path, {"version": CACHE_VERSION, "feeds": self._feeds})
+                self._dirty = False
+                print(f"[INFO] Saved feed cache ({len(self._feeds)} feeds)")
+            except Exception as e:
+                print(f"[WARN] Failed to save feed cache: {e}")
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """保存済みの ETag / Last-Modified"""
+        if not self.enabled:
+            return {}
+        with self._lock:
+            record = self._feeds.get(url)
+            if not record or not record.get("entries"):
+                return {}
+            return {k: record[k] for k in ("etag", "modified") if record.get(k)}
+
+    def feedparser_kwargs(self, url: str) -> Dict[str, str]:
+        """feedparser.parse に渡す etag / modified 引数"""
+        return self.validators(url)
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """requests 用の条件付きリクエストヘッダー"""
+        validators = self.validators(url)
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("modified"):
+            headers["If-Modified-Since"] = validators["modified"]
+        return headers
+
+    def cached_feed(self, url: str) -> Optional["feedparser.FeedParserDict"]:
+        """保存済みエントリから feedparser 互換のオブジェクトを組み立てる（304 時に使用）"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            record = self._feeds.get(url)
+            if not record or "entries" not in record:
+                return None
+            record["checked_at"] = time.time()
+            self._dirty = True
+            self.hits += 1
+            entries = [_deserialize_entry(e) for e in record["entries"]]
+        from feedparser import FeedParserDict
+        return FeedParserDict(entries=entries, bozo=0, status=304, href=url)
+
+    def store(self, url: str, parsed, etag: Optional[str] = None, modified: Optional[str] = None):
+        """取得に成功したフィードを保存（validator が無いフィードは保存しない）"""
+        if not self.enabled or parsed is None:
+            return
+        etag = etag or getattr(parsed, "etag", None) or (parsed.get("etag") if hasattr(parsed, "get") else None)
+        modified = modified or getattr(parsed, "modified", None) or (parsed.get("modified") if hasattr(parsed, "get") else None)
+        if not etag and not modified:
+            return
+        entries = [_serialize_entry(e) for e in getattr(parsed, "entries", [])]
+        with self._lock:
+            self._feeds[url] = {
+                "etag": etag,
+                "modified": modified,
+                "entries": entries,
+                "checked_at": time.time(),
+            }
+            self._dirty = True
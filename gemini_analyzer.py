@@ -5,11 +5,41 @@ Gemini API を使用した高度なAIニュース分析・評価・選択シス
 import os
 import json
 import time
-import requests
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 
+import http_client
+from gemini_scheduler import get_scheduler, estimate_tokens, parse_retry_after
+from llm_cache import get_llm_cache, make_key
+
+# 1リクエストでまとめて評価する記事数（env GEMINI_BATCH_SIZE で変更可）
+DEFAULT_BATCH_SIZE = 10
+
+IMPORTANCE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "results": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "id": {"type": "INTEGER"},
+                    "score": {"type": "INTEGER"},
+                    "reason": {"type": "STRING"},
+                    "category": {
+                        "type": "STRING",
+                        "enum": ["breakthrough", "business", "regulatory", "social", "technical"],
+                    },
+                    "keywords": {"type": "ARRAY", "items": {"type": "STRING"}},
+                },
+                "required": ["id", "score", "reason", "category", "keywords"],
+            },
+        },
+    },
+    "required": ["results"],
+}
+
 
 MODEL_ALIASES = {
     "gemini-2.5-flash": "gemini-3.1-flash-lite-preview",
@@ -44,6 +74,10 @@ class GeminiAnalyzer:
         self.base_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent"
         self.model = normalize_model_name(os.getenv('GEMINI_MODEL', self.model))
         self.base_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent"
+        # RPM/TPM・同時実行数・429 をプロセス全体で管理するスケジューラ
+        self.scheduler = get_scheduler()
+        # 同じプロンプトへの応答は実行をまたいで再利用する
+        self.response_cache = get_llm_cache()
         
         if not self.api_key:
             print("⚠️ Gemini API key not found. Set GEMINI_API_KEY environment variable.")
@@ -52,11 +86,26 @@ class GeminiAnalyzer:
             self.enabled = True
             print(f"✅ Gemini API initialized successfully with model: {self.model}")
     
-    def _make_request(self, prompt: str, max_retries: int = 3) -> Optional[str]:
-        """Gemini APIへのリクエストを実行"""
+    def _make_request(self, prompt: str, max_retries: int = 3,
+                      generation_config: Optional[Dict] = None) -> Optional[str]:
+        """Gemini APIへのリクエストを実行（generation_config で generationConfig を上書き可能）"""
         if not self.enabled:
             return None
         
+        config = {
+            "temperature": 0.3,
+            "topK": 40,
+            "topP": 0.95,
+            "maxOutputTokens": 2048
+        }
+        if generation_config:
+            config.update(generation_config)
+        
+        cache_key = make_key(self.model, prompt, config=config)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         for attempt in range(max_retries):
             try:
                 headers = {
@@ -69,18 +118,19 @@ class GeminiAnalyzer:
                             "text": prompt
                         }]
                     }],
-                    "generationConfig": {
-                        "temperature": 0.3,
-                        "topK": 40,
-                        "topP": 0.95,
-                        "maxOutputTokens": 2048
-                    }
+                    "generationConfig": config
                 }
                 
                 url = f"{self.base_url}?key={self.api_key}"
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
+                self.scheduler.acquire(estimate_tokens(prompt, payload["generationConfig"]["maxOutputTokens"]))
+                response = http_client.post(url, headers=headers, json=payload, timeout=30)
                 
+                if response.status_code == 429:
+                    # クォータ超過: スケジューラ全体を一時停止し、待機明けに再試行
+                    self.scheduler.report_rate_limited(parse_retry_after(response.headers, response.text))
+                    continue
                 if response.status_code == 200:
+                    self.scheduler.report_success()
                     result = response.json()
                     if 'candidates' in result and len(result['candidates']) > 0:
                         candidate = result['candidates'][0]
@@ -89,7 +139,9 @@ class GeminiAnalyzer:
                         if 'content' in candidate and 'parts' in candidate['content']:
                             parts = candidate['content']['parts']
                             if len(parts) > 0 and 'text' in parts[0]:
-                                return parts[0]['text'].strip()
+                                text = parts[0]['text'].strip()
+                                self.response_cache.set(cache_key, text)
+                                return text
                         
                         # エラーケースの詳細ログ
                         finish_reason = candidate.get('finishReason', 'UNKNOWN')
@@ -126,16 +178,50 @@ class GeminiAnalyzer:
         
         print("🤖 Gemini APIでニュース重要度を分析中...")
         
+        # 最大20件までを複数件まとめて採点（評価基準はリクエストごとに1回だけ送る）
+        targets = news_items[:20]
+        results = self.score_in_batches(
+            targets, self._build_importance_prompt, IMPORTANCE_SCHEMA, self._valid_importance_result
+        )
+        
         enhanced_items = []
+        for index, item in enumerate(targets):
+            result = results.get(index)
+            if not result:
+                # Gemini API失敗時はフォールバック
+                enhanced_items.append(item)
+                continue
+            score = max(1, min(100, int(result['score'])))
+            enhanced_item = item.copy()
+            enhanced_item.update({
+                'gemini_score': score,
+                'gemini_reason': result.get('reason', ''),
+                'gemini_category': str(result.get('category', 'technical')).lower(),
+                'gemini_keywords': list(result.get('keywords') or [])[:3],
+                'final_importance': max(score, item.get('importance', 0))
+            })
+            enhanced_items.append(enhanced_item)
+            print(f"  ✅ {item.get('title', '')[:50]}... -> Score: {score}")
         
-        for item in news_items[:20]:  # 最大20件まで分析
-            try:
-                prompt = f"""
-AI業界のニュース分析エキスパートとして、以下のニュースの重要度を評価してください。
-
-タイトル: {item.get('title', '')}
-要約: {item.get('summary', item.get('_summary', ''))}
-ソース: {item.get('source', item.get('_source', ''))}
+        # 残りのアイテムはそのまま追加
+        enhanced_items.extend(news_items[20:])
+        
+        # Geminiスコアでソート
+        enhanced_items.sort(key=lambda x: x.get('final_importance', x.get('gemini_score', x.get('importance', 0))), reverse=True)
+        
+        return enhanced_items
+    
+    def _build_importance_prompt(self, entries: List[Dict]) -> str:
+        """重要度評価のバッチプロンプト（entries は id 付きの記事）"""
+        articles = "\n\n".join(
+            f"[id: {entry['id']}]\n"
+            f"タイトル: {entry['item'].get('title', '')}\n"
+            f"要約: {str(entry['item'].get('summary', entry['item'].get('_summary', '')))[:400]}\n"
+            f"ソース: {entry['item'].get('source', entry['item'].get('_source', ''))}"
+            for entry in entries
+        )
+        return f"""
+AI業界のニュース分析エキスパートとして、以下の{len(entries)}件のニュースの重要度をそれぞれ評価してください。
 
 以下の観点から総合的に評価し、1-100の重要度スコアを付けてください：
 
@@ -145,79 +231,97 @@ AI業界のニュース分析エキスパートとして、以下のニュース
 4. 緊急性・時効性 (速報性, トレンド性)
 5. 社会的影響度 (倫理, 雇用, 社会問題)
 
-レスポンス形式:
-スコア: [1-100の数値]
-理由: [評価理由を1-2文で簡潔に]
-カテゴリ: [breakthrough/business/regulatory/social/technicalのいずれか]
-キーワード: [重要なキーワード3つをカンマ区切り]
+各ニュースについて results に1件ずつ、必ず同じ id を付けて回答してください：
+- score: 1-100の数値
+- reason: 評価理由を1-2文で簡潔に
+- category: breakthrough/business/regulatory/social/technicalのいずれか
+- keywords: 重要なキーワード3つ
+
+【ニュース一覧】
+{articles}
 """
-                
-                response = self._make_request(prompt)
-                if response:
-                    # レスポンスをパース
-                    score, reason, category, keywords = self._parse_analysis_response(response)
-                    
-                    enhanced_item = item.copy()
-                    enhanced_item.update({
-                        'gemini_score': score,
-                        'gemini_reason': reason,
-                        'gemini_category': category,
-                        'gemini_keywords': keywords,
-                        'final_importance': max(score, item.get('importance', 0))
-                    })
-                    enhanced_items.append(enhanced_item)
-                    
-                    print(f"  ✅ {item.get('title', '')[:50]}... -> Score: {score}")
-                    
-                    # API rate limit対策
-                    time.sleep(0.5)
-                else:
-                    # Gemini API失敗時はフォールバック
-                    enhanced_items.append(item)
-                    
-            except Exception as e:
-                print(f"[WARN] Gemini analysis failed for item: {e}")
-                enhanced_items.append(item)
-        
-        # 残りのアイテムはそのまま追加
-        enhanced_items.extend(news_items[20:])
-        
-        # Geminiスコアでソート
-        enhanced_items.sort(key=lambda x: x.get('final_importance', x.get('gemini_score', x.get('importance', 0))), reverse=True)
-        
-        return enhanced_items
     
-    def _parse_analysis_response(self, response: str) -> tuple:
-        """Geminiのレスポンスをパースして構造化データに変換"""
-        try:
-            lines = response.strip().split('\n')
-            score = 50  # デフォルト
-            reason = "Gemini分析完了"
-            category = "technical"
-            keywords = []
+    @staticmethod
+    def _valid_importance_result(result: Dict) -> bool:
+        return isinstance(result.get('score'), (int, float)) and isinstance(result.get('reason', ''), str)
+    
+    def score_in_batches(self, items: List[Dict], build_prompt: Callable[[List[Dict]], str],
+                         response_schema: Dict, validate: Callable[[Dict], bool],
+                         batch_size: Optional[int] = None, max_rounds: int = 3) -> Dict[int, Dict]:
+        """
+        複数の記事を1リクエストにまとめて JSON で評価する
+        
+        Args:
+            items: 評価する記事のリスト
+            build_prompt: [{'id': int, 'item': dict}, ...] からプロンプトを組み立てる関数
+            response_schema: {"results": [{"id": ..., ...}]} 形式の responseSchema
+            validate: 1件分の結果が妥当かを判定する関数
+            batch_size: 1リクエストあたりの件数（既定は GEMINI_BATCH_SIZE）
+            max_rounds: 応答に含まれなかった記事を再キューする最大回数
             
-            for line in lines:
-                line = line.strip()
-                if line.startswith('スコア:') or line.startswith('Score:'):
-                    try:
-                        score_text = line.split(':')[1].strip()
-                        score = int(''.join(filter(str.isdigit, score_text)))
-                        score = max(1, min(100, score))  # 1-100の範囲に制限
-                    except:
-                        pass
-                elif line.startswith('理由:') or line.startswith('Reason:'):
-                    reason = line.split(':', 1)[1].strip()
-                elif line.startswith('カテゴリ:') or line.startswith('Category:'):
-                    category = line.split(':', 1)[1].strip().lower()
-                elif line.startswith('キーワード:') or line.startswith('Keywords:'):
-                    keywords_text = line.split(':', 1)[1].strip()
-                    keywords = [k.strip() for k in keywords_text.split(',')][:3]
+        Returns:
+            items のインデックス -> 評価結果 の辞書（評価できなかった記事は含まない）
+        """
+        batch_size = max(1, batch_size or int(os.getenv('GEMINI_BATCH_SIZE', DEFAULT_BATCH_SIZE)))
+        results: Dict[int, Dict] = {}
+        pending = list(range(len(items)))
+        
+        for round_no in range(max_rounds):
+            if not pending:
+                break
+            batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
             
-            return score, reason, category, keywords
+            def score_batch(ids: List[int]) -> Dict[int, Dict]:
+                prompt = build_prompt([{'id': i, 'item': items[i]} for i in ids])
+                payload = self._make_json_request(prompt, response_schema)
+                return self._collect_batch_results(payload, ids, validate)
             
-        except Exception as e:
-            print(f"[WARN] Failed to parse Gemini response: {e}")
-            return 50, "分析完了", "technical", []
+            for batch_results in self.scheduler.map(score_batch, batches):
+                results.update(batch_results)
+            
+            pending = [i for i in pending if i not in results]
+            if pending and round_no < max_rounds - 1:
+                print(f"[INFO] Gemini batch: {len(pending)} items missing from response, re-queueing")
+        
+        if pending:
+            print(f"[WARN] Gemini batch: {len(pending)} items could not be scored")
+        print(f"[INFO] Gemini batch scoring: {len(results)}/{len(items)} items "
+              f"(batch size {batch_size})")
+        return results
+    
+    @staticmethod
+    def _collect_batch_results(payload: Any, ids: List[int], validate: Callable[[Dict], bool]) -> Dict[int, Dict]:
+        """バッチ応答を検証し、要求した id の妥当な結果だけを取り出す"""
+        if not isinstance(payload, dict) or not isinstance(payload.get('results'), list):
+            return {}
+        wanted = set(ids)
+        collected = {}
+        for result in payload['results']:
+            if not isinstance(result, dict):
+                continue
+            try:
+                result_id = int(result.get('id'))
+            except (TypeError, ValueError):
+                continue
+            if result_id in wanted and result_id not in collected and validate(result):
+                collected[result_id] = result
+        return collected
+    
+    def _make_json_request(self, prompt: str, response_schema: Dict, max_output_tokens: int = 4096) -> Any:
+        """responseMimeType=application/json でリクエストし、パース済みの JSON を返す"""
+        response = self._make_request(prompt, generation_config={
+            "responseMimeType": "application/json",
+            "responseSchema": response_schema,
+            "maxOutputTokens": max_output_tokens,
+        })
+        if not response:
+            return None
+        text = re.sub(r'^```(?:json)?\s*|\s*```$', '', response.strip())
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            print(f"[WARN] Gemini JSON response could not be parsed: {e}")
+            return None
     
     def _fallback_scoring(self, news_items: List[Dict]) -> List[Dict]:
         """Gemini API利用不可時のフォールバック重要度算出"""
@@ -360,11 +464,18 @@ AI業界のエグゼクティブ向けに、今日の業界動向の要約を作
         
         print("🧠 Gemini Flash Thinking でビジネスインパクトを段階的分析中...")
         
-        enhanced_items = []
+        # 上位10件をスケジューラ経由で並列分析（入力順を維持）
+        enhanced_items = self.scheduler.map(self._analyze_item_business_impact, news_items[:10])
         
-        for item in news_items[:10]:  # 上位10件を分析
-            try:
-                prompt = f"""
+        # 残りのアイテムはそのまま追加
+        enhanced_items.extend(news_items[10:])
+        
+        return enhanced_items
+    
+    def _analyze_item_business_impact(self, item: Dict) -> Dict:
+        """1件のニュースのビジネスインパクトを分析（失敗時は元の項目を返す）"""
+        try:
+            prompt = f"""
 あなたは経営戦略コンサルタントです。以下のAIニュースを段階的に分析してください：
 
 【ニュース情報】
@@ -403,33 +514,24 @@ AI業界のエグゼクティブ向けに、今日の業界動向の要約を作
 ビジネス要旨: [経営層向け1-2文の要約]
 推奨アクション: [具体的な次のステップ]
 """
+            
+            response = self._make_request(prompt)
+            if response:
+                # ビジネス分析結果をパース
+                business_analysis = self._parse_business_analysis(response)
                 
-                response = self._make_request(prompt)
-                if response:
-                    # ビジネス分析結果をパース
-                    business_analysis = self._parse_business_analysis(response)
-                    
-                    enhanced_item = item.copy()
-                    enhanced_item.update({
-                        'business_analysis': business_analysis,
-                        'executive_priority': business_analysis.get('総合スコア', 0)
-                    })
-                    enhanced_items.append(enhanced_item)
-                    
-                    print(f"  🎯 {item.get('title', '')[:50]}... -> 総合: {business_analysis.get('総合スコア', 0)}")
-                    
-                    time.sleep(0.7)  # API制限対策
-                else:
-                    enhanced_items.append(item)
-                    
-            except Exception as e:
-                print(f"[WARN] Business analysis failed: {e}")
-                enhanced_items.append(item)
-        
-        # 残りのアイテムはそのまま追加
-        enhanced_items.extend(news_items[10:])
-        
-        return enhanced_items
+                enhanced_item = item.copy()
+                enhanced_item.update({
+                    'business_analysis': business_analysis,
+                    'executive_priority': business_analysis.get('総合スコア', 0)
+                })
+                print(f"  🎯 {item.get('title', '')[:50]}... -> 総合: {business_analysis.get('総合スコア', 0)}")
+                return enhanced_item
+            else:
+                return item
+        except Exception as e:
+            print(f"[WARN] Business analysis failed: {e}")
+            return item
     
     def _parse_business_analysis(self, response: str) -> Dict:
         """ビジネス分析レスポンスをパース"""
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemini API リクエストスケジューラ
+- RPM / TPM クォータに基づくトークンバケットでリクエストを平準化
+- 同時実行数を制限したスレッドプールで複数リクエストを並列実行
+- 429 (RESOURCE_EXHAUSTED) を受けたら全ワーカーを一時停止して待機
+
+Env (optional):
+  GEMINI_RPM=15               # 1分あたりのリクエスト上限
+  GEMINI_TPM=250000           # 1分あたりのトークン上限（入力+出力の概算）
+  GEMINI_MAX_CONCURRENCY=4    # 同時実行数
+"""
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+
+DEFAULT_RPM = 15
+DEFAULT_TPM = 250000
+DEFAULT_MAX_CONCURRENCY = 4
+# 429 で待機秒数が分からない場合の初期値と上限
+DEFAULT_429_BACKOFF = 5.0
+MAX_429_BACKOFF = 60.0
+
+
+def estimate_tokens(text: str, expected_output: int = 512) -> int:
+    """プロンプト長からトークン数を概算（日本語混在のため 2 文字 ≒ 1 トークンで見積もる）"""
+    return max(1, len(text or "") // 2) + expected_output
+
+
+def parse_retry_after(headers: Optional[dict] = None, body: str = "") -> Optional[float]:
+    """Retry-After ヘッダーまたはエラー本文の retryDelay ("12s") から待機秒数を取り出す"""
+    if headers:
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    match = re.search(r'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"', body or "")
+    if match:
+        return float(match.group(1))
+    return None
+
+
+class TokenBucket:
+    """1分あたり capacity を上限に連続的に補充されるトークンバケット"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float = 1.0):
+        # 上限を超える要求は上限分だけ消費する（永久に待たないため）
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(min(wait, 1.0))
+
+
+class GeminiRequestScheduler:
+    """RPM/TPM・同時実行数・429 を考慮して Gemini 呼び出しを実行する"""
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                 max_concurrency: Optional[int] = None):
+        self.rpm = rpm or int(os.getenv("GEMINI_RPM", DEFAULT_RPM))
+        self.tpm = tpm or int(os.getenv("GEMINI_TPM", DEFAULT_TPM))
+        self.max_concurrency = max_concurrency or int(os.getenv("GEMINI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+        self._requests = TokenBucket(self.rpm)
+        self._tokens = TokenBucket(self.tpm)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._pause_lock = threading.Lock()
+        self._paused_until = 0.0
+        self._backoff = DEFAULT_429_BACKOFF
+        self.stats = {"requests": 0, "rate_limited": 0, "waited_seconds": 0.0}
+
+    def _wait_if_paused(self):
+        while True:
+            with self._pause_lock:
+                remaining = self._paused_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 1.0))
+
+    def acquire(self, estimated_tokens: int = 1):
+        """リクエスト1回分の枠を確保する（必要なら待機）"""
+        started = time.monotonic()
+        self._wait_if_paused()
+        self._requests.acquire(1)
+        self._tokens.acquire(estimated_tokens)
+        waited = time.monotonic() - started
+        with self._pause_lock:
+            self.stats["requests"] += 1
+            self.stats["waited_seconds"] += waited
+
+    def report_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """429 を受けたときに呼ぶ。全ワーカーを retry_after 秒（不明なら指数バックオフ）停止する"""
+        with self._pause_lock:
+            if retry_after is None:
+                delay = self._backoff
+                self._backoff = min(self._backoff * 2, MAX_429_BACKOFF)
+            else:
+                delay = min(float(retry_after), MAX_429_BACKOFF)
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self.stats["rate_limited"] += 1
+        print(f"[WARN] Gemini rate limited (429), pausing requests for {delay:.1f}s")
+        return delay
+
+    def report_success(self):
+        with self._pause_lock:
+            self._backoff = DEFAULT_429_BACKOFF
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """同時実行枠の中で fn を実行する（枠の確保は fn 内の acquire で行う）"""
+        with self._slots:
+            return fn(*args, **kwargs)
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """items の各要素に fn を並列適用し、入力と同じ順序で結果を返す"""
+        items = list(items)
+        if not items:
+            return []
+        workers = min(self.max_concurrency, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda item: self.run(fn, item), items))
+
+
+# プロセス内で共有するスケジューラ（複数の GeminiAnalyzer でクォータを共有する）
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> GeminiRequestScheduler:
+    """シングルトンのスケジューラを取得"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = GeminiRequestScheduler()
+        return _scheduler
@@ -2,14 +2,27 @@
 # -*- coding: utf-8 -*-
 """
 Gemini URL Context Client - GA版URL contextを使った統一的情報収集システム
+- generate_from_urls: 同期版（1リクエストずつ）
+- generate_from_urls_async / gather_from_urls: google-genai の非同期クライアントで
+  複数リクエストを同時実行数の上限付きで並列実行（リトライ待機もイベントループを止めない）
+- close: 非同期クライアントの接続プールとイベントループを閉じる（終了時にも自動で呼ぶ）
+
+Env (optional):
+  GEMINI_MODEL=gemini-3.1-flash-lite-preview
+  GEMINI_URL_CONTEXT_CONCURRENCY=5   # gather_from_urls の同時実行数
 """
+import asyncio
+import atexit
 import os
 import json
 import logging
 import re
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Sequence
 from datetime import datetime
 
+from llm_cache import get_llm_cache, make_key
+
 # Gemini API imports
 try:
     from google import genai
@@ -42,6 +55,9 @@ def normalize_model_name(model_name: Optional[str]) -> str:
     compact = re.sub(r"[\s_]+", "", model_name.strip().lower())
     return MODEL_ALIASES.get(compact, model_name.strip())
 
+
+DEFAULT_CONCURRENCY = 5
+
 class GeminiURLContextClient:
     """Gemini URL Context APIクライアント"""
     
@@ -54,6 +70,11 @@ class GeminiURLContextClient:
         self.default_model = normalize_model_name(
             os.getenv("GEMINI_MODEL", "gemini-3.1-flash-lite-preview")
         )
+        self.response_cache = get_llm_cache()
+        self.max_concurrency = int(os.getenv("GEMINI_URL_CONTEXT_CONCURRENCY", DEFAULT_CONCURRENCY))
+        # 非同期クライアントの接続プールはイベントループに紐づくため、同期ラッパーは同じループを使い回す
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        atexit.register(self.close)
         
     def _make_client(self) -> 'genai.Client':
         """Geminiクライアント作成（Vertex AI対応）"""
@@ -87,26 +108,10 @@ class GeminiURLContextClient:
         Returns:
             解析結果辞書（text, url_context_metadata, usage_metadata含む）
         """
-        if not urls:
-            raise ValueError("URLリストが空です")
-        
-        if len(urls) > 20:
-            logger.warning(f"⚠️ URL数が制限を超過: {len(urls)} > 20")
-            urls = urls[:20]
-        
-        model_id = model or self.default_model
-        logger.info(f"🤖 Gemini解析開始: model={model_id}, urls={len(urls)}件")
-        
-        # ツール設定
-        tools = [{"url_context": {}}]
-        
-        # Google Search有効化
-        if enable_search or os.getenv("ENABLE_GOOGLE_SEARCH", "").lower() in ("1", "true", "yes"):
-            tools.append({"google_search": {}})
-            logger.info("🔍 Google Search grounding有効")
-        
-        # プロンプト構築
-        content_text = f"{prompt}\\n\\n対象URL:\\n" + "\\n".join(urls)
+        urls, model_id, tools, content_text, cache_key = self._prepare_request(prompt, urls, model, enable_search)
+        cached = self._cached_result(cache_key, urls)
+        if cached:
+            return cached
         
         # API実行（リトライ付き）
         for attempt in range(max_retries + 1):
@@ -118,34 +123,183 @@ class GeminiURLContextClient:
                     contents=content_text,
                     config=GenerateContentConfig(tools=tools),
                 )
-                
-                # レスポンス解析
-                result = self._parse_response(resp, urls)
-                
-                # 成功ログ
-                self._log_success(result, model_id, len(urls))
-                
-                return result
+                return self._handle_response(resp, urls, model_id, cache_key)
                 
             except Exception as e:
                 logger.error(f"❌ API呼び出し失敗 (試行 {attempt + 1}): {e}")
                 
                 if attempt == max_retries:
                     # 最終試行でも失敗
-                    return {
-                        "text": f"エラー: URL解析に失敗しました - {str(e)}",
-                        "url_context_metadata": None,
-                        "usage_metadata": None,
-                        "error": str(e),
-                        "raw": None
-                    }
+                    return self._error_result(e)
                 
                 # リトライ待機
-                import time
                 time.sleep(2 ** attempt)
         
         return {}
     
+    async def generate_from_urls_async(
+        self,
+        prompt: str,
+        urls: List[str],
+        model: Optional[str] = None,
+        enable_search: bool = False,
+        max_retries: int = 3
+    ) -> Dict[str, Any]:
+        """generate_from_urls の非同期版（client.aio を使用し、リトライ待機は asyncio.sleep）"""
+        urls, model_id, tools, content_text, cache_key = self._prepare_request(prompt, urls, model, enable_search)
+        cached = self._cached_result(cache_key, urls)
+        if cached:
+            return cached
+        
+        for attempt in range(max_retries + 1):
+            try:
+                logger.info(f"📡 API呼び出し中(async)... (試行 {attempt + 1}/{max_retries + 1})")
+                
+                resp = await self.client.aio.models.generate_content(
+                    model=model_id,
+                    contents=content_text,
+                    config=GenerateContentConfig(tools=tools),
+                )
+                return self._handle_response(resp, urls, model_id, cache_key)
+                
+            except Exception as e:
+                logger.error(f"❌ API呼び出し失敗 (試行 {attempt + 1}): {e}")
+                
+                if attempt == max_retries:
+                    return self._error_result(e)
+                
+                # 他のリクエストを止めずに待機
+                await asyncio.sleep(2 ** attempt)
+        
+        return {}
+    
+    async def gather_from_urls_async(
+        self,
+        requests: Sequence[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        複数の generate_from_urls_async を同時実行数の上限付きで並列実行する
+        
+        Args:
+            requests: generate_from_urls_async のキーワード引数の辞書（prompt, urls, ...）のリスト
+            max_concurrency: 同時実行数（省略時は GEMINI_URL_CONTEXT_CONCURRENCY）
+            
+        Returns:
+            requests と同じ順序の解析結果リスト（失敗したリクエストは "error" を含む辞書）
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_concurrency))
+        
+        async def run(request: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.generate_from_urls_async(**request)
+                except Exception as e:
+                    # URLが空などの入力エラーも他のリクエストを巻き込まずに結果として返す
+                    return self._error_result(e)
+        
+        return list(await asyncio.gather(*(run(request) for request in requests)))
+    
+    def gather_from_urls(
+        self,
+        requests: Sequence[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """gather_from_urls_async の同期ラッパー（実行中のイベントループの外から呼ぶ）"""
+        if not requests:
+            return []
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.gather_from_urls_async(requests, max_concurrency))
+    
+    def close(self):
+        """gather_from_urls のイベントループと非同期クライアントの接続プールを閉じる（何度呼んでもよい）"""
+        loop, self._loop = self._loop, None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            aclose = getattr(self.client.aio, "aclose", None)
+            if aclose is not None:
+                loop.run_until_complete(aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        except Exception as e:
+            logger.warning(f"⚠️ 非同期クライアントの終了処理に失敗: {e}")
+        finally:
+            loop.close()
+    
+    def _prepare_request(
+        self,
+        prompt: str,
+        urls: List[str],
+        model: Optional[str],
+        enable_search: bool
+    ):
+        """URL数の制限・ツール構成・送信テキスト・キャッシュキーを組み立てる"""
+        if not urls:
+            raise ValueError("URLリストが空です")
+        
+        if len(urls) > 20:
+            logger.warning(f"⚠️ URL数が制限を超過: {len(urls)} > 20")
+            urls = urls[:20]
+        
+        model_id = model or self.default_model
+        logger.info(f"🤖 Gemini解析開始: model={model_id}, urls={len(urls)}件")
+        
+        # ツール設定
+        tools = [{"url_context": {}}]
+        
+        # Google Search有効化
+        if enable_search or os.getenv("ENABLE_GOOGLE_SEARCH", "").lower() in ("1", "true", "yes"):
+            tools.append({"google_search": {}})
+            logger.info("🔍 Google Search grounding有効")
+        
+        # プロンプト構築
+        content_text = f"{prompt}\\n\\n対象URL:\\n" + "\\n".join(urls)
+        
+        # 同じモデル・プロンプト・URL・ツール構成の応答はキャッシュから返す
+        cache_key = make_key(model_id, prompt, urls, config={"tools": tools})
+        return urls, model_id, tools, content_text, cache_key
+    
+    def _cached_result(self, cache_key: str, urls: List[str]) -> Optional[Dict[str, Any]]:
+        """キャッシュ済みの応答があれば結果辞書として返す"""
+        cached_text = self.response_cache.get(cache_key)
+        if cached_text is None:
+            return None
+        logger.info("💾 キャッシュ済みの応答を使用")
+        return {
+            "text": cached_text,
+            "url_context_metadata": None,
+            "usage_metadata": None,
+            "raw": None,
+            "timestamp": datetime.now().isoformat(),
+            "input_urls": urls,
+            "cached": True,
+            "cache_key": cache_key
+        }
+    
+    def _handle_response(self, resp: Any, urls: List[str], model_id: str, cache_key: str) -> Dict[str, Any]:
+        """レスポンスを解析し、本文があればキャッシュに保存する"""
+        result = self._parse_response(resp, urls)
+        
+        # 成功ログ
+        self._log_success(result, model_id, len(urls))
+        
+        if getattr(resp, "text", None):
+            self.response_cache.set(cache_key, result["text"])
+            result["cache_key"] = cache_key
+        
+        return result
+    
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        return {
+            "text": f"エラー: URL解析に失敗しました - {str(error)}",
+            "url_context_metadata": None,
+            "usage_metadata": None,
+            "error": str(error),
+            "raw": None
+        }
+    
     def _parse_response(self, resp: Any, urls: List[str]) -> Dict[str, Any]:
         """Geminiレスポンスを解析"""
         
@@ -196,7 +350,15 @@ class GeminiURLContextClient:
         focus_topics: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """ニュース記事の要約（AI業界特化）"""
-        
+        return self.generate_from_urls(
+            prompt=self.news_summary_prompt(focus_topics),
+            urls=article_urls,
+            enable_search=False  # ニュース記事は直接読み取り
+        )
+    
+    @staticmethod
+    def news_summary_prompt(focus_topics: Optional[List[str]] = None) -> str:
+        """summarize_news_articles のプロンプト（gather_from_urls でまとめて送る場合にも使う）"""
         focus_text = ""
         if focus_topics:
             focus_text = f"\\n\\n特に以下のトピックに注目して解析してください:\\n- " + "\\n- ".join(focus_topics)
@@ -221,11 +383,7 @@ class GeminiURLContextClient:
 記事のタイトル、発信元、発表日時も含めて整理してください。
         """.strip()
         
-        return self.generate_from_urls(
-            prompt=prompt,
-            urls=article_urls,
-            enable_search=False  # ニュース記事は直接読み取り
-        )
+        return prompt
     
     def analyze_product_documentation(
         self,
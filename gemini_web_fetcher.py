@@ -5,15 +5,15 @@ Gemini APIを使用してWebコンテンツや403エラーになるソースか
 import os
 import time
 import json
-import requests
 from typing import List, Dict, Optional
 from gemini_analyzer import GeminiAnalyzer
+import http_client
 
 class GeminiWebFetcher:
     def __init__(self):
         """Gemini Web Fetcher初期化"""
         self.analyzer = GeminiAnalyzer()
-        self.session = requests.Session()
+        self.session = http_client.get_session()
         
     def fetch_from_problematic_source(self, url: str, source_name: str) -> List[Dict]:
         """
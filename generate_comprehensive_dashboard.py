@@ -108,7 +108,8 @@ def analyze_ai_landscape():
     print(f"⏰ 生成時刻: {now.strftime('%H:%M JST')}")
     print("=" * 60)
     
-    # データ収集
+    # データ収集（設定の読み込み・_cache/ とフィードキャッシュの準備）
+    build.configure()
     feeds_conf = build.parse_feeds()
     
     dashboard_data = {
@@ -133,9 +134,13 @@ def analyze_ai_landscape():
         'Posts': {'name': 'SNS・論文', 'icon': '🧪', 'focus': 'research'}
     }
     
+    # build.py が直前に保存した収集スナップショットがあればフィード・X の CSV を取り直さない
+    collected = build.collect_items(feeds_conf, reuse=True)
+    
     for category_name in ['Business', 'Tools', 'Posts']:
-        feeds = build.get_category(feeds_conf, category_name)
-        items = build.gather_items(feeds, category_name)
+        items = collected[category_name]
+        # 複数ソースが報じた同じストーリーは代表記事だけを Gemini に渡す
+        items = build.keep_story_representatives(items)
         
         # Gemini APIで有益な情報を選別（全カテゴリ）
         # 環境変数でGemini選別をスキップ可能
@@ -161,7 +166,7 @@ def analyze_ai_landscape():
             
             # 403エラーのソースを特定
             failed_sources = []
-            for feed in feeds:
+            for feed in build.get_category(feeds_conf, category_name):
                 if 'Google News' in feed.get('name', ''):
                     failed_sources.append(feed['name'])
             
@@ -295,8 +300,9 @@ def analyze_ai_landscape():
         total_items += len(displayed_topics)
     
     # X投稿分析（Gemini API使用）
+    # X 投稿は収集スナップショット（build.collect_items）のものを使う（CSV 取得・Gemini 強化をやり直さない）
+    x_posts = collected.get("X", [])
     try:
-        x_posts = build.gather_x_posts(build.X_POSTS_CSV)
         print(f"📊 X投稿取得: 合計 {len(x_posts)} 件")
         
         # デバッグ: 最初の3件の投稿データを表示
@@ -320,7 +326,6 @@ def analyze_ai_landscape():
         print(f"⚠️ X投稿の分析でエラー: {e}")
         # エラー時もフォールバック処理を実行
         try:
-            x_posts = build.gather_x_posts(build.X_POSTS_CSV)
             if x_posts:
                 print(f"🔄 フォールバック処理でX投稿を処理: {len(x_posts)}件")
                 fallback_result = fallback_x_post_analysis(x_posts)
@@ -651,6 +656,33 @@ def analyze_geographic_trends(data):
     
     return dict(geographic_mentions.most_common(3))
 
+# select_valuable_news_with_gemini のバッチ評価で使う responseSchema
+EVALUATION_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "results": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "id": {"type": "INTEGER"},
+                    "valuable": {"type": "BOOLEAN"},
+                    "practicality_score": {"type": "INTEGER"},
+                    "business_impact": {"type": "INTEGER"},
+                    "specificity": {"type": "INTEGER"},
+                    "urgency": {"type": "INTEGER"},
+                    "feasibility": {"type": "INTEGER"},
+                    "total_score": {"type": "INTEGER"},
+                    "reason": {"type": "STRING"},
+                    "actionable_insight": {"type": "STRING"},
+                },
+                "required": ["id", "valuable", "practicality_score", "business_impact", "total_score", "reason"],
+            },
+        },
+    },
+    "required": ["results"],
+}
+
 def select_valuable_news_with_gemini(items, category_name, gemini_analyzer):
     """Gemini APIを使って実用性重視でニュースを選別"""
     if not items:
@@ -705,18 +737,19 @@ def select_valuable_news_with_gemini(items, category_name, gemini_analyzer):
     
     print(f"🔍 {criteria.get('name', category_name)}: {len(items)}件から実用性重視で選別中...")
     
-    for i, item in enumerate(items[:15]):  # 15件まで拡大して質の高い記事を確保
-        try:
-            print(f"  📋 {i+1}/15: {item.get('title', '')[:40]}... を評価中")
-            
-            # 実用性を重視した詳細プロンプト
-            evaluation_prompt = f"""
-あなたは経験豊富な経営コンサルタントです。以下のニュースをビジネスマンの実用性観点で評価してください。
-
-【記事情報】
-タイトル: {item.get('title', '')[:100]}
-ソース: {item.get('_source', 'Unknown')}
-要約: {item.get('_summary', '')[:200]}
+    candidates = items[:15]  # 15件まで拡大して質の高い記事を確保
+    
+    def build_evaluation_prompt(entries):
+        # 評価基準は1リクエストにつき1回だけ送り、記事は id 付きで並べる
+        articles = "\n\n".join(
+            f"[id: {entry['id']}]\n"
+            f"タイトル: {entry['item'].get('title', '')[:100]}\n"
+            f"ソース: {entry['item'].get('_source', 'Unknown')}\n"
+            f"要約: {entry['item'].get('_summary', '')[:200]}"
+            for entry in entries
+        )
+        return f"""
+あなたは経験豊富な経営コンサルタントです。以下の{len(entries)}件のニュースをそれぞれビジネスマンの実用性観点で評価してください。
 
 【評価基準】
 {criteria.get('criteria', '')}
@@ -728,66 +761,49 @@ def select_valuable_news_with_gemini(items, category_name, gemini_analyzer):
 4. 緊急性（競合他社より先に知る必要があるか）: 1-10
 5. 実現可能性（中小企業でも適用可能か）: 1-10
 
-以下のJSON形式で回答:
-{{
-  "valuable": true/false,
-  "practicality_score": 8,
-  "business_impact": 7,
-  "specificity": 6,
-  "urgency": 9,
-  "feasibility": 8,
-  "total_score": 38,
-  "reason": "選別理由を簡潔に50文字以内で",
-  "actionable_insight": "ビジネスマンが取るべき具体的アクション"
-}}
+各記事について results に1件ずつ、必ず同じ id を付けて回答してください。
+reason は選別理由を簡潔に50文字以内で、actionable_insight はビジネスマンが取るべき具体的アクションです。
+
+【記事一覧】
+{articles}
 """
+    
+    print(f"  📋 {len(candidates)}件をまとめて評価中...")
+    evaluations = gemini_analyzer.score_in_batches(
+        candidates, build_evaluation_prompt, EVALUATION_SCHEMA,
+        lambda result: isinstance(result.get('total_score'), (int, float))
+    )
+    
+    for i, item in enumerate(candidates):
+        evaluation = evaluations.get(i)
+        if not evaluation:
+            print(f"  ⚠️ 評価失敗: {item.get('title', '')[:30]}... - Gemini APIレスポンスなし")
+            continue
+        
+        # 実用性重視の選別条件：総合スコア25以上（50点満点中）
+        total_score = evaluation.get('total_score', 0)
+        practicality = evaluation.get('practicality_score', 0)
+        
+        if (evaluation.get('valuable', False) and 
+            total_score >= 25 and 
+            practicality >= 6):  # 実用性6点以上必須
             
-            # Gemini APIリクエスト
-            analysis_result = gemini_analyzer._make_request(evaluation_prompt)
+            # 評価情報を追加
+            item['gemini_score'] = total_score
+            item['practicality_score'] = practicality
+            item['business_impact'] = evaluation.get('business_impact', 0)
+            item['gemini_reason'] = evaluation.get('reason', '')
+            item['actionable_insight'] = evaluation.get('actionable_insight', '')
+            item['key_points'] = evaluation.get('actionable_insight', '')
+            selected_items.append(item)
             
-            if not analysis_result:
-                print(f"  ⚠️ 評価失敗: {item.get('title', '')[:30]}... - Gemini APIレスポンスなし")
-                continue
+            print(f"  ✅ 選別: {item['title'][:40]}... (総合:{total_score}/50, 実用性:{practicality}/10)")
             
-            # JSON解析
-            import json
-            import re
-            json_match = re.search(r'\{.*\}', analysis_result, re.DOTALL)
-            if json_match:
-                evaluation = json.loads(json_match.group())
-                
-                # 実用性重視の選別条件：総合スコア25以上（50点満点中）
-                total_score = evaluation.get('total_score', 0)
-                practicality = evaluation.get('practicality_score', 0)
-                
-                if (evaluation.get('valuable', False) and 
-                    total_score >= 25 and 
-                    practicality >= 6):  # 実用性6点以上必須
-                    
-                    # 評価情報を追加
-                    item['gemini_score'] = total_score
-                    item['practicality_score'] = practicality
-                    item['business_impact'] = evaluation.get('business_impact', 0)
-                    item['gemini_reason'] = evaluation.get('reason', '')
-                    item['actionable_insight'] = evaluation.get('actionable_insight', '')
-                    item['key_points'] = evaluation.get('actionable_insight', '')
-                    selected_items.append(item)
-                    
-                    print(f"  ✅ 選別: {item['title'][:40]}... (総合:{total_score}/50, 実用性:{practicality}/10)")
-                    
-                    # 最大件数に達したら終了
-                    if len(selected_items) >= criteria.get('max_items', 8):
-                        break
-                else:
-                    print(f"  ❌ 除外: {item['title'][:40]}... (総合:{total_score}/50, 実用性:{practicality}/10)")
-                        
-        except Exception as e:
-            print(f"  ⚠️ 評価エラー: {item.get('title', '')[:30]}... - {e}")
-            continue
-        
-        # APIレート制限対策
-        import time
-        time.sleep(0.3)  # より慎重に
+            # 最大件数に達したら終了
+            if len(selected_items) >= criteria.get('max_items', 8):
+                break
+        else:
+            print(f"  ❌ 除外: {item['title'][:40]}... (総合:{total_score}/50, 実用性:{practicality}/10)")
     
     # 選別されなかった場合は元のリストから上位を返す（品質保証）
     if not selected_items:
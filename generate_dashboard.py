@@ -28,7 +28,8 @@ def analyze_ai_news():
     print(f"⏰ 生成時刻: {datetime.now().strftime('%H:%M JST')}")
     print("=" * 60)
     
-    # データ収集
+    # データ収集（設定の読み込み・_cache/ とフィードキャッシュの準備）
+    build.configure()
     feeds_conf = build.parse_feeds()
     
     dashboard_data = {
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+フィード取得元ホストの健全性記録とサーキットブレーカー
+- ホストごとに連続失敗数・最後のステータス・直近の取得時間（p50/p90）を _cache/host_health.json に保存
+- 連続 HOST_BREAKER_THRESHOLD 回失敗したホストは回路を開き、クールダウンが明けるまで取得しない
+  （明けたら 1 フィードだけ試し、成功で閉じ、失敗ならクールダウンを倍にして開き直す）
+- 失敗が続いているホスト（degraded）はリトライと高度な取得を 1 回に絞る
+- 最後に成功した取得方法（feedparser / advanced / gemini）と User-Agent を覚え、次回はそれから試す
+
+Env (optional):
+  HOST_BREAKER_THRESHOLD=3        # 回路を開く連続失敗数
+  HOST_BREAKER_COOLDOWN_HOURS=6   # 最初のクールダウン（開くたびに倍、上限 48 時間）
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from json_store import atomic_write_json, load_versioned_json
+
+CACHE_VERSION = 1
+
+DEFAULT_THRESHOLD = 3
+DEFAULT_COOLDOWN_HOURS = 6.0
+MAX_COOLDOWN_HOURS = 48.0
+# 取得時間の percentile に使う直近のサンプル数
+LATENCY_SAMPLES = 20
+
+
+def host_of(url: str) -> str:
+    return urlparse(url or "").netloc.lower()
+
+
+def _percentile(samples: List[float], p: float) -> Optional[float]:
+    """最近傍順位法の percentile（サンプルが無ければ None）"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * p // 100))  # ceil(n * p / 100)
+    return ordered[int(rank) - 1]
+
+
+class HostHealth:
+    """ホスト単位の取得結果とサーキットブレーカー（スレッドセーフ）"""
+
+    def __init__(self, path: Path, enabled: bool = True, threshold: Optional[int] = None,
+                 cooldown_hours: Optional[float] = None):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.threshold = threshold or int(os.getenv("HOST_BREAKER_THRESHOLD", DEFAULT_THRESHOLD))
+        self.cooldown_hours = cooldown_hours or float(os.getenv("HOST_BREAKER_COOLDOWN_HOURS",
+                                                                DEFAULT_COOLDOWN_HOURS))
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._probing = set()  # クールダウン明けに試行中のホスト（実行中のみ）
+        self._dirty = False
+        self.skipped = 0
+        if enabled:
+            self.load()
+
+    def load(self):
+        """記録ファイルを読み込み（壊れていれば空で開始）"""
+        raw = load_versioned_json(self.path, CACHE_VERSION, "Host health")
+        self._hosts = raw.get("hosts", {}) if raw else {}
+        if raw:
+            print(f"[INFO] Loaded host health for {len(self._hosts)} hosts")
+
+    def save(self):
+        """変更があればアトミックに書き出す"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                atomic_write_json(self.path, {"version": CACHE_VERSION, "hosts": self._hosts})
+                self._dirty = False
+                print(f"[INFO] Saved host health ({len(self._hosts)} hosts)")
+            except Exception as e:
+                print(f"[WARN] Failed to save host health: {e}")
+
+    def _record(self, host: str) -> Dict[str, Any]:
+        return self._hosts.setdefault(host, {"failures": 0, "successes": 0, "trips": 0, "latencies": []})
+
+    def allow(self, url: str, now: Optional[float] = None) -> bool:
+        """
+        url のホストから取得してよいか。回路が開いていれば False。
+        クールダウン明けは最初の 1 件だけ試行を許し、結果が出るまで同じホストの他のフィードは見送る
+        """
+        if not self.enabled:
+            return True
+        host = host_of(url)
+        now = time.time() if now is None else now
+        with self._lock:
+            record = self._hosts.get(host)
+            open_until = (record or {}).get("open_until")
+            if not open_until:
+                return True
+            if now >= open_until and host not in self._probing:
+                self._probing.add(host)
+                return True
+            self.skipped += 1
+            return False
+
+    def record(self, url: str, ok: bool, seconds: float, status: Any = None, now: Optional[float] = None):
+        """1 フィードの取得結果を記録し、連続失敗がしきい値に達したら回路を開く"""
+        if not self.enabled:
+            return
+        host = host_of(url)
+        now = time.time() if now is None else now
+        with self._lock:
+            record = self._record(host)
+            record["latencies"] = (record["latencies"] + [round(seconds, 3)])[-LATENCY_SAMPLES:]
+            record["last_status"] = status
+            record["checked_at"] = now
+            was_probing = host in self._probing
+            self._probing.discard(host)
+            if ok:
+                record["successes"] += 1
+                record["failures"] = 0
+                record["trips"] = 0
+                record.pop("open_until", None)
+            else:
+                record["failures"] += 1
+                record["last_error_at"] = now
+                if record["failures"] >= self.threshold or was_probing:
+                    record["trips"] += 1
+                    cooldown = min(self.cooldown_hours * 2 ** (record["trips"] - 1), MAX_COOLDOWN_HOURS)
+                    record["open_until"] = now + cooldown * 3600
+                    print(f"[WARN] Circuit opened for {host} after {record['failures']} failures "
+                          f"(last status: {status}, cooldown {cooldown:g}h)")
+            self._dirty = True
+
+    def remember(self, url: str, method: str, user_agent: Optional[str] = None):
+        """成功した取得方法（feedparser / advanced / gemini）と User-Agent を覚える"""
+        if not self.enabled:
+            return
+        with self._lock:
+            record = self._record(host_of(url))
+            if record.get("method") != method or record.get("user_agent") != user_agent:
+                record["method"] = method
+                record["user_agent"] = user_agent
+                self._dirty = True
+
+    def preferred(self, url: str) -> Dict[str, Optional[str]]:
+        """前回成功した取得方法と User-Agent（未記録なら空）"""
+        if not self.enabled:
+            return {}
+        with self._lock:
+            record = self._hosts.get(host_of(url)) or {}
+            return {k: record[k] for k in ("method", "user_agent") if record.get(k)}
+
+    def degraded(self, url: str) -> bool:
+        """直近の取得が失敗しているホストか（リトライや高価なフォールバックを省く）"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            return (self._hosts.get(host_of(url)) or {}).get("failures", 0) > 0
+
+    def latency_percentiles(self, url_or_host: str) -> Dict[str, Optional[float]]:
+        """直近の取得時間の p50 / p90（秒）"""
+        host = host_of(url_or_host) if "://" in url_or_host else url_or_host.lower()
+        with self._lock:
+            samples = list((self._hosts.get(host) or {}).get("latencies", []))
+        return {"p50": _percentile(samples, 50), "p90": _percentile(samples, 90)}
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """失敗しているホストの状態（build_metrics.json 用）"""
+        with self._lock:
+            failing = {host: dict(record) for host, record in self._hosts.items() if record.get("failures")}
+        result = {}
+        for host, record in sorted(failing.items()):
+            open_until = record.get("open_until")
+            result[host] = {
+                "failures": record["failures"],
+                "last_status": record.get("last_status"),
+                "open_until": (datetime.fromtimestamp(open_until, timezone.utc).isoformat()
+                               if open_until else None),
+                **self.latency_percentiles(host),
+            }
+        return result
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+プロセス共有の HTTP クライアント（requests.Session + urllib3 のコネクションプール）
+- 同じホストへの 2 回目以降のリクエストは keep-alive の接続を再利用し、TCP/TLS の確立を省く
+- ホストごとの同時接続数は HTTP_POOL_PER_HOST で上限を設け、超えた分は空きを待つ
+- Accept-Encoding は urllib3 が展開できる形式だけを送る（gzip/deflate、brotli/zstd は
+  brotli・zstandard パッケージがあれば）
+- HTTP/2 は requests/urllib3 が対応していないため HTTP/1.1 の keep-alive で代替する
+
+Env (optional):
+  HTTP_POOL_HOSTS=32      # 接続を保持するホスト数
+  HTTP_POOL_PER_HOST=4    # ホストごとの最大同時接続数
+  HTTP_TIMEOUT=30         # timeout 未指定時のタイムアウト（秒）
+"""
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+DEFAULT_POOL_HOSTS = 32
+DEFAULT_POOL_PER_HOST = 4
+DEFAULT_TIMEOUT = 30
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (compatible; DailyAINewsBot/1.0; +https://github.com/awano27/daily-ai-news)'
+# urllib3 がデコードできる圧縮形式（brotli / zstandard が入っていれば含まれる）
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        print(f"[WARN] Invalid {name}, using default {default}")
+        return default
+
+
+def create_session(pool_hosts: Optional[int] = None, per_host: Optional[int] = None) -> requests.Session:
+    """コネクションプール付きの Session を作る（通常は get_session の共有インスタンスを使う）"""
+    pool_hosts = pool_hosts or _env_int("HTTP_POOL_HOSTS", DEFAULT_POOL_HOSTS)
+    per_host = per_host or _env_int("HTTP_POOL_PER_HOST", DEFAULT_POOL_PER_HOST)
+    session = requests.Session()
+    # pool_block=True: ホストごとの接続数が per_host に達したら新しい接続を張らずに空きを待つ
+    adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=per_host, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        'User-Agent': DEFAULT_USER_AGENT,
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+def get_session() -> requests.Session:
+    """シングルトンの Session を取得（スレッド間で共有してよい。ヘッダーはリクエストごとに渡す）"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def close_session():
+    """共有 Session の接続を閉じる（次の get_session で作り直す）"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """共有 Session でリクエストする（timeout 未指定なら HTTP_TIMEOUT）"""
+    kwargs.setdefault("timeout", _env_int("HTTP_TIMEOUT", DEFAULT_TIMEOUT))
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+_cache/ 配下の JSON ファイルの読み書き（feed_cache・llm_cache・host_health・x_ingest・build_metrics で共用）
+- 読み込み: 無い・壊れている・バージョンが違う場合は None（呼び出し側は空で開始する）
+- 書き出し: 一時ファイル（<name>.tmp）に書いてから os.replace で置き換える（途中で落ちても壊れない）
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def load_json(path: Path, label: str) -> Optional[Dict[str, Any]]:
+    """JSON オブジェクトを読み込む（無い・壊れている場合は None）"""
+    path = Path(path)
+    try:
+        if not path.exists():
+            return None
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(raw, dict):
+            raise ValueError(f"expected an object, got {type(raw).__name__}")
+        return raw
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError, ValueError) as e:
+        print(f"[WARN] {label} corrupted: {e}")
+        return None
+
+
+def load_versioned_json(path: Path, version: int, label: str) -> Optional[Dict[str, Any]]:
+    """"version" が一致する JSON オブジェクトを読み込む（無い・壊れている・バージョン違いは None）"""
+    raw = load_json(path, label)
+    if raw is not None and raw.get("version") != version:
+        print(f"[INFO] {label} version mismatch, starting fresh")
+        return None
+    return raw
+
+
+def atomic_write_text(path: Path, text: str):
+    """一時ファイル経由でアトミックに書き出す"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def atomic_write_json(path: Path, data: Any, **dumps_kwargs):
+    """data を JSON にして一時ファイル経由でアトミックに書き出す（dumps_kwargs は json.dumps へ）"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, **dumps_kwargs))
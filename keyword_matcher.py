@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+キーワード表の一括マッチャー（スコアリング・関連度フィルター共通）
+- 複数のキーワード表（重み付き dict / リスト）を 1 つのトライ型正規表現にコンパイル
+- テキストを 1 回走査するだけで、全表のヒットと重みを取り出せる
+- 走査コストはテキスト長に比例し、キーワード数を増やしてもほとんど変わらない
+- 正規表現のコンパイルは最初の scan まで遅らせる（モジュール定数として定義しても import が重くならない）
+
+判定は従来の `keyword in text` と同じ部分一致。呼び出し側で小文字化したテキストを渡す前提のため、
+大文字を含むキーワードは（従来どおり）小文字化済みテキストにはヒットしない。
+
+例:
+    MATCHER = KeywordMatcher({"companies": {"openai": 100, "google": 90}, "exclude": ["crypto"]})
+    hits = MATCHER.scan("openai and google ...")
+    hits.first("companies")  -> ("openai", 100)
+    hits.total("companies")  -> 190
+"""
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+Table = Union[Mapping[str, float], Iterable[str]]
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """キーワード集合をトライ構造の正規表現に変換（同じ開始位置では最長一致を返す）"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # 子ノードを優先して試す（貪欲）ので、より長いキーワードが先にヒットする
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+class KeywordHits:
+    """1 テキスト分のマッチ結果"""
+
+    __slots__ = ("_matcher", "found")
+
+    def __init__(self, matcher: "KeywordMatcher", found: set):
+        self._matcher = matcher
+        self.found = found
+
+    def hits(self, table: str) -> List[Tuple[str, float]]:
+        """表の並び順でヒットした (キーワード, 重み)。表内の重複キーワードはその数だけ返す"""
+        return [(kw, w) for kw, w in self._matcher.tables[table] if kw in self.found]
+
+    def any(self, table: str) -> bool:
+        return any(kw in self.found for kw, _ in self._matcher.tables[table])
+
+    def count(self, table: str) -> int:
+        return sum(1 for kw, _ in self._matcher.tables[table] if kw in self.found)
+
+    def total(self, table: str) -> float:
+        return sum(w for kw, w in self._matcher.tables[table] if kw in self.found)
+
+    def first(self, table: str) -> Optional[Tuple[str, float]]:
+        """表の並び順で最初にヒットした (キーワード, 重み)"""
+        for kw, w in self._matcher.tables[table]:
+            if kw in self.found:
+                return kw, w
+        return None
+
+
+class KeywordMatcher:
+    """複数のキーワード表を 1 つのオートマトン（正規表現）にまとめたマッチャー"""
+
+    def __init__(self, tables: Mapping[str, Table]):
+        self.tables: Dict[str, List[Tuple[str, float]]] = {}
+        for name, table in tables.items():
+            if isinstance(table, Mapping):
+                entries = [(kw, float(w)) for kw, w in table.items()]
+            else:
+                entries = [(kw, 1.0) for kw in table]
+            self.tables[name] = [(kw, w) for kw, w in entries if kw]
+        self._automaton: Optional[Tuple[Optional["re.Pattern"], Dict[str, Tuple[str, ...]]]] = None
+
+    def _compile(self) -> Tuple[Optional["re.Pattern"], Dict[str, Tuple[str, ...]]]:
+        """(正規表現, キーワード -> 接頭辞キーワード) を初回だけ作る（並行に呼ばれても結果は同じ）"""
+        if self._automaton is None:
+            keywords = {kw for entries in self.tables.values() for kw, _ in entries}
+            # 最長一致したキーワードから、同じ位置で始まる短いキーワード（接頭辞）をすべて引けるようにする
+            prefixes = {
+                kw: tuple(kw[:i] for i in range(1, len(kw) + 1) if kw[:i] in keywords)
+                for kw in keywords
+            }
+            # 先読み (?=...) で全位置を調べるため、重なり合うヒットも取りこぼさない
+            regex = re.compile(f"(?=({_trie_pattern(keywords)}))") if keywords else None
+            self._automaton = (regex, prefixes)
+        return self._automaton
+
+    def scan(self, text: str) -> KeywordHits:
+        """テキストを 1 回走査して全表のヒットを返す"""
+        found: set = set()
+        regex, prefixes = self._compile()
+        if regex is not None and text:
+            for match in regex.finditer(text):
+                hit = match.group(1)
+                if hit:
+                    found.update(prefixes[hit])
+        return KeywordHits(self, found)
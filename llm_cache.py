@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM (Gemini) 応答のディスクキャッシュ
+- キーは モデル + プロンプト + URL + 生成設定 の BLAKE2b ダイジェスト
+- 作成からの保持期間（TTL）と件数上限（古い順に削除）を持つ
+- 毎時の実行で同じ記事・X投稿が再登場しても Gemini を再度呼ばない
+- ヒット/ミス数を記録し、プロセス終了時に保存と集計表示を行う
+
+Env (optional):
+  LLM_CACHE_ENABLED=1          # 0 で無効化
+  LLM_CACHE_TTL_HOURS=72       # 応答の保持時間
+  LLM_CACHE_MAX_ENTRIES=5000   # 件数上限
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from json_store import atomic_write_json, load_versioned_json
+
+CACHE_VERSION = 1
+DEFAULT_PATH = Path("_cache") / "llm_responses.json"
+DEFAULT_TTL_HOURS = 72
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def make_key(model: str, prompt: str, urls: Optional[Iterable[str]] = None,
+             config: Optional[Dict[str, Any]] = None) -> str:
+    """モデル・プロンプト・URL・生成設定から決定的なキーを作る"""
+    material = json.dumps(
+        {"model": model, "prompt": prompt, "urls": list(urls or []), "config": config or {}},
+        ensure_ascii=False, sort_keys=True, default=str,
+    )
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LLMResponseCache:
+    """TTL・件数上限付きの応答キャッシュ（スレッドセーフ）"""
+
+    def __init__(self, path: Path = DEFAULT_PATH, enabled: bool = True,
+                 ttl_hours: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.ttl_seconds = (ttl_hours or float(os.getenv("LLM_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS))) * 3600
+        self.max_entries = max_entries or int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}  # key -> {"v": 応答, "t": 作成時刻}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if enabled:
+            self.load()
+
+    def load(self):
+        """キャッシュファイルを読み込み（壊れていれば空で開始）"""
+        raw = load_versioned_json(self.path, CACHE_VERSION, "LLM response cache")
+        self._entries = raw.get("entries", {}) if raw else {}
+        if raw:
+            print(f"[INFO] Loaded LLM response cache with {len(self._entries)} entries")
+
+    def get(self, key: str) -> Optional[Any]:
+        """期限内の応答を返す（無ければ None）"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry.get("t", 0) > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry["v"]
+
+    def set(self, key: str, value: Any):
+        """応答を保存（空の応答は保存しない）"""
+        if not self.enabled or not value:
+            return
+        with self._lock:
+            self._entries[key] = {"v": value, "t": time.time()}
+            self._dirty = True
+
+    def delete(self, key: str):
+        """応答を削除（使えない応答を次回以降に返さないため）"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """期限切れと件数上限超過分（作成が古い順）を削除"""
+        now = now or time.time()
+        with self._lock:
+            expired = [k for k, e in self._entries.items() if now - e.get("t", 0) > self.ttl_seconds]
+            for key in expired:
+                del self._entries[key]
+            overflow = len(self._entries) - self.max_entries
+            if overflow > 0:
+                oldest = sorted(self._entries.items(), key=lambda kv: kv[1].get("t", 0))[:overflow]
+                for key, _ in oldest:
+                    del self._entries[key]
+            removed = len(expired) + max(overflow, 0)
+            if removed:
+                self._dirty = True
+        return removed
+
+    def save(self):
+        """変更があればアトミックに書き出す"""
+        if not self.enabled:
+            return
+        self.evict()
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                atomic_write_json(self.path, {"version": CACHE_VERSION, "entries": self._entries})
+                self._dirty = False
+                print(f"[INFO] Saved LLM response cache ({len(self._entries)} entries)")
+            except Exception as e:
+                print(f"[WARN] Failed to save LLM response cache: {e}")
+
+    def stats_line(self) -> str:
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"LLM cache: {self.hits} hits / {self.misses} misses ({rate:.0f}%), {self.hits} Gemini calls saved"
+
+
+# プロセス内で共有するキャッシュ（終了時に保存して集計を表示）
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _save_at_exit():
+    if _cache is not None and _cache.enabled:
+        if _cache.hits or _cache.misses:
+            print(f"[INFO] {_cache.stats_line()}")
+        _cache.save()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """シングルトンのキャッシュを取得"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            enabled = os.getenv("LLM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+            _cache = LLMResponseCache(enabled=enabled)
+            atexit.register(_save_at_exit)
+        return _cache
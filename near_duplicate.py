@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MinHash + LSH による近似重複検出（X / Bluesky / RSS の重複除去で共通利用）
+- 特徴量: 英単語（3文字以上、日本語に隣接していても可）と、日本語（ひらがな・カタカナ・漢字）の連続部分の文字 2-gram
+  （分かち書きなしでも日英混在テキストの類似度を測れる）
+- 128 個のハッシュ関数で MinHash 署名を作り、32 バンド × 4 行の LSH バケットに登録
+- 問い合わせは同じバケットに入った候補だけを正確な Jaccard 係数で確認するため、
+  投稿数が増えても全件との総当たり比較にならない（しきい値 0.7 の組はほぼ確実に候補になる）
+
+使い方:
+    index = NearDuplicateIndex(threshold=0.7)
+    duplicate_of = index.add_if_new(post_id, text)   # 類似が無ければ登録して None
+"""
+import hashlib
+import random
+import re
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+DEFAULT_THRESHOLD = 0.7
+NUM_PERM = 128
+BANDS = 32
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# 実行ごとに署名が変わらないよう固定シードで係数を作る
+_rng = random.Random(20250818)
+_PERMUTATIONS: Tuple[Tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)
+)
+
+# 日本語に隣接した英単語（"OpenAIが"）も拾うため \b ではなく英字の前後で区切る
+_ENGLISH_WORD_RE = re.compile(r'(?<![a-zA-Z])[a-zA-Z]{3,}(?![a-zA-Z])')
+_JAPANESE_RUN_RE = re.compile(r'[ぁ-ゟァ-ヿ一-龯]{2,}')
+
+
+def extract_features(text: str) -> FrozenSet[str]:
+    """類似度計算に使う特徴量（英単語 + 日本語文字 2-gram）"""
+    if not text:
+        return frozenset()
+    features = set(_ENGLISH_WORD_RE.findall(text.lower()))
+    for run in _JAPANESE_RUN_RE.findall(text):
+        features.update(run[i:i + 2] for i in range(len(run) - 1))
+    return frozenset(features)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def minhash_signature(features: Iterable[str]) -> Tuple[int, ...]:
+    """特徴量集合の MinHash 署名（NUM_PERM 個の最小ハッシュ値）"""
+    hashes = [_feature_hash(f) for f in features]
+    if not hashes:
+        return ()
+    return tuple(
+        min([((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes])
+        for a, b in _PERMUTATIONS
+    )
+
+
+class NearDuplicateIndex:
+    """MinHash 署名を LSH バンドで索引し、しきい値を超える類似テキストを探す"""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, bands: int = BANDS, min_features: int = 1):
+        """min_features: 特徴量がこれより少ない短文は類似判定しない（偶然の一致を避ける）"""
+        if NUM_PERM % bands:
+            raise ValueError(f"bands must divide {NUM_PERM}")
+        self.threshold = threshold
+        self.min_features = max(1, min_features)
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [{} for _ in range(bands)]
+        self._features: Dict[Hashable, FrozenSet[str]] = {}
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._features
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def _signature(self, features: FrozenSet[str]) -> Tuple[int, ...]:
+        # 短すぎるテキストは署名を作らない（= どれとも類似しない）
+        return minhash_signature(features) if len(features) >= self.min_features else ()
+
+    def _insert(self, key: Hashable, features: FrozenSet[str], signature: Tuple[int, ...]):
+        self._features[key] = features
+        if not signature:
+            return
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def _matches(self, features: FrozenSet[str], signature: Tuple[int, ...]) -> List[Tuple[Hashable, float]]:
+        # いずれかのバンドが一致した候補だけを正確な Jaccard 係数で確認する
+        if not signature:
+            return []
+        candidates = {}
+        for band, band_key in self._band_keys(signature):
+            for key in self._buckets[band].get(band_key, ()):
+                candidates.setdefault(key, None)
+        matches = []
+        for key in candidates:
+            self.comparisons += 1
+            similarity = jaccard(features, self._features[key])
+            if similarity > self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda kv: kv[1], reverse=True)
+        return matches
+
+    def add(self, key: Hashable, text: str = "", features: Optional[FrozenSet[str]] = None):
+        """テキスト（または計算済みの特徴量）を key で登録する"""
+        features = extract_features(text) if features is None else features
+        self._insert(key, features, self._signature(features))
+
+    def query(self, text: str = "", features: Optional[FrozenSet[str]] = None) -> List[Tuple[Hashable, float]]:
+        """類似度がしきい値を超える登録済み (key, Jaccard 係数) を類似度の高い順に返す"""
+        features = extract_features(text) if features is None else features
+        return self._matches(features, self._signature(features))
+
+    def find(self, text: str = "", features: Optional[FrozenSet[str]] = None) -> Optional[Hashable]:
+        """最も類似した登録済み key（しきい値以下なら None）"""
+        matches = self.query(text, features)
+        return matches[0][0] if matches else None
+
+    def query_then_add(self, key: Hashable, text: str = "",
+                       features: Optional[FrozenSet[str]] = None) -> List[Tuple[Hashable, float]]:
+        """
+        類似する登録済み (key, Jaccard 係数) を返してから key で登録する（署名の計算は 1 回）
+        """
+        features = extract_features(text) if features is None else features
+        signature = self._signature(features)
+        matches = self._matches(features, signature)
+        self._insert(key, features, signature)
+        return matches
+
+    def add_if_new(self, key: Hashable, text: str = "",
+                   features: Optional[FrozenSet[str]] = None) -> Optional[Hashable]:
+        """
+        類似する登録済みテキストが無ければ key で登録して None を返す（署名の計算は 1 回）
+        あれば登録せずに最も類似した key を返す
+        """
+        features = extract_features(text) if features is None else features
+        signature = self._signature(features)
+        matches = self._matches(features, signature)
+        if matches:
+            return matches[0][0]
+        self._insert(key, features, signature)
+        return None
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ニュース 1 件分のレコード（スコア・鮮度・言語・重複判定キーを取り込み時に 1 回だけ計算して保持）
+- __slots__ 付き dataclass なので、キーごとに dict を持つより 1 件あたりのメモリが小さい
+- 既存コード・ダッシュボード生成スクリプトとの互換のため、dict と同じ get / [] / in で
+  "title" "link" "_summary" "_source" "_dt" "_importance_score" などのキーを読み書きできる
+- それ以外のキー（"_full_text" "_priority" など）は extra に入る
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+# dict 形式のキー -> 属性名
+FIELD_KEYS = {
+    "title": "title",
+    "link": "link",
+    "_summary": "summary",
+    "_source": "source",
+    "_dt": "dt",
+    "_importance_score": "importance_score",
+    "_freshness_bucket": "freshness_bucket",
+    "_freshness_score": "freshness_score",
+    "_lang": "lang_code",
+    "_source_category": "source_category",
+}
+
+_MISSING = object()
+
+
+def title_key(title: str) -> str:
+    """タイトルの重複判定キー（小文字化・前後空白除去）"""
+    return (title or "").lower().strip()
+
+
+def link_key(link: str) -> str:
+    """リンクの重複判定キー（前後空白除去）"""
+    return (link or "").strip()
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """取り込み済みのニュース（スコア類は build.to_news_item で計算済み）"""
+    title: str
+    link: str
+    summary: str = ""
+    source: str = ""
+    dt: Optional[datetime] = None
+    importance_score: Optional[float] = None
+    freshness_bucket: str = "all"
+    freshness_score: float = 50.0
+    lang_code: str = "und"
+    source_category: str = ""
+    title_key: str = ""
+    link_key: str = ""
+    extra: Optional[Dict[str, Any]] = None
+
+    def __post_init__(self):
+        self.title_key = title_key(self.title)
+        self.link_key = link_key(self.link)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NewsItem":
+        """dict 形式のアイテムから作成（未知のキーは extra に保持）"""
+        item = cls(title=data.get("title") or "", link=data.get("link") or "")
+        for key, value in data.items():
+            if key not in ("title", "link"):
+                item[key] = value
+        return item
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    # ---- dict 互換 API ----
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = FIELD_KEYS.get(key)
+        if attr is not None:
+            # None は「未設定」扱い（dict でキーが無い場合と同じく default を返す）
+            value = getattr(self, attr)
+            return default if value is None else value
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        attr = FIELD_KEYS.get(key)
+        if attr is None:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+            return
+        setattr(self, attr, value)
+        if attr == "title":
+            self.title_key = title_key(value)
+        elif attr == "link":
+            self.link_key = link_key(value)
+
+    def __contains__(self, key: str) -> bool:
+        if key in FIELD_KEYS:
+            return getattr(self, FIELD_KEYS[key]) is not None
+        return self.extra is not None and key in self.extra
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def keys(self) -> Iterator[str]:
+        yield from (key for key in FIELD_KEYS if key in self)
+        if self.extra:
+            yield from self.extra
+
+    def items(self) -> Iterator:
+        for key in self.keys():
+            yield key, self[key]
+
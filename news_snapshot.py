@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+収集結果のスナップショット（_cache/news_snapshot.jsonl.gz）
+- build.collect_items が取得・スコア計算した Business / Tools / Posts と X 投稿を
+  gzip 圧縮した JSON Lines で保存する（1 行目はバージョン・作成時刻・収集条件のヘッダー）
+- 保存するのはカテゴリをまたぐ重複除去・ストーリーのクラスタリング前のアイテム
+  （クラスタリングは読み込む側で行う）
+- generate_comprehensive_dashboard・build_enhanced_ranking は
+  新しいスナップショットがあればフィードや CSV を取り直さずにそこから描画する
+- 収集条件（HOURS_LOOKBACK・feeds.yml の内容）が違う、古い、壊れている場合は使わない
+
+Env (optional):
+  NEWS_SNAPSHOT_MAX_AGE_MINUTES=60  # これより古いスナップショットは使わない
+"""
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from news_item import NewsItem
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = Path("_cache") / "news_snapshot.jsonl.gz"
+DEFAULT_MAX_AGE_MINUTES = 60
+CATEGORIES = ("Business", "Tools", "Posts")
+
+
+def feeds_digest(path: Path = Path("feeds.yml")) -> str:
+    """feeds.yml の内容のダイジェスト（フィード構成が変わったスナップショットを使わないため）"""
+    try:
+        return hashlib.sha1(Path(path).read_bytes()).hexdigest()[:16]
+    except OSError:
+        return ""
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return str(value)
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+
+@dataclass
+class NewsSnapshot:
+    """読み込んだスナップショット（sections はセクション名 -> NewsItem のリスト）"""
+    created_at: datetime
+    meta: Dict[str, Any] = field(default_factory=dict)
+    sections: Dict[str, List[NewsItem]] = field(default_factory=dict)
+
+    @property
+    def age_minutes(self) -> float:
+        return (datetime.now(timezone.utc) - self.created_at).total_seconds() / 60
+
+
+def write_snapshot(sections: Dict[str, Iterable], meta: Optional[Dict[str, Any]] = None,
+                   path: Path = DEFAULT_SNAPSHOT_PATH) -> Path:
+    """セクションごとのアイテム（NewsItem または dict）を一時ファイル経由でアトミックに書き出す"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sections = {name: list(items) for name, items in sections.items()}
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "meta": meta or {},
+        "counts": {name: len(items) for name, items in sections.items()},
+    }
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for name, items in sections.items():
+            for item in items:
+                record = {"section": name, "item": dict(item.items())}
+                f.write(json.dumps(record, ensure_ascii=False, default=_encode) + "\n")
+    os.replace(tmp_path, path)
+    print(f"[INFO] Saved news snapshot ({sum(header['counts'].values())} items) to {path}")
+    return path
+
+
+def load_snapshot(path: Path = DEFAULT_SNAPSHOT_PATH, max_age_minutes: Optional[float] = None,
+                  require: Iterable[str] = CATEGORIES, **expected_meta) -> Optional[NewsSnapshot]:
+    """
+    スナップショットを読み込む。無い・壊れている・古い・require のセクションが無い・
+    meta が expected_meta（hours_lookback=24, feeds=feeds_digest() など）と違う場合は None
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    if max_age_minutes is None:
+        max_age_minutes = float(os.getenv("NEWS_SNAPSHOT_MAX_AGE_MINUTES", DEFAULT_MAX_AGE_MINUTES))
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != SNAPSHOT_VERSION:
+                print("[INFO] News snapshot version mismatch, ignoring")
+                return None
+            snapshot = NewsSnapshot(created_at=datetime.fromisoformat(header["created_at"]),
+                                    meta=header.get("meta", {}),
+                                    sections={name: [] for name in header.get("counts", {})})
+            if snapshot.age_minutes > max_age_minutes:
+                print(f"[INFO] News snapshot is {snapshot.age_minutes:.0f} minutes old, ignoring")
+                return None
+            for key, value in expected_meta.items():
+                if snapshot.meta.get(key) != value:
+                    print(f"[INFO] News snapshot was collected with {key}={snapshot.meta.get(key)!r}, ignoring")
+                    return None
+            missing = [name for name in require if name not in snapshot.sections]
+            if missing:
+                print(f"[INFO] News snapshot has no {', '.join(missing)} section, ignoring")
+                return None
+            for line in f:
+                record = json.loads(line, object_hook=_decode)
+                snapshot.sections.setdefault(record["section"], []).append(NewsItem.from_dict(record["item"]))
+    except (OSError, EOFError, json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError) as e:
+        print(f"[WARN] News snapshot corrupted: {e}")
+        return None
+    print(f"[INFO] Loaded news snapshot from {snapshot.created_at.isoformat()} "
+          f"({sum(len(items) for items in snapshot.sections.values())} items)")
+    return snapshot
@@ -3,37 +3,59 @@
 """
 BeautifulSoup ウェブスクレイパー
 高速で軽量なHTML解析によるコンテンツ抽出
+- scrape_multiple / iter_scrape は複数URLを並行取得する（同じドメインへのリクエストだけ delay 秒あける）
+- lxml があれば lxml パーサーで解析する
 """
 
 import requests
 from bs4 import BeautifulSoup
+import threading
 import time
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, List, Optional
+from urllib.parse import urlparse
 import re
 
+import http_client
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+RAW_HTML_PREVIEW_CHARS = 2000
+DEFAULT_MAX_WORKERS = 4
+
 class BeautifulSoupScraper:
     """BeautifulSoupベースのウェブスクレイパー"""
     
-    def __init__(self, timeout: int = 10, delay: float = 1.0):
+    def __init__(self, timeout: int = 10, delay: float = 1.0, max_workers: int = DEFAULT_MAX_WORKERS):
         """
         初期化
         
         Args:
             timeout: リクエストタイムアウト (秒)
-            delay: リクエスト間隔 (秒)
+            delay: 同じドメインへのリクエスト間隔 (秒)
+            max_workers: 一括スクレイピングの同時実行数
         """
         self.timeout = timeout
         self.delay = delay
-        self.session = requests.Session()
+        self.max_workers = max_workers
+        # ドメイン -> 次のリクエストを送ってよい時刻（time.monotonic）
+        self._next_slot: Dict[str, float] = {}
+        self._slot_lock = threading.Lock()
+        # 接続はプロセス共有の HTTP クライアントのプールを再利用する
+        self.session = http_client.get_session()
         
-        # ヘッダー設定
-        self.session.headers.update({
+        # ヘッダー設定（共有セッションを書き換えないようリクエストごとに渡す）
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'ja,en-US;q=0.7,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': http_client.ACCEPT_ENCODING,
             'Connection': 'keep-alive',
-        })
+        }
     
     def scrape(self, url: str) -> Dict[str, Any]:
         """
@@ -48,12 +70,15 @@ class BeautifulSoupScraper:
         print(f"🔍 スクレイピング開始: {url}")
         
         try:
+            # 同じドメインへの前回リクエストから delay 秒たつまで待つ
+            self._wait_for_slot(url)
+            
             # HTTP リクエスト
-            response = self.session.get(url, timeout=self.timeout)
+            response = self.session.get(url, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
             
             # HTML 解析
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             
             # コンテンツ抽出
             result = {
@@ -65,14 +90,11 @@ class BeautifulSoupScraper:
                 'links': self._extract_links(soup, url),
                 'images': self._extract_images(soup, url),
                 'meta': self._extract_meta(soup),
-                'raw_html': str(soup)[:2000] + '...' if len(str(soup)) > 2000 else str(soup)
+                'raw_html': self._preview_html(response.content, soup.original_encoding or response.encoding)
             }
             
             print(f"✅ スクレイピング完了: {len(result['content'])}文字")
             
-            # 遅延
-            time.sleep(self.delay)
-            
             return result
             
         except requests.exceptions.RequestException as e:
@@ -93,6 +115,25 @@ class BeautifulSoupScraper:
                 'error_type': 'parsing_error'
             }
     
+    def _wait_for_slot(self, url: str):
+        """ドメインごとの送信時刻を予約し、その時刻まで待つ（別ドメインは待たない）"""
+        domain = urlparse(url).netloc.lower()
+        with self._slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+    
+    @staticmethod
+    def _preview_html(content: bytes, encoding: Optional[str]) -> str:
+        """取得した HTML の先頭 2,000 文字（DOM 全体を文字列化しない）"""
+        # 1 文字は最大 4 バイトなので、先頭 4 倍のバイト数をデコードすれば足りる
+        head = content[:RAW_HTML_PREVIEW_CHARS * 4 + 4].decode(encoding or 'utf-8', errors='ignore')
+        if len(head) > RAW_HTML_PREVIEW_CHARS:
+            return head[:RAW_HTML_PREVIEW_CHARS] + '...'
+        return head
+    
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """タイトル抽出"""
         # <title>タグ
@@ -204,23 +245,38 @@ class BeautifulSoupScraper:
         
         return meta
     
-    def scrape_multiple(self, urls: List[str]) -> List[Dict[str, Any]]:
-        """複数URL一括スクレイピング"""
-        results = []
+    def iter_scrape(self, urls: List[str], max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        複数URLを並行にスクレイピングし、完了した順に結果を返す
         
+        Args:
+            urls: 対象URL
+            max_workers: 同時実行数（省略時は self.max_workers）
+        """
+        if not urls:
+            return
+        workers = max(1, min(max_workers or self.max_workers, len(urls)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self.scrape, url) for url in urls]
+            for i, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                print(f"進行状況: {i}/{len(urls)}")
+                yield result
+    
+    def scrape_multiple(self, urls: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """複数URL一括スクレイピング（結果は urls の順）"""
         print(f"🔍 一括スクレイピング開始: {len(urls)}件")
         
-        for i, url in enumerate(urls, 1):
-            print(f"進行状況: {i}/{len(urls)}")
-            result = self.scrape(url)
-            results.append(result)
+        by_url = {}
+        for result in self.iter_scrape(urls, max_workers):
+            by_url.setdefault(result['url'], result)
+        results = [by_url[url] for url in urls]
         
         print(f"✅ 一括スクレイピング完了")
         return results
     
     def close(self):
-        """セッション終了"""
-        self.session.close()
+        """セッション終了（共有セッションは他のモジュールも使うため閉じない）"""
 
 # 使用例
 if __name__ == "__main__":
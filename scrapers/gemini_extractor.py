@@ -3,77 +3,37 @@
 """
 Gemini AI コンテンツ抽出器
 高性能なAI分析によるコンテンツ要約・構造化
+- batch_extract / iter_extract は複数コンテンツを並行に抽出する。RPM/TPM・同時実行数・429 の待機は
+  gemini_scheduler（プロセス共有）に任せる
+- 抽出結果は 抽出タイプ + コンテンツ のダイジェストをキーに LLM 応答キャッシュ（llm_cache）へ保存し、
+  同じコンテンツは再度 Gemini を呼ばない（JSON として解析できなかった応答は保存せず、次回は呼び直す）
 """
 
 import os
-import google.generativeai as genai
+import hashlib
 import time
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import json
 
-class GeminiExtractor:
-    """Gemini APIベースのコンテンツ抽出器"""
-    
-    def __init__(self, api_key: str = None, model: str = "gemini-2.0-flash"):
-        """
-        初期化
-        
-        Args:
-            api_key: Gemini APIキー (.envから自動取得)
-            model: 使用モデル名
-        """
-        self.api_key = api_key or os.getenv('GEMINI_API_KEY')
-        self.model_name = model
-        
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEYが設定されていません")
-        
-        # Gemini API設定
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(self.model_name)
-        
-        print(f"✅ Gemini AI初期化完了: {self.model_name}")
-    
-    def extract(self, content: str, extraction_type: str = "summary") -> Dict[str, Any]:
-        """
-        コンテンツからの情報抽出
-        
-        Args:
-            content: 抽出対象コンテンツ
-            extraction_type: 抽出タイプ (summary, keywords, structure, analysis)
-            
-        Returns:
-            抽出結果辞書
-        """
-        print(f"🤖 Gemini抽出開始: {extraction_type}")
-        
-        try:
-            if extraction_type == "summary":
-                return self._extract_summary(content)
-            elif extraction_type == "keywords":
-                return self._extract_keywords(content)
-            elif extraction_type == "structure":
-                return self._extract_structure(content)
-            elif extraction_type == "analysis":
-                return self._extract_analysis(content)
-            else:
-                return self._extract_custom(content, extraction_type)
-                
-        except Exception as e:
-            print(f"❌ Gemini抽出エラー: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'extraction_type': extraction_type
-            }
-    
-    def _extract_summary(self, content: str) -> Dict[str, Any]:
-        """要約抽出"""
-        prompt = f"""
+from gemini_scheduler import get_scheduler, estimate_tokens, parse_retry_after
+from llm_cache import get_llm_cache, make_key
+
+# 抽出結果キャッシュのキーに含める版数（テンプレートや結果の形を変えたら上げる）
+RESULT_CACHE_VERSION = 1
+# 429（クォータ超過）を受けたときの再試行回数
+MAX_RATE_LIMIT_RETRIES = 2
+# 想定する出力トークン数（TPM の見積もり用）
+EXPECTED_OUTPUT_TOKENS = 1024
+
+# 抽出タイプ -> (プロンプトに含める本文の最大文字数, プロンプトテンプレート)
+# テンプレートは str.format で本文を埋め込む（JSON の波括弧は {{ }} でエスケープ済み）
+PROMPT_TEMPLATES = {
+    "summary": (3000, """
 以下のWebコンテンツを分析し、JSON形式で要約してください：
 
 【分析対象】
-{content[:3000]}
+{content}
 
 【出力形式】
 {{
@@ -86,32 +46,12 @@ class GeminiExtractor:
 }}
 
 日本語で回答してください。
-"""
-        
-        result = self._call_gemini(prompt)
-        
-        try:
-            # JSON解析を試行
-            json_result = json.loads(result)
-            json_result['success'] = True
-            json_result['extraction_type'] = 'summary'
-            return json_result
-        except json.JSONDecodeError:
-            # JSON解析失敗時はテキストとして返す
-            return {
-                'success': True,
-                'extraction_type': 'summary',
-                'raw_response': result,
-                'summary': result[:500]
-            }
-    
-    def _extract_keywords(self, content: str) -> Dict[str, Any]:
-        """キーワード抽出"""
-        prompt = f"""
+"""),
+    "keywords": (2000, """
 以下のコンテンツから重要なキーワードを抽出してJSON形式で出力してください：
 
 【コンテンツ】
-{content[:2000]}
+{content}
 
 【出力形式】
 {{
@@ -121,29 +61,12 @@ class GeminiExtractor:
     "topics": ["主要トピック1", "主要トピック2"],
     "relevance_score": 0.8
 }}
-"""
-        
-        result = self._call_gemini(prompt)
-        
-        try:
-            json_result = json.loads(result)
-            json_result['success'] = True
-            json_result['extraction_type'] = 'keywords'
-            return json_result
-        except json.JSONDecodeError:
-            return {
-                'success': True,
-                'extraction_type': 'keywords',
-                'raw_response': result
-            }
-    
-    def _extract_structure(self, content: str) -> Dict[str, Any]:
-        """構造化データ抽出"""
-        prompt = f"""
+"""),
+    "structure": (2000, """
 以下のコンテンツの構造を分析し、JSON形式で出力してください：
 
 【コンテンツ】
-{content[:2000]}
+{content}
 
 【出力形式】
 {{
@@ -159,29 +82,12 @@ class GeminiExtractor:
     }},
     "readability": "易しい/普通/難しい"
 }}
-"""
-        
-        result = self._call_gemini(prompt)
-        
-        try:
-            json_result = json.loads(result)
-            json_result['success'] = True
-            json_result['extraction_type'] = 'structure'
-            return json_result
-        except json.JSONDecodeError:
-            return {
-                'success': True,
-                'extraction_type': 'structure',
-                'raw_response': result
-            }
-    
-    def _extract_analysis(self, content: str) -> Dict[str, Any]:
-        """詳細分析"""
-        prompt = f"""
+"""),
+    "analysis": (2500, """
 以下のコンテンツを詳細に分析し、ビジネス価値の観点からJSON形式で評価してください：
 
 【コンテンツ】
-{content[:2500]}
+{content}
 
 【出力形式】
 {{
@@ -201,30 +107,127 @@ class GeminiExtractor:
 }}
 
 日本語で分析してください。
+"""),
+}
+
+CUSTOM_PROMPT_TEMPLATE = """
+{custom_prompt}
+
+【対象コンテンツ】
+{content}
 """
+CUSTOM_CONTENT_LIMIT = 2000
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """google.generativeai の ResourceExhausted（HTTP 429）か"""
+    return type(error).__name__ == "ResourceExhausted" or "429" in str(error)
+
+
+def _content_digest(content: str) -> str:
+    return hashlib.blake2b((content or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+class GeminiExtractor:
+    """Gemini APIベースのコンテンツ抽出器"""
+    
+    def __init__(self, api_key: str = None, model: str = "gemini-2.0-flash", max_workers: Optional[int] = None):
+        """
+        初期化
+        
+        Args:
+            api_key: Gemini APIキー (.envから自動取得)
+            model: 使用モデル名
+            max_workers: バッチ処理の同時実行数（省略時はスケジューラの同時実行数）
+        """
+        self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        self.model_name = model
+        
+        if not self.api_key:
+            raise ValueError("GEMINI_API_KEYが設定されていません")
+        
+        # Gemini API設定（SDK は使うときに読み込む）
+        import google.generativeai as genai
+        genai.configure(api_key=self.api_key)
+        self.model = genai.GenerativeModel(self.model_name)
+        self.response_cache = get_llm_cache()
+        # RPM/TPM・同時実行数・429 をプロセス全体で管理するスケジューラ
+        self.scheduler = get_scheduler()
+        self.max_workers = max_workers or self.scheduler.max_concurrency
+        
+        print(f"✅ Gemini AI初期化完了: {self.model_name}")
+    
+    def extract(self, content: str, extraction_type: str = "summary") -> Dict[str, Any]:
+        """
+        コンテンツからの情報抽出
         
+        Args:
+            content: 抽出対象コンテンツ
+            extraction_type: 抽出タイプ (summary, keywords, structure, analysis)
+            
+        Returns:
+            抽出結果辞書
+        """
+        # 同じ抽出タイプ・コンテンツの成功結果はキャッシュから返す
+        cache_key = self._result_key(content, extraction_type)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
+        print(f"🤖 Gemini抽出開始: {extraction_type}")
+        
+        try:
+            if extraction_type in PROMPT_TEMPLATES:
+                result = self._extract_typed(content, extraction_type)
+            else:
+                result = self._extract_custom(content, extraction_type)
+                
+        except Exception as e:
+            print(f"❌ Gemini抽出エラー: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'extraction_type': extraction_type
+            }
+        
+        # 解析できなかった応答（raw_response のみ）は保存しない
+        if 'raw_response' not in result:
+            self.response_cache.set(cache_key, result)
+        return dict(result)
+    
+    def _result_key(self, content: str, extraction_type: str) -> str:
+        """抽出結果キャッシュのキー（モデル・抽出タイプ・コンテンツのダイジェスト）"""
+        return make_key(self.model_name, _content_digest(content),
+                        config={"extraction_type": extraction_type, "version": RESULT_CACHE_VERSION})
+    
+    def _extract_typed(self, content: str, extraction_type: str) -> Dict[str, Any]:
+        """summary / keywords / structure / analysis 抽出（JSON で返させる）"""
+        limit, template = PROMPT_TEMPLATES[extraction_type]
+        prompt = template.format(content=content[:limit])
         result = self._call_gemini(prompt)
         
         try:
+            # JSON解析を試行
             json_result = json.loads(result)
             json_result['success'] = True
-            json_result['extraction_type'] = 'analysis'
+            json_result['extraction_type'] = extraction_type
             return json_result
         except json.JSONDecodeError:
-            return {
+            # JSON解析失敗時はテキストとして返す（プロンプト単位のキャッシュからも消し、次回は呼び直す）
+            self.response_cache.delete(make_key(self.model_name, prompt))
+            fallback = {
                 'success': True,
-                'extraction_type': 'analysis',
+                'extraction_type': extraction_type,
                 'raw_response': result
             }
+            if extraction_type == 'summary':
+                fallback['summary'] = result[:500]
+            return fallback
     
     def _extract_custom(self, content: str, custom_prompt: str) -> Dict[str, Any]:
         """カスタム抽出"""
-        prompt = f"""
-{custom_prompt}
-
-【対象コンテンツ】
-{content[:2000]}
-"""
+        prompt = CUSTOM_PROMPT_TEMPLATE.format(custom_prompt=custom_prompt,
+                                               content=content[:CUSTOM_CONTENT_LIMIT])
         
         result = self._call_gemini(prompt)
         
@@ -236,12 +239,23 @@ class GeminiExtractor:
         }
     
     def _call_gemini(self, prompt: str) -> str:
-        """Gemini API呼び出し"""
-        try:
-            response = self.model.generate_content(prompt)
+        """Gemini API呼び出し（同じプロンプトはキャッシュから返す。429 はスケジューラで待って再試行）"""
+        cache_key = make_key(self.model_name, prompt)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.scheduler.acquire(estimate_tokens(prompt, EXPECTED_OUTPUT_TOKENS))
+            try:
+                response = self.model.generate_content(prompt)
+            except Exception as e:
+                if _is_rate_limited(e) and attempt < MAX_RATE_LIMIT_RETRIES:
+                    self.scheduler.report_rate_limited(parse_retry_after(body=str(e)))
+                    continue
+                raise Exception(f"Gemini API呼び出しエラー: {e}")
+            self.scheduler.report_success()
+            self.response_cache.set(cache_key, response.text)
             return response.text
-        except Exception as e:
-            raise Exception(f"Gemini API呼び出しエラー: {e}")
     
     def summarize(self, content: str, length: str = "medium") -> str:
         """簡易要約（レガシーメソッド）"""
@@ -266,21 +280,52 @@ class GeminiExtractor:
         except Exception as e:
             return f"要約エラー: {e}"
     
-    def batch_extract(self, contents: List[str], extraction_type: str = "summary") -> List[Dict[str, Any]]:
-        """バッチ処理"""
-        results = []
+    def iter_extract(self, contents: List[str], extraction_type: str = "summary",
+                     max_workers: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        複数コンテンツを並行に抽出し、完了した順に (入力の位置, 抽出結果) を返す
+        
+        同じ内容のコンテンツは 1 回だけ抽出する。リクエストの間隔は固定の待機ではなく
+        スケジューラの RPM/TPM に合わせ、同時実行数はスケジューラの枠（GEMINI_MAX_CONCURRENCY）で抑える
+        """
+        positions: Dict[str, List[int]] = {}
+        for i, content in enumerate(contents):
+            positions.setdefault(content, []).append(i)
+        if not positions:
+            return
+        workers = max(1, min(max_workers or self.max_workers, len(positions)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self.scheduler.run, self.extract, content, extraction_type): content
+                       for content in positions}
+            for future in as_completed(futures):
+                result = future.result()
+                for i in positions[futures[future]]:
+                    yield i, dict(result)
+    
+    def batch_extract(self, contents: List[str], extraction_type: str = "summary",
+                      max_workers: Optional[int] = None,
+                      on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        バッチ処理（結果は contents の順）
+        
+        Args:
+            contents: 抽出対象コンテンツ
+            extraction_type: 抽出タイプ
+            max_workers: 同時実行数（省略時は self.max_workers）
+            on_result: 結果が届くたびに (入力の位置, 抽出結果) で呼ばれるコールバック
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(contents)
         
         print(f"🤖 Geminiバッチ処理開始: {len(contents)}件")
+        started = time.monotonic()
         
-        for i, content in enumerate(contents, 1):
-            print(f"進行状況: {i}/{len(contents)}")
-            result = self.extract(content, extraction_type)
-            results.append(result)
-            
-            # API レート制限対応
-            time.sleep(1)
+        for done, (i, result) in enumerate(self.iter_extract(contents, extraction_type, max_workers), 1):
+            print(f"進行状況: {done}/{len(contents)}")
+            results[i] = result
+            if on_result:
+                on_result(i, result)
         
-        print(f"✅ Geminiバッチ処理完了")
+        print(f"✅ Geminiバッチ処理完了 ({time.monotonic() - started:.1f}秒)")
         return results
 
 # 使用例
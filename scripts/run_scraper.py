@@ -41,7 +41,8 @@ def main():
     
     parser.add_argument(
         'url',
-        help='スクレイピング対象URL'
+        nargs='+',
+        help='スクレイピング対象URL（複数指定すると並行に取得）'
     )
     
     parser.add_argument(
@@ -70,90 +71,104 @@ def main():
     )
     
     args = parser.parse_args()
+    urls = args.url
     
     print("🚀 Free Scraping Platform 開始")
-    print(f"🎯 対象URL: {args.url}")
+    print(f"🎯 対象URL: {', '.join(urls)}")
     print(f"📊 方法: {args.method}")
     
-    results = {}
+    # URL -> 結果（URL が 1 件なら従来どおりその結果だけを出力する）
+    all_results = {url: {} for url in urls}
     
     try:
-        # Basic スクレイピング
-        if args.method in ['basic', 'full']:
-            print("\n🔍 基本スクレイピング実行中...")
-            scraper = BeautifulSoupScraper()
-            basic_result = scraper.scrape(args.url)
-            results['basic'] = basic_result
-            
-            if args.verbose:
-                print(f"   タイトル: {basic_result.get('title', 'N/A')}")
-                print(f"   コンテンツ長: {len(basic_result.get('content', ''))}文字")
-                print(f"   リンク数: {len(basic_result.get('links', []))}")
+        # 基本スクレイピング（AI抽出のみでも本文取得に使う。複数URLは並行に取得）
+        print("\n🔍 基本スクレイピング実行中...")
+        scraper = BeautifulSoupScraper()
+        basic_results = {result['url']: result for result in scraper.iter_scrape(urls)}
+        scraper.close()
+        
+        for url in urls:
+            basic_result = basic_results[url]
             
-            scraper.close()
+            if args.method in ['basic', 'full']:
+                all_results[url]['basic'] = basic_result
+                
+                if args.verbose:
+                    if len(urls) > 1:
+                        print(f"\n🌐 {url}")
+                    print(f"   タイトル: {basic_result.get('title', 'N/A')}")
+                    print(f"   コンテンツ長: {len(basic_result.get('content', ''))}文字")
+                    print(f"   リンク数: {len(basic_result.get('links', []))}")
         
-        # AI 抽出
+        # AI 抽出（複数URLは並行に実行し、届いた結果から表示）
         if args.method in ['ai', 'full']:
             print(f"\n🤖 AI抽出実行中 ({args.ai_extraction})...")
             
-            # コンテンツを取得（basicから、または新規取得）
-            if 'basic' in results and results['basic']['success']:
-                content = results['basic']['content']
-            else:
-                # AI抽出のみの場合は基本スクレイピングを実行
-                scraper = BeautifulSoupScraper()
-                basic_result = scraper.scrape(args.url)
-                content = basic_result.get('content', '')
-                scraper.close()
-                
-                if not content:
-                    print("❌ コンテンツ取得失敗")
-                    return
+            ai_urls = [url for url in urls if basic_results[url].get('content')]
+            for url in urls:
+                if url not in ai_urls:
+                    print(f"❌ コンテンツ取得失敗: {url}")
             
-            # Gemini抽出実行
-            try:
-                extractor = GeminiExtractor()
-                ai_result = extractor.extract(content, args.ai_extraction)
-                results['ai'] = ai_result
+            def on_ai_result(i, ai_result):
+                all_results[ai_urls[i]]['ai'] = ai_result
                 
                 if args.verbose and ai_result.get('success'):
+                    if len(urls) > 1:
+                        print(f"\n🌐 {ai_urls[i]}")
                     print(f"   抽出タイプ: {ai_result.get('extraction_type')}")
                     if 'summary' in ai_result:
                         print(f"   要約: {ai_result['summary'][:100]}...")
+            
+            # Gemini抽出実行
+            try:
+                if ai_urls:
+                    extractor = GeminiExtractor()
+                    extractor.batch_extract([basic_results[url]['content'] for url in ai_urls],
+                                            args.ai_extraction, on_result=on_ai_result)
                     
             except Exception as e:
                 print(f"❌ AI抽出エラー: {e}")
-                results['ai'] = {
-                    'success': False,
-                    'error': str(e)
-                }
+                for url in ai_urls:
+                    all_results[url].setdefault('ai', {
+                        'success': False,
+                        'error': str(e)
+                    })
+            
+            if len(urls) == 1 and not ai_urls:
+                return
         
         # 結果表示
         print("\n📋 実行結果:")
         
-        if 'basic' in results:
-            status = "✅ 成功" if results['basic']['success'] else "❌ 失敗"
-            print(f"   基本スクレイピング: {status}")
-        
-        if 'ai' in results:
-            status = "✅ 成功" if results['ai']['success'] else "❌ 失敗"
-            print(f"   AI抽出: {status}")
+        for url, results in all_results.items():
+            if len(urls) > 1:
+                print(f"   {url}")
+            
+            if 'basic' in results:
+                status = "✅ 成功" if results['basic']['success'] else "❌ 失敗"
+                print(f"   基本スクレイピング: {status}")
+            
+            if 'ai' in results:
+                status = "✅ 成功" if results['ai']['success'] else "❌ 失敗"
+                print(f"   AI抽出: {status}")
         
         # ファイル出力
         if args.output:
+            output = all_results[urls[0]] if len(urls) == 1 else all_results
             with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
+                json.dump(output, f, ensure_ascii=False, indent=2)
             print(f"💾 結果を保存: {args.output}")
         
         # 簡易表示
         if not args.output and not args.verbose:
-            if 'basic' in results and results['basic']['success']:
-                print(f"\n📄 タイトル: {results['basic']['title']}")
-                print(f"📝 要約: {results['basic']['content'][:200]}...")
-            
-            if 'ai' in results and results['ai']['success']:
-                if 'summary' in results['ai']:
-                    print(f"🤖 AI要約: {results['ai']['summary'][:200]}...")
+            for results in all_results.values():
+                if 'basic' in results and results['basic']['success']:
+                    print(f"\n📄 タイトル: {results['basic']['title']}")
+                    print(f"📝 要約: {results['basic']['content'][:200]}...")
+                
+                if 'ai' in results and results['ai']['success']:
+                    if 'summary' in results['ai']:
+                        print(f"🤖 AI要約: {results['ai']['summary'][:200]}...")
         
         print("\n✅ 処理完了")
         
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+index.html（templates/bootstrap_template.html）の検索用データ
+- カードの表示データを 1 つの JSON データアイランド（<script type="application/json">）にまとめ、
+  ページ側はそこから 1 回だけカードを描画する（カード HTML を埋め込んで複製しない）
+- カードの検索対象テキストから転置インデックス（トークン -> カード番号）をビルド時に作る
+  - 英数字: NFKC 正規化・小文字化した単語（問い合わせ語を部分に含む単語をすべて引く）
+  - 日本語（ひらがな・カタカナ・漢字）: 連続部分の文字 1-gram と 2-gram（分かち書きなしで部分一致を引く）
+- ページ側の tokenize（テンプレートの JavaScript）はここと同じ規則で問い合わせ語を分割する
+"""
+import json
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Sequence
+
+PAYLOAD_VERSION = 1
+
+# テンプレートの WORD_RE / CJK_RE と同じ文字クラス
+_WORD_RE = re.compile(r'[0-9a-z\u00c0-\u024f]+')
+_CJK_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text or "").lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """検索用トークン（英数字の単語と、日本語の連続部分の 1-gram・2-gram）"""
+    text = normalize(text)
+    tokens = _WORD_RE.findall(text)
+    for run in _CJK_RE.findall(text):
+        tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def build_search_index(texts: Sequence[str]) -> Dict[str, List[int]]:
+    """texts[i] の各トークン -> そのトークンを含むカード番号 i の昇順リスト"""
+    index: Dict[str, List[int]] = {}
+    for doc_id, text in enumerate(texts):
+        for token in dict.fromkeys(tokenize(text)):
+            index.setdefault(token, []).append(doc_id)
+    return dict(sorted(index.items()))
+
+
+def search(index: Dict[str, List[int]], query: str, size: int) -> List[int]:
+    """テンプレートの検索と同じ規則で query を含むカード番号を返す（テスト・確認用）"""
+    matched = set(range(size))
+    for token in tokenize(query):
+        if _CJK_RE.fullmatch(token):
+            hits = set(index.get(token, ()))
+        else:
+            hits = {doc_id for word, ids in index.items() if token in word for doc_id in ids}
+        matched &= hits
+    return sorted(matched)
+
+
+def build_payload(cards: Iterable[dict], search_texts: Iterable[str]) -> dict:
+    """データアイランドの中身（カードの表示データと転置インデックス）"""
+    return {"v": PAYLOAD_VERSION, "cards": list(cards), "index": build_search_index(list(search_texts))}
+
+
+def json_island(payload: dict) -> str:
+    """<script type="application/json"> にそのまま埋め込める最小の JSON"""
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    # </script> や <!-- でスクリプト要素が閉じられないようにする
+    return text.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
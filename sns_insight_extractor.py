@@ -8,15 +8,14 @@ X(Twitter)投稿データから有益な情報を抽出・分析
 import os
 import sys
 import json
-import csv
-import io
-import requests
 import re
 from datetime import datetime, timedelta
 from collections import defaultdict
 from typing import List, Dict, Any, Tuple
 import warnings
 
+from x_csv_parser import parse_x_csv
+
 # 警告無効化
 warnings.filterwarnings('ignore')
 
@@ -42,32 +41,24 @@ class SNSInsightExtractor:
         print("📱 SNS投稿データを取得中...")
         
         try:
-            response = requests.get(CSV_URL, timeout=30)
-            response.raise_for_status()
-            
-            # BOM対応のCSV解析（ヘッダーなしのCSVとして処理）
-            csv_content = response.content.decode('utf-8-sig')
-            csv_reader = csv.reader(io.StringIO(csv_content))
-            
+            # 共通のストリーミングパーサーで取得（日付パース・正規化済み）
             posts = []
-            for i, row in enumerate(csv_reader):
-                if len(row) < 4:  # 最低限のカラム数チェック
-                    continue
-                    
-                # 位置ベースでデータを抽出
+            for i, post in enumerate(parse_x_csv(CSV_URL)):
                 post_data = {
-                    'timestamp': row[0] if len(row) > 0 else '',
-                    'username': row[1] if len(row) > 1 else '',
-                    'text': row[2] if len(row) > 2 else '',
-                    'image_url': row[3] if len(row) > 3 else '',
-                    'post_url': row[4] if len(row) > 4 else ''
+                    'timestamp': post.date_str,
+                    'username': post.username,
+                    'text': post.text,
+                    'image_url': post.media_url,
+                    'post_url': post.url,
+                    # 比較対象の now_jst に合わせてタイムゾーンなしで保持
+                    '_dt': post.dt.replace(tzinfo=None)
                 }
                 
                 posts.append(post_data)
                 
                 # 最初の5行のデバッグ情報
                 if i < 5:
-                    print(f"[DEBUG] Row {i}: timestamp='{post_data['timestamp'][:30]}...', username='{post_data['username']}', text='{post_data['text'][:50]}...'")
+                    print(f"[DEBUG] Row {post.row}: timestamp='{post_data['timestamp'][:30]}...', username='{post_data['username']}', text='{post_data['text'][:50]}...'")
             
             print(f"✅ CSV取得完了: {len(posts)}行")
             return posts
@@ -128,6 +119,9 @@ class SNSInsightExtractor:
     
     def _extract_timestamp(self, post: Dict) -> datetime:
         """タイムスタンプ抽出・変換"""
+        if post.get('_dt'):
+            return post['_dt']
+        
         timestamp_fields = ['timestamp', 'date', 'created_at', 'time', 'datetime']
         
         for field in timestamp_fields:
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+複数ソースにまたがる同一ニュース（ストーリー）のクラスタリング
+- 正規化した URL（トラッキングパラメータ・www・AMP・末尾スラッシュを除去）が同じ記事
+- 正規化タイトルが同じ記事
+- タイトル+要約の特徴量（英単語 + 日本語 2-gram）の Jaccard 係数がしきい値を超える記事
+  （MinHash/LSH の near_duplicate.NearDuplicateIndex で候補だけ比較）
+を同じストーリーにまとめ、信頼度の最も高い記事を代表として残す。
+残りは代表の "_also_covered_by" に {source, link, title} として付与する。
+
+翻訳・Gemini 処理は代表記事だけに行えばよく、同じ発表で複数のカード枠を使わない。
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from near_duplicate import NearDuplicateIndex
+
+# ストーリー判定は言い換え記事も拾えるよう重複除去（0.7）より低めのしきい値
+STORY_THRESHOLD = 0.5
+# しきい値 0.5 の組をほぼ確実に候補にするため 64 バンド × 2 行
+STORY_BANDS = 64
+# 短いタイトルだけの記事は偶然の一致を避けるため類似判定しない
+STORY_MIN_FEATURES = 8
+
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'ref_url', 'source', 'src', 'cmpid', 'ncid', 'guccounter', 'sr_share', 's', 't',
+}
+_AMP_PATH_RE = re.compile(r'/(amp|amp\.html)/?$')
+
+
+def canonicalize_url(url: str) -> str:
+    """同じ記事の URL 表記ゆれを吸収した比較用 URL"""
+    url = (url or "").strip()
+    if not url or url == "#":
+        return ""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "m.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = _AMP_PATH_RE.sub("", parts.path) or "/"
+    if path != "/":
+        path = path.rstrip("/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+class StoryClusterer:
+    """記事を順に追加してストーリー単位にまとめる（Union-Find）"""
+
+    def __init__(self, rank: Callable[[object], Any], threshold: float = STORY_THRESHOLD):
+        """rank: 代表を選ぶための信頼度（大きいほど優先、同点なら先に追加した記事）"""
+        self.rank = rank
+        self.items: List = []
+        self._parent: List[int] = []
+        self._by_url: Dict[str, int] = {}
+        self._by_title: Dict[str, int] = {}
+        self._index = NearDuplicateIndex(threshold, bands=STORY_BANDS, min_features=STORY_MIN_FEATURES)
+        self._representatives: Dict[int, object] = {}
+
+    def _root(self, i: int) -> int:
+        while self._parent[i] != i:
+            self._parent[i] = self._parent[self._parent[i]]
+            i = self._parent[i]
+        return i
+
+    def _union(self, a: int, b: int):
+        a, b = self._root(a), self._root(b)
+        if a != b:
+            # 先に追加された記事の番号を根にする（クラスタの並び順を安定させる）
+            self._parent[max(a, b)] = min(a, b)
+
+    @staticmethod
+    def _text(item) -> str:
+        return f"{item.get('title') or ''} {item.get('_full_text') or item.get('_summary') or ''}"
+
+    def add(self, item) -> int:
+        """記事を追加し、一致するストーリーがあれば統合する。記事の番号を返す"""
+        i = len(self.items)
+        matches = []
+        url = canonicalize_url(item.get('link'))
+        if url and url in self._by_url:
+            matches.append(self._by_url[url])
+        title = (item.get('title') or "").lower().strip()
+        if title and title in self._by_title:
+            matches.append(self._by_title[title])
+        # 類似記事の検索と登録で特徴量・MinHash 署名を 1 回だけ計算する
+        matches.extend(key for key, _ in self._index.query_then_add(i, self._text(item)))
+
+        self.items.append(item)
+        self._parent.append(i)
+        for j in matches:
+            self._union(i, j)
+        if url:
+            self._by_url.setdefault(url, i)
+        if title:
+            self._by_title.setdefault(title, i)
+        return i
+
+    def _groups(self) -> Dict[int, List]:
+        groups: Dict[int, List] = {}
+        for i, item in enumerate(self.items):
+            groups.setdefault(self._root(i), []).append(item)
+        return groups
+
+    def clusters(self) -> List[List]:
+        """ストーリーごとの記事リスト（最初に追加された記事の順）"""
+        return list(self._groups().values())
+
+    def resolve(self) -> List:
+        """各ストーリーの代表を選んで "_also_covered_by" を付与し、代表記事のリストを返す"""
+        self._representatives = {}
+        for root, members in self._groups().items():
+            best = max(members, key=self.rank)  # 同点なら先に追加された記事
+            best['_also_covered_by'] = _coverage(best, members)
+            self._representatives[root] = best
+        return list(self._representatives.values())
+
+    @property
+    def representatives(self) -> List:
+        """resolve / attach 済みの代表記事"""
+        return list(self._representatives.values())
+
+    def attach(self, item) -> Optional[object]:
+        """
+        resolve 後に記事を追加する。既存ストーリーに属すればその代表の "_also_covered_by" に加えて代表を返し、
+        新しいストーリーなら自身を代表として登録して None を返す
+        """
+        i = self.add(item)
+        root = self._root(i)
+        representative = self._representatives.get(root)
+        if representative is None or representative is item:
+            item['_also_covered_by'] = []
+            self._representatives[root] = item
+            return None
+        covered = representative.get('_also_covered_by') or []
+        representative['_also_covered_by'] = covered + _coverage(representative, [item])
+        return representative
+
+
+def _coverage(representative, members: List) -> List[Dict[str, str]]:
+    """代表以外の記事を {source, link, title} にまとめる（代表と同じ URL・同じ組み合わせは除く）"""
+    seen = {canonicalize_url(representative.get('link'))}
+    covered = []
+    for item in members:
+        if item is representative:
+            continue
+        url = canonicalize_url(item.get('link'))
+        source = item.get('_source') or ""
+        if url in seen or (not url and not source):
+            continue
+        seen.add(url)
+        covered.append({"source": source, "link": item.get('link') or "", "title": item.get('title') or ""})
+    return covered
+
+
+def cluster_stories(items: List, rank: Callable[[object], Any]) -> StoryClusterer:
+    """items をまとめてクラスタリングし、代表を確定した StoryClusterer を返す"""
+    clusterer = StoryClusterer(rank)
+    for item in items:
+        clusterer.add(item)
+    clusterer.resolve()
+    return clusterer
@@ -73,38 +73,36 @@ def scrape_category(category: str, max_urls: int = 3):
     
     results = []
     
-    for i, url in enumerate(urls, 1):
-        print(f"\n[{i}/{len(urls)}] {url}")
+    # 基本スクレイピングは全URLを並行に実行する
+    scraped = []
+    for i, basic_result in enumerate(scraper.iter_scrape(urls), 1):
+        print(f"\n[{i}/{len(urls)}] {basic_result['url']}")
+        if basic_result['success']:
+            scraped.append(basic_result)
+        else:
+            print(f"❌ スクレイピング失敗: {basic_result.get('error', '不明')}")
+    scraper.close()
+    scraped.sort(key=lambda r: urls.index(r['url']))
+    
+    # AI要約も並行に実行し、届いたものから表示する
+    def on_summary(i, ai_result):
+        basic_result = scraped[i]
+        result = {
+            'url': basic_result['url'],
+            'title': basic_result['title'],
+            'content_length': len(basic_result['content']),
+            'ai_summary': ai_result.get('summary', 'AI要約失敗') if ai_result['success'] else 'AI要約失敗'
+        }
+        results.append(result)
         
-        try:
-            # 基本スクレイピング
-            basic_result = scraper.scrape(url)
-            
-            if basic_result['success']:
-                # AI要約
-                ai_result = extractor.extract(
-                    basic_result['content'], 
-                    "summary"
-                )
-                
-                result = {
-                    'url': url,
-                    'title': basic_result['title'],
-                    'content_length': len(basic_result['content']),
-                    'ai_summary': ai_result.get('summary', 'AI要約失敗') if ai_result['success'] else 'AI要約失敗'
-                }
-                
-                results.append(result)
-                
-                print(f"✅ 完了: {basic_result['title']}")
-                print(f"📝 要約: {result['ai_summary'][:100]}...")
-            else:
-                print(f"❌ スクレイピング失敗: {basic_result.get('error', '不明')}")
-                
-        except Exception as e:
-            print(f"❌ エラー: {e}")
+        print(f"✅ 完了: {basic_result['title']}")
+        print(f"📝 要約: {result['ai_summary'][:100]}...")
     
-    scraper.close()
+    try:
+        extractor.batch_extract([r['content'] for r in scraped], "summary", on_result=on_summary)
+    except Exception as e:
+        print(f"❌ エラー: {e}")
+    results.sort(key=lambda r: urls.index(r['url']))
     
     # 結果保存
     import json
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""テスト共通のフィクスチャ（ローカル HTTP サーバー）"""
+import threading
+import time
+from dataclasses import dataclass
+from email.message import Message
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+import pytest
+
+
+@dataclass
+class Request:
+    """サーバーが受けたリクエスト（headers は大文字小文字を区別しない。at は受信時の time.monotonic()）"""
+    path: str
+    headers: Message
+    client_port: int
+    at: float
+
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+class LocalServer:
+    """127.0.0.1 の空きポートで動く HTTP/1.1（keep-alive）サーバー。handle(request) が (status, headers, body) を返す"""
+
+    def __init__(self, handle: Callable[[Request], Response]):
+        self.requests: List[Request] = []
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                request = Request(self.path, self.headers, self.client_address[1], time.monotonic())
+                server.requests.append(request)
+                status, headers, body = handle(request)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.port = self._httpd.server_port
+        self.url = f"http://127.0.0.1:{self.port}"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def http_server():
+    """http_server(handle) でサーバーを起動する（テスト終了時に停止）"""
+    servers: List[LocalServer] = []
+
+    def serve(handle: Callable[[Request], Response]) -> LocalServer:
+        servers.append(LocalServer(handle))
+        return servers[-1]
+
+    yield serve
+    for server in servers:
+        server.close()
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""BeautifulSoupScraper の並行スクレイピングとドメインごとの間隔のテスト"""
+import time
+
+from scrapers.beautifulsoup_scraper import RAW_HTML_PREVIEW_CHARS, BeautifulSoupScraper
+
+PAGE = ("<html><head><title>テスト記事</title></head><body><article>"
+        + "本文です。" * 600 + "</article></body></html>").encode("utf-8")
+
+
+def _page(request):
+    time.sleep(0.3)
+    return 200, {"Content-Type": "text/html; charset=utf-8"}, PAGE
+
+
+def test_scrape_multiple_runs_domains_concurrently_and_keeps_order(http_server):
+    port = http_server(_page).port
+    # 127.0.0.1 と localhost は別ドメインとして扱う
+    urls = [f"http://127.0.0.1:{port}/a", f"http://localhost:{port}/b"]
+    scraper = BeautifulSoupScraper(delay=1.0)
+    start = time.monotonic()
+    results = scraper.scrape_multiple(urls)
+    elapsed = time.monotonic() - start
+    assert [r["url"] for r in results] == urls and all(r["success"] for r in results)
+    assert elapsed < 0.9  # 直列（0.3 秒 × 2 + delay）なら 1.6 秒以上
+    assert results[0]["title"] == "テスト記事"
+    assert results[0]["raw_html"].startswith("<html>") and results[0]["raw_html"].endswith("...")
+    assert len(results[0]["raw_html"]) == RAW_HTML_PREVIEW_CHARS + 3
+
+
+def test_same_domain_requests_are_spaced_by_delay(http_server):
+    server = http_server(_page)
+    urls = [f"{server.url}/{i}" for i in range(3)]
+    scraper = BeautifulSoupScraper(delay=0.4)
+    results = list(scraper.iter_scrape(urls))
+    assert sorted(r["url"] for r in results) == urls
+    sent = sorted(r.at for r in server.requests)
+    assert all(b - a >= 0.35 for a, b in zip(sent, sent[1:]))
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""import build に副作用がなく、重い依存を読み込まないことのテスト"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import build
+
+ROOT = Path(__file__).resolve().parent.parent
+# import build の時点では読み込まないモジュール（初回使用時に読み込む）
+LAZY_MODULES = ("enhanced_x_processor", "gemini_news_supplement", "url_filter", "google.genai",
+                "deep_translator", "requests", "feedparser", "yaml")
+
+
+def test_import_has_no_side_effects(tmp_path):
+    code = ("import json, sys, build; "
+            f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))")
+    env = dict(os.environ, PYTHONPATH=str(ROOT), HOURS_LOOKBACK="500")
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout) == []  # バナーや不正値の警告も出さない
+    assert result.stderr == ""
+    assert list(tmp_path.iterdir()) == []  # _cache/ を作らない
+
+
+def test_configure_applies_config_and_loads_caches(monkeypatch, tmp_path, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(build, "CACHE_DIR", Path("_cache"))
+    monkeypatch.setenv("HOURS_LOOKBACK", "500")
+    monkeypatch.setenv("MAX_ITEMS_PER_CATEGORY", "12")
+    for name in ("CONFIG", "HOURS_LOOKBACK", "MAX_ITEMS_PER_CATEGORY", "NOW", "FEED_CACHE", "HOST_HEALTH", "X_INGEST"):
+        monkeypatch.setattr(build, name, getattr(build, name))
+
+    config = build.configure()
+    assert "[WARN] Invalid HOURS_LOOKBACK" in capsys.readouterr().out
+    assert build.HOURS_LOOKBACK == config["hours_lookback"] == 24
+    assert build.MAX_ITEMS_PER_CATEGORY == 12
+    assert (tmp_path / "_cache").is_dir()
+    assert build.FEED_CACHE.enabled and build.HOST_HEALTH.enabled
+
+
+def test_optional_import_returns_none_when_missing():
+    assert build.optional_import("no_such_module_for_test", "Anything") is None
+    assert build.optional_import("json", "dumps") is json.dumps
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""build_metrics のステージ計測・履歴による退行検出と build.py の取得計測のテスト"""
+import json
+import time
+
+import build
+import build_metrics
+from build_metrics import BuildMetrics, find_regressions
+from host_health import HostHealth
+
+
+def test_stages_accumulate_and_counters(tmp_path):
+    metrics = BuildMetrics()
+    for _ in range(2):
+        with metrics.stage("fetch:Business"):
+            time.sleep(0.01)
+    metrics.incr("http_403")
+    metrics.incr("http_403")
+    metrics.record_feed("Slow", "https://a.example/rss", 2.5, ok=False)
+    metrics.record_feed("Fast", "https://b.example/rss", 0.1, ok=True, entries=3)
+
+    data = metrics.to_dict()
+    assert data["stages"]["fetch:Business"]["calls"] == 2
+    assert data["stages"]["fetch:Business"]["seconds"] >= 0.02
+    assert data["counters"] == {"http_403": 2}
+    assert [f["name"] for f in data["feeds"]] == ["Slow", "Fast"]
+
+
+def test_write_keeps_rolling_history_and_flags_regressions(tmp_path):
+    history_path = tmp_path / "history.json"
+    for seconds in (10.0, 11.0, 9.0, 10.0):
+        metrics = BuildMetrics()
+        metrics.add_stage_time("fetch:Business", seconds)
+        metrics.add_stage_time("translate", 1.0)
+        assert metrics.write(tmp_path / "m.json", history_path, history_size=3) == []
+
+    slow = BuildMetrics()
+    slow.add_stage_time("fetch:Business", 25.0)
+    slow.add_stage_time("translate", 1.4)  # 1.4 倍かつ 1 秒未満の差は退行にしない
+    assert slow.write(tmp_path / "m.json", history_path, history_size=3) == ["fetch:Business"]
+
+    runs = json.loads(history_path.read_text(encoding="utf-8"))["runs"]
+    assert len(runs) == 3 and runs[-1]["stages"]["fetch:Business"] == 25.0
+    assert json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))["stages"]["translate"]["seconds"] == 1.4
+    assert find_regressions(slow.to_dict(), []) == []  # 履歴が足りなければ判定しない
+
+
+def test_fetch_records_per_feed_timings_and_stage(monkeypatch, tmp_path):
+    metrics = build_metrics.reset_metrics()
+    feeds = [{"name": "A", "url": "https://a.example/rss"}, {"name": "B", "url": "https://b.example/rss"}]
+    monkeypatch.setattr(build, "fetch_feed",
+                        lambda url, name: None if name == "B" else type("Feed", (), {"entries": [{}, {}]})())
+    monkeypatch.setattr(build.FEED_CACHE, "save", lambda: None)
+    monkeypatch.setattr(build, "HOST_HEALTH", HostHealth(tmp_path / "hosts.json"))
+
+    build.gather_items(feeds, "Tools")
+    data = metrics.to_dict()
+    assert data["stages"]["fetch:Tools"]["calls"] == 1
+    assert {(f["name"], f["ok"], f["entries"]) for f in data["feeds"]} == {("A", True, 2), ("B", False, 0)}
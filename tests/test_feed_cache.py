@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""feed_cache.FeedCache と build.fetch_feed の条件付き取得テスト"""
+import build
+from feed_cache import FeedCache
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>OpenAI releases model</title><link>https://example.com/a</link>
+<description>summary a</description><pubDate>Mon, 18 Aug 2025 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def _rss_with_etag(request):
+    if request.headers.get("If-None-Match") == '"v1"':
+        return 304, {}, b""
+    return 200, {"Content-Type": "application/rss+xml", "ETag": '"v1"'}, RSS
+
+
+def test_fetch_feed_reuses_entries_on_304(tmp_path, monkeypatch, http_server):
+    server = http_server(_rss_with_etag)
+    url = server.url + "/rss"
+    cache = FeedCache(tmp_path / "feeds.json")
+    monkeypatch.setattr(build, "FEED_CACHE", cache)
+    first = build.fetch_feed(url, "local")
+    cache.save()
+
+    reloaded = FeedCache(tmp_path / "feeds.json")
+    monkeypatch.setattr(build, "FEED_CACHE", reloaded)
+    second = build.fetch_feed(url, "local")
+
+    assert server.requests[-1].headers.get("If-None-Match") == '"v1"'
+    assert second.status == 304
+    assert reloaded.hits == 1
+    assert [e.title for e in second.entries] == [e.title for e in first.entries]
+    assert tuple(second.entries[0].published_parsed) == tuple(first.entries[0].published_parsed)
+    assert build.pick_summary(second.entries[0]) == build.pick_summary(first.entries[0])
+
+
+def test_store_skips_feeds_without_validators(tmp_path):
+    cache = FeedCache(tmp_path / "feeds.json")
+    cache.store("https://example.com/rss", {"entries": []})
+    assert cache.request_headers("https://example.com/rss") == {}
+    assert cache.cached_feed("https://example.com/rss") is None
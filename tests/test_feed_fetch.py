@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""build.fetch_feeds_concurrently の並列取得テスト"""
+import threading
+import time
+
+import build
+
+
+def test_fetch_preserves_order_and_runs_in_parallel(monkeypatch):
+    def fake_fetch(url, name):
+        time.sleep(0.2)
+        return {"url": url}
+
+    monkeypatch.setattr(build, "fetch_feed", fake_fetch)
+    feeds = [{"name": f"feed{i}", "url": f"https://host{i}.example/rss"} for i in range(6)]
+
+    started = time.time()
+    results = build.fetch_feeds_concurrently(feeds, workers=6, per_host=1)
+    elapsed = time.time() - started
+
+    assert [f["name"] for f, _ in results] == [f["name"] for f in feeds]
+    assert [d["url"] for _, d in results] == [f["url"] for f in feeds]
+    assert elapsed < 0.2 * len(feeds) / 2
+
+
+def test_fetch_respects_per_host_limit(monkeypatch):
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def fake_fetch(url, name):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return None
+
+    monkeypatch.setattr(build, "fetch_feed", fake_fetch)
+    feeds = [{"name": f"feed{i}", "url": f"https://same.example/rss{i}"} for i in range(5)]
+
+    results = build.fetch_feeds_concurrently(feeds, workers=5, per_host=2)
+
+    assert len(results) == 5
+    assert active["peak"] <= 2
+
+
+def test_fetch_skips_feeds_without_url(monkeypatch):
+    monkeypatch.setattr(build, "fetch_feed", lambda url, name: None)
+    results = build.fetch_feeds_concurrently([{"name": "no-url"}])
+    assert results == []
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""GeminiAnalyzer のバッチ採点（JSON 応答の検証と再キュー）のテスト"""
+import gemini_analyzer
+import gemini_scheduler
+import llm_cache
+from gemini_scheduler import GeminiRequestScheduler
+
+
+def make_analyzer(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(gemini_scheduler, "_scheduler",
+                        GeminiRequestScheduler(rpm=1000, tpm=10**6, max_concurrency=2))
+    monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMResponseCache(enabled=False))
+    return gemini_analyzer.GeminiAnalyzer()
+
+
+def test_batches_requeue_missing_and_drop_invalid(monkeypatch):
+    analyzer = make_analyzer(monkeypatch)
+    calls = []
+
+    def fake_json_request(prompt, schema, max_output_tokens=4096):
+        ids = [int(line[5:-1]) for line in prompt.splitlines() if line.startswith("[id: ")]
+        calls.append(ids)
+        if len(calls) == 1:
+            # 1回目: 1件欠落、1件は不正なスコア、未知の id も混ぜる
+            return {"results": [{"id": ids[0], "score": 80, "reason": "a"},
+                                {"id": ids[1], "score": "high", "reason": "b"},
+                                {"id": 99, "score": 10, "reason": "x"}]}
+        return {"results": [{"id": i, "score": 40, "reason": "retry"} for i in ids]}
+
+    monkeypatch.setattr(analyzer, "_make_json_request", fake_json_request)
+    items = [{"title": f"news {i}"} for i in range(3)]
+    results = analyzer.score_in_batches(items, analyzer._build_importance_prompt,
+                                        gemini_analyzer.IMPORTANCE_SCHEMA,
+                                        analyzer._valid_importance_result, batch_size=3)
+
+    assert calls == [[0, 1, 2], [1, 2]]
+    assert sorted(results) == [0, 1, 2]
+    assert results[0]["score"] == 80 and results[2]["reason"] == "retry"
+
+
+def test_analyze_news_importance_uses_few_requests(monkeypatch):
+    analyzer = make_analyzer(monkeypatch)
+    monkeypatch.setenv("GEMINI_BATCH_SIZE", "10")
+    requests_made = []
+
+    def fake_json_request(prompt, schema, max_output_tokens=4096):
+        ids = [int(line[5:-1]) for line in prompt.splitlines() if line.startswith("[id: ")]
+        requests_made.append(ids)
+        return {"results": [{"id": i, "score": 10 + i, "reason": "r", "category": "Business",
+                             "keywords": ["a", "b", "c", "d"]} for i in ids]}
+
+    monkeypatch.setattr(analyzer, "_make_json_request", fake_json_request)
+    items = [{"title": f"news {i}", "importance": 0} for i in range(25)]
+    enhanced = analyzer.analyze_news_importance(items)
+
+    assert len(requests_made) == 2
+    assert len(enhanced) == 25
+    assert enhanced[0]["gemini_score"] == 29
+    assert enhanced[0]["gemini_category"] == "business"
+    assert enhanced[0]["gemini_keywords"] == ["a", "b", "c"]
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""GeminiExtractor の並行バッチ抽出・結果キャッシュ・429 再試行のテスト"""
+import json
+import threading
+import time
+
+from gemini_scheduler import GeminiRequestScheduler
+from llm_cache import LLMResponseCache
+from scrapers.gemini_extractor import GeminiExtractor
+
+
+class ResourceExhausted(Exception):
+    """google.api_core.exceptions.ResourceExhausted の代わり"""
+
+
+class FakeModel:
+    def __init__(self, delay=0.2, fail_first=0):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            if self.fail_first:
+                self.fail_first -= 1
+                raise ResourceExhausted('429 Resource has been exhausted {"retryDelay": "0.2s"}')
+        time.sleep(self.delay)
+        text = prompt.split("【分析対象】")[1].split("【出力形式】")[0].strip()
+        return type("Response", (), {"text": json.dumps({"summary": text}, ensure_ascii=False)})()
+
+
+def make_extractor(model, tmp_path):
+    # SDK（google.generativeai）を読み込まずにテスト用のモデルを差し込む
+    extractor = GeminiExtractor.__new__(GeminiExtractor)
+    extractor.model_name = "test-model"
+    extractor.model = model
+    extractor.response_cache = LLMResponseCache(tmp_path / "llm.json")
+    extractor.scheduler = GeminiRequestScheduler(rpm=1000, tpm=10**6, max_concurrency=4)
+    extractor.max_workers = 4
+    return extractor
+
+
+def test_batch_extract_runs_concurrently_keeps_order_and_streams(tmp_path):
+    model = FakeModel(delay=0.2)
+    extractor = make_extractor(model, tmp_path)
+    contents = [f"記事{i}" for i in range(4)] + ["記事0"]
+    streamed = []
+
+    started = time.monotonic()
+    results = extractor.batch_extract(contents, on_result=lambda i, r: streamed.append(i))
+    assert time.monotonic() - started < 0.6  # 直列なら 0.8 秒以上（旧実装は sleep(1) も入る）
+    assert [r["summary"] for r in results] == contents
+    assert all(r["success"] and r["extraction_type"] == "summary" for r in results)
+    assert sorted(streamed) == list(range(5))
+    assert len(model.prompts) == 4  # 同じ内容は 1 回だけ
+
+
+def test_results_are_cached_per_extraction_type(tmp_path):
+    model = FakeModel(delay=0)
+    extractor = make_extractor(model, tmp_path)
+    first = extractor.extract("同じ記事", "summary")
+    first["summary"] = "呼び出し側で書き換え"
+    assert extractor.extract("同じ記事", "summary")["summary"] == "同じ記事"
+    assert len(model.prompts) == 1
+
+    extractor.extract("同じ記事", "keywords")
+    assert len(model.prompts) == 2
+    assert "【コンテンツ】\n同じ記事" in model.prompts[1]
+
+
+def test_rate_limited_call_waits_and_retries(tmp_path, capsys):
+    model = FakeModel(delay=0, fail_first=1)
+    extractor = make_extractor(model, tmp_path)
+    started = time.monotonic()
+    result = extractor.extract("記事", "summary")
+    assert time.monotonic() - started >= 0.15
+    assert result["success"] and result["summary"] == "記事"
+    assert len(model.prompts) == 2
+    assert extractor.scheduler.stats["rate_limited"] == 1
+    assert "429" in capsys.readouterr().out
+
+
+def test_explicit_max_workers_stays_within_scheduler_slots(tmp_path):
+    model = FakeModel(delay=0.1)
+    extractor = make_extractor(model, tmp_path)
+    extractor.scheduler = GeminiRequestScheduler(rpm=1000, tpm=10**6, max_concurrency=2)
+    running, peak, lock = [0], [0], threading.Lock()
+    generate = model.generate_content
+
+    def tracked(prompt):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            return generate(prompt)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    model.generate_content = tracked
+    extractor.batch_extract([f"記事{i}" for i in range(6)], max_workers=6)
+    assert peak[0] == 2
+
+
+def test_unparseable_response_is_not_cached(tmp_path):
+    class TextModel(FakeModel):
+        def generate_content(self, prompt):
+            self.prompts.append(prompt)
+            return type("Response", (), {"text": "JSON ではない応答"})()
+
+    model = TextModel(delay=0)
+    extractor = make_extractor(model, tmp_path)
+    first = extractor.extract("記事", "summary")
+    assert first["success"] and first["raw_response"] == "JSON ではない応答"
+    extractor.extract("記事", "summary")
+    assert len(model.prompts) == 2
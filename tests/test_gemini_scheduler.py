@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""gemini_scheduler のレート制御と GeminiAnalyzer の 429 処理のテスト"""
+import threading
+import time
+
+import gemini_scheduler
+import llm_cache
+from gemini_scheduler import GeminiRequestScheduler, TokenBucket, parse_retry_after
+
+
+def test_map_preserves_order_and_limits_concurrency():
+    scheduler = GeminiRequestScheduler(rpm=1000, tpm=10**6, max_concurrency=3)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def work(n):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        return n * 10
+
+    assert scheduler.map(work, range(10)) == [n * 10 for n in range(10)]
+    assert 1 < state["peak"] <= 3
+
+
+def test_token_bucket_waits_when_empty():
+    bucket = TokenBucket(per_minute=600)  # 10 / 秒
+    bucket.tokens = 0.0
+    started = time.monotonic()
+    bucket.acquire(1)
+    assert time.monotonic() - started >= 0.05
+
+
+def test_rate_limited_pauses_all_requests(capsys):
+    scheduler = GeminiRequestScheduler(rpm=1000, tpm=10**6, max_concurrency=2)
+    scheduler.report_rate_limited(0.2)
+    started = time.monotonic()
+    scheduler.acquire(10)
+    assert time.monotonic() - started >= 0.15
+    assert scheduler.stats["rate_limited"] == 1
+    assert "429" in capsys.readouterr().out
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"Retry-After": "7"}) == 7.0
+    body = '{"error": {"details": [{"retryDelay": "12s"}]}}'
+    assert parse_retry_after({}, body) == 12.0
+    assert parse_retry_after({}, "quota exceeded") is None
+
+
+def test_analyzer_retries_after_429(monkeypatch):
+    import gemini_analyzer
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(gemini_scheduler, "_scheduler",
+                        GeminiRequestScheduler(rpm=1000, tpm=10**6, max_concurrency=2))
+    monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMResponseCache(enabled=False))
+    responses = []
+
+    class FakeResponse:
+        def __init__(self, status_code, payload=None):
+            self.status_code = status_code
+            self.headers = {"Retry-After": "0"} if status_code == 429 else {}
+            self.text = ""
+            self._payload = payload
+
+        def json(self):
+            return self._payload
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        if not responses:
+            responses.append(429)
+            return FakeResponse(429)
+        responses.append(200)
+        return FakeResponse(200, {"candidates": [{"content": {"parts": [{"text": "ok"}]}}]})
+
+    monkeypatch.setattr(gemini_analyzer.http_client, "post", fake_post)
+    analyzer = gemini_analyzer.GeminiAnalyzer()
+    assert analyzer._make_request("hello") == "ok"
+    assert responses == [429, 200]
+    assert analyzer.scheduler.stats["rate_limited"] == 1
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""gemini_url_context の非同期クライアントと gather_from_urls の並列実行のテスト"""
+import asyncio
+from types import SimpleNamespace
+
+import enhanced_x_processor
+import gemini_url_context
+import llm_cache
+from llm_cache import LLMResponseCache
+
+
+class FakeAsyncModels:
+    def __init__(self, fail_first=()):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.fail_first = set(fail_first)
+
+    async def generate_content(self, model=None, contents=None, config=None):
+        self.calls.append(contents)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            for url in list(self.fail_first):
+                if url in contents:
+                    self.fail_first.discard(url)
+                    raise RuntimeError("503 UNAVAILABLE")
+            url = contents.rsplit("\\n", 1)[-1]
+            text = f"## 要約\n{url} の要約\n\n## カテゴリ\nAI技術\n\n## 重要度\n高"
+            return SimpleNamespace(text=text, candidates=[], usage_metadata=None)
+        finally:
+            self.active -= 1
+
+
+def make_client(monkeypatch, tmp_path, models, **aio):
+    monkeypatch.setattr(gemini_url_context, "GENAI_AVAILABLE", True)
+    monkeypatch.setattr(gemini_url_context, "GenerateContentConfig", lambda tools=None: tools, raising=False)
+    monkeypatch.setattr(gemini_url_context.GeminiURLContextClient, "_make_client",
+                        lambda self: SimpleNamespace(aio=SimpleNamespace(models=models, **aio)))
+    monkeypatch.setattr(llm_cache, "_cache", LLMResponseCache(tmp_path / "llm.json"))
+    return gemini_url_context.GeminiURLContextClient()
+
+
+def test_gather_runs_concurrently_with_bounded_semaphore(monkeypatch, tmp_path):
+    models = FakeAsyncModels()
+    client = make_client(monkeypatch, tmp_path, models)
+    requests = [{"prompt": "p", "urls": [f"https://x.com/u/status/{i}"]} for i in range(25)]
+    results = client.gather_from_urls(requests, max_concurrency=5)
+
+    assert [r["input_urls"] for r in results] == [q["urls"] for q in requests]
+    assert models.max_active == 5
+    # 同じリクエストは 2 回目以降キャッシュから返す（同じイベントループを再利用）
+    again = client.gather_from_urls(requests[:3])
+    assert all(r["cached"] for r in again) and len(models.calls) == 25
+
+
+def test_retry_backoff_does_not_block_and_errors_stay_per_request(monkeypatch, tmp_path):
+    models = FakeAsyncModels(fail_first={"https://a.example/1"})
+    client = make_client(monkeypatch, tmp_path, models)
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(gemini_url_context.asyncio, "sleep", fake_sleep)
+    results = client.gather_from_urls([
+        {"prompt": "p", "urls": ["https://a.example/1"]},
+        {"prompt": "p", "urls": []},
+    ])
+    assert "error" not in results[0]
+    assert [w for w in waits if w >= 1] == [1]  # 1 回だけ失敗 → 2**0 秒の非同期待機
+    assert "error" in results[1]
+
+
+def test_close_shuts_down_aio_client_and_loop(monkeypatch, tmp_path):
+    closed = []
+
+    async def aclose():
+        closed.append(True)
+
+    client = make_client(monkeypatch, tmp_path, FakeAsyncModels(), aclose=aclose)
+    client.gather_from_urls([{"prompt": "p", "urls": ["https://x.com/u/status/1"]}])
+    loop = client._loop
+
+    client.close()
+    client.close()
+    assert closed == [True] and loop.is_closed() and client._loop is None
+
+
+def test_x_processor_enhances_posts_in_one_batch(monkeypatch, tmp_path):
+    models = FakeAsyncModels()
+    client = make_client(monkeypatch, tmp_path, models)
+    processor = enhanced_x_processor.EnhancedXProcessor.__new__(enhanced_x_processor.EnhancedXProcessor)
+    processor.gemini_client = client
+    posts = [{"url": f"https://x.com/u/status/{i}", "text": f"post {i}"} for i in range(3)]
+    posts.append({"url": "", "text": "no url"})
+
+    processor.enhance_posts_with_gemini(posts)
+    assert [p.get("_gemini_enhanced", False) for p in posts] == [True, True, True, False]
+    assert posts[0]["_category"] == "AI技術" and posts[0]["_importance"] == "高"
+    assert len(models.calls) == 3
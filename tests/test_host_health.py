@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""host_health.HostHealth のサーキットブレーカーと build の取得経路への組み込みテスト"""
+import build
+from feed_cache import FeedCache
+from host_health import HostHealth
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>OpenAI releases model</title><link>https://example.com/a</link></item>
+</channel></rss>"""
+URL = "https://bad.example/rss"
+
+
+def test_circuit_opens_after_threshold_and_probes_after_cooldown(tmp_path):
+    health = HostHealth(tmp_path / "hosts.json", threshold=3, cooldown_hours=1)
+    for _ in range(3):
+        assert health.allow(URL, now=0)
+        health.record(URL, False, 8.0, status="timeout", now=0)
+    assert not health.allow("https://bad.example/other", now=60)
+    assert health.degraded(URL)
+
+    # クールダウン明けは 1 件だけ試行し、失敗すればクールダウンを倍にして開き直す
+    assert health.allow(URL, now=3600)
+    assert not health.allow(URL, now=3600)
+    health.record(URL, False, 8.0, status=403, now=3600)
+    assert not health.allow(URL, now=3600 + 3599)
+    assert not health.allow(URL, now=3600 + 7199)
+    assert health.allow(URL, now=3600 + 7200)
+    health.record(URL, True, 0.5, status=200, now=3600 + 7200)
+    assert health.allow(URL, now=3600 + 7200) and not health.degraded(URL)
+
+
+def test_persists_status_latency_and_user_agent(tmp_path):
+    path = tmp_path / "hosts.json"
+    health = HostHealth(path)
+    for seconds in (0.1, 0.2, 0.3, 0.4, 2.0):
+        health.record("https://slow.example/a", True, seconds, status=200)
+    health.record("https://slow.example/b", False, 5.0, status=403)
+    health.remember("https://slow.example/a", "advanced", "UA-2")
+    health.save()
+
+    reloaded = HostHealth(path)
+    assert reloaded.preferred("https://slow.example/c") == {"method": "advanced", "user_agent": "UA-2"}
+    assert reloaded.latency_percentiles("slow.example") == {"p50": 0.3, "p90": 5.0}
+    summary = reloaded.summary()["slow.example"]
+    assert summary["failures"] == 1 and summary["last_status"] == 403 and summary["open_until"] is None
+
+    path.write_text("{broken", encoding="utf-8")
+    assert HostHealth(path).preferred("https://slow.example/a") == {}
+
+
+def test_fetch_skips_open_circuit_without_calling_fetch(monkeypatch, tmp_path):
+    health = HostHealth(tmp_path / "hosts.json", threshold=1)
+    health.record(URL, False, 8.0, status="timeout")
+    monkeypatch.setattr(build, "HOST_HEALTH", health)
+    calls = []
+
+    def fake_fetch(url, name):
+        calls.append(url)
+        return type("Feed", (), {"entries": [{}], "status": 200, "bozo": 0})()
+
+    monkeypatch.setattr(build, "fetch_feed", fake_fetch)
+    results = build.fetch_feeds_concurrently([{"name": "bad", "url": URL},
+                                              {"name": "good", "url": "https://good.example/rss"}])
+    assert [d is None for _, d in results] == [True, False]
+    assert calls == ["https://good.example/rss"]
+    assert health.latency_percentiles("good.example")["p50"] is not None
+
+
+def _firefox_on_mac_only(request):
+    # 5 番目の User-Agent（macOS の Firefox）だけ通す
+    agent = request.headers.get("User-Agent", "")
+    if "Macintosh" not in agent or "Firefox" not in agent:
+        return 403, {}, b""
+    return 200, {"Content-Type": "application/rss+xml"}, RSS
+
+
+def test_remembered_user_agent_is_tried_first(monkeypatch, tmp_path, http_server):
+    server = http_server(_firefox_on_mac_only)
+    url = server.url + "/rss"
+    monkeypatch.setattr(build, "FEED_CACHE", FeedCache(tmp_path / "feeds.json", enabled=False))
+    monkeypatch.setattr(build, "HOST_HEALTH", HostHealth(tmp_path / "hosts.json"))
+    first = build.fetch_feed(url, "local")
+    assert len(first.entries) == 1
+    assert len(server.requests) == 6  # feedparser の 403 + User-Agent 5 通り
+
+    server.requests.clear()
+    second = build.fetch_feed(url, "local")
+    assert len(second.entries) == 1
+    assert len(server.requests) == 1 and "Firefox" in server.requests[0].headers["User-Agent"]
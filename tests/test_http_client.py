@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""http_client の接続再利用とホストごとの接続数制限のテスト"""
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+
+
+def _ok(request):
+    return 200, {}, b"ok"
+
+
+def test_shared_session_reuses_connection(http_server):
+    server = http_server(_ok)
+    http_client.close_session()
+    try:
+        assert http_client.get_session() is http_client.get_session()
+        for _ in range(3):
+            assert http_client.get(server.url + "/").text == "ok"
+        ports = [r.client_port for r in server.requests]
+        assert len(ports) == 3 and len(set(ports)) == 1
+        assert "gzip" in http_client.get_session().headers["Accept-Encoding"]
+    finally:
+        http_client.close_session()
+
+
+def test_per_host_limit_caps_connections(http_server):
+    server = http_server(_ok)
+    session = http_client.create_session(per_host=2)
+    try:
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            texts = list(pool.map(lambda _: session.get(server.url + "/", timeout=5).text, range(12)))
+        assert texts == ["ok"] * 12
+        assert len({r.client_port for r in server.requests}) <= 2
+    finally:
+        session.close()
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""json_store の読み込み（壊れている・バージョン違い）とアトミックな書き出しのテスト"""
+from json_store import atomic_write_json, load_json, load_versioned_json
+
+
+def test_round_trip_and_version_check(tmp_path):
+    path = tmp_path / "sub" / "state.json"
+    atomic_write_json(path, {"version": 2, "items": {"a": "日本語"}})
+    assert load_versioned_json(path, 2, "State") == {"version": 2, "items": {"a": "日本語"}}
+    assert load_versioned_json(path, 3, "State") is None
+    assert not path.with_suffix(".json.tmp").exists()
+
+
+def test_missing_or_corrupt_files_load_as_none(tmp_path):
+    assert load_json(tmp_path / "missing.json", "State") is None
+    for content in (b"{not json", b"[1, 2]", b"\xff\xfe\x00"):
+        (tmp_path / "bad.json").write_bytes(content)
+        assert load_versioned_json(tmp_path / "bad.json", 1, "State") is None
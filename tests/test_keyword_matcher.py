@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""keyword_matcher の一括キーワードマッチャーのテスト"""
+import random
+
+from keyword_matcher import KeywordMatcher
+
+TABLES = {
+    "companies": {"openai": 100, "google": 90, "meta": 85},
+    "impact": {"gpt": 10, "gpt-4": 80, "gpt-5": 100, "launch": 70},
+    "exclude": ["crypto", "cryptocurrency", "ゲーム"],
+}
+
+
+def naive_found(tables, text):
+    return {kw for table in tables.values() for kw in table if kw in text}
+
+
+def test_hits_follow_table_order_and_weights():
+    hits = KeywordMatcher(TABLES).scan("google and openai launch gpt-4o")
+    assert hits.first("companies") == ("openai", 100.0)  # 表の並び順で最初のヒット
+    assert hits.total("companies") == 190
+    assert [kw for kw, _ in hits.hits("impact")] == ["gpt", "gpt-4", "launch"]
+    assert hits.count("impact") == 3
+    assert not hits.any("exclude")
+
+
+def test_overlapping_and_prefix_keywords_are_all_found():
+    hits = KeywordMatcher(TABLES).scan("cryptocurrency ゲーム metaverse")
+    assert hits.found == {"crypto", "cryptocurrency", "ゲーム", "meta"}
+
+
+def test_list_tables_and_duplicates_count_like_substring_checks():
+    matcher = KeywordMatcher({"words": ["ai", "ai", "ml"], "empty": []})
+    hits = matcher.scan("ai news")
+    assert hits.count("words") == 2
+    assert hits.total("words") == 2.0
+    assert hits.first("empty") is None
+    assert KeywordMatcher({}).scan("anything").found == set()
+
+
+def test_matches_naive_substring_search_on_random_text():
+    rng = random.Random(0)
+    vocab = [kw for table in TABLES.values() for kw in table] + ["o", "g", "-", " ", "ゲ"]
+    matcher = KeywordMatcher(TABLES)
+    for _ in range(2000):
+        text = "".join(rng.choice(vocab) for _ in range(rng.randint(0, 8)))
+        assert matcher.scan(text).found == naive_found(TABLES, text), text
+
+
+def test_build_scoring_uses_matcher_semantics():
+    import build
+
+    assert build.is_ai_relevant("OpenAI releases a new model", "")
+    assert not build.is_ai_relevant("OpenAI game launch", "")
+    assert build.is_ai_relevant("robot automation", "")  # 中関連度 2 つで採用
+    assert build.categorize_source("Google AI Blog") == "公式リリース"
+    assert build.categorize_source("PR TIMES") == "プレスリリース"
+    item = {"title": "OpenAI and Google launch", "_summary": "", "_source": "Reuters"}
+    # 企業は最初のヒットのみ（openai=100）、impact は launch*0.5、ソースは reuters*0.3
+    assert build.calculate_importance_score(item) == 100 + 35 + 85 * 0.3
+    sns_item = {"title": "Xポスト @sama", "_summary": "important"}
+    assert build.calculate_sns_importance_score(sns_item) == 95 + 20 * 0.2
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""llm_cache の TTL・件数上限と GeminiAnalyzer での再利用のテスト"""
+import time
+
+import gemini_analyzer
+import gemini_scheduler
+import llm_cache
+from gemini_scheduler import GeminiRequestScheduler
+from llm_cache import LLMResponseCache, make_key
+
+
+def test_key_depends_on_model_prompt_urls_and_config():
+    base = make_key("m", "prompt", ["https://a"], {"temperature": 0.3})
+    assert base == make_key("m", "prompt", ["https://a"], {"temperature": 0.3})
+    assert base != make_key("m2", "prompt", ["https://a"], {"temperature": 0.3})
+    assert base != make_key("m", "prompt", ["https://b"], {"temperature": 0.3})
+    assert base != make_key("m", "prompt", ["https://a"], {"temperature": 0.5})
+
+
+def test_ttl_cap_and_persistence(tmp_path):
+    path = tmp_path / "llm.json"
+    cache = LLMResponseCache(path, ttl_hours=1, max_entries=2)
+    for i in range(3):
+        cache.set(f"k{i}", f"v{i}")
+        cache._entries[f"k{i}"]["t"] = time.time() - 10 + i
+    cache.set("stale", "old")
+    cache._entries["stale"]["t"] = time.time() - 7200
+    assert cache.get("stale") is None
+    cache.save()
+
+    reloaded = LLMResponseCache(path, ttl_hours=1, max_entries=2)
+    assert reloaded.get("k0") is None
+    assert reloaded.get("k2") == "v2"
+    assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+
+def test_analyzer_reuses_cached_response(monkeypatch, tmp_path):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(gemini_scheduler, "_scheduler",
+                        GeminiRequestScheduler(rpm=1000, tpm=10**6, max_concurrency=2))
+    monkeypatch.setattr(llm_cache, "_cache", LLMResponseCache(tmp_path / "llm.json"))
+    calls = []
+
+    class FakeResponse:
+        status_code = 200
+        headers = {}
+        text = ""
+
+        def json(self):
+            return {"candidates": [{"content": {"parts": [{"text": "answer"}]}}]}
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        calls.append(json)
+        return FakeResponse()
+
+    monkeypatch.setattr(gemini_analyzer.http_client, "post", fake_post)
+    analyzer = gemini_analyzer.GeminiAnalyzer()
+    assert analyzer._make_request("same prompt") == "answer"
+    assert analyzer._make_request("same prompt") == "answer"
+    assert analyzer._make_request("same prompt", generation_config={"temperature": 0.9}) == "answer"
+    assert len(calls) == 2
+    assert analyzer.response_cache.hits == 1
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""near_duplicate の MinHash/LSH 近似重複索引のテスト"""
+import random
+import string
+
+from near_duplicate import NearDuplicateIndex, extract_features, jaccard
+
+
+def test_features_cover_english_words_and_japanese_bigrams():
+    features = extract_features("OpenAIがGPT-5を発表 new API")
+    assert {"openai", "gpt", "new", "api", "発表"} <= features
+    assert "が" not in features  # 1 文字の連続部分は使わない
+
+
+def test_finds_reworded_japanese_and_english_posts():
+    index = NearDuplicateIndex()
+    assert index.add_if_new("a", "OpenAIがGPT-5を正式に発表しました。推論性能が大幅に向上しています") is None
+    assert index.add_if_new("b", "Anthropic releases Claude with new tool use features") is None
+    assert index.add_if_new("c", "OpenAIがGPT-5を正式に発表しました！推論性能が大幅に向上しています https://x.com/p") == "a"
+    assert index.add_if_new("d", "Google DeepMind の新しい研究成果について") is None
+    assert len(index) == 3  # 重複した c は登録しない
+
+
+def test_min_features_skips_short_texts():
+    index = NearDuplicateIndex(min_features=5)
+    index.add("short", "AI news")
+    assert index.find("AI news") is None
+
+
+def test_lsh_matches_exact_jaccard_without_pairwise_scan():
+    rng = random.Random(0)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(6)) for _ in range(2000)]
+    texts = [" ".join(rng.choice(words) for _ in range(25)) for _ in range(300)]
+    for i in range(0, 300, 10):
+        texts[i + 1] = texts[i] + " extra"  # Jaccard > 0.9 の近似重複を混ぜる
+
+    index = NearDuplicateIndex()
+    found = []
+    for i, text in enumerate(texts):
+        features = extract_features(text)
+        expected = [j for j in range(i) if j in index and jaccard(features, extract_features(texts[j])) > 0.7]
+        duplicate = index.add_if_new(i, text)
+        assert (duplicate is not None) == bool(expected)
+        if duplicate is not None:
+            found.append(i)
+    assert len(found) == 30
+    assert index.comparisons < 300  # 総当たりなら約 45,000 回
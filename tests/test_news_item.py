@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""NewsItem（取り込み時に 1 回だけスコア計算するレコード）のテスト"""
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import build
+from news_item import NewsItem
+
+
+def test_dict_compatible_access_and_extra_keys():
+    item = NewsItem.from_dict({"title": " Hello ", "link": " https://a.example/1 ", "_summary": "s",
+                               "_source": "Src", "_full_text": "full"})
+    assert item["title"] == " Hello " and item.get("_summary") == "s"
+    assert item.title_key == "hello" and item.link_key == "https://a.example/1"
+    assert item.get("_full_text") == "full" and item.get("_priority", 0) == 0
+    assert item.get("_importance_score", 50) == 50  # 未設定なら dict と同じく default
+    assert "_dt" not in item
+    item["title"] = "New Title"
+    item["_priority"] = 3
+    assert item.title_key == "new title" and item["_priority"] == 3
+
+
+def test_to_news_item_precomputes_scores_once():
+    dt = build.NOW - timedelta(hours=30)
+    item = build.to_news_item({"title": "OpenAI launch", "link": "https://a.example", "_summary": "hello world",
+                               "_source": "Reuters", "_dt": dt}, "Business")
+    assert item.importance_score == build.calculate_importance_score(item)
+    assert item.freshness_bucket == "72h"
+    assert item.lang_code == "en"
+    assert item.source_category == "テックメディア"
+    assert build.to_news_item(item) is item
+
+
+def test_gather_and_sort_score_each_item_once(monkeypatch):
+    entries = [
+        {"title": f"OpenAI news {i}", "link": f"https://n.example/{i}", "summary": "launch",
+         "published_parsed": time.gmtime(time.time() - 3600 * (i + 1))}
+        for i in range(5)
+    ]
+    feed = {"name": "Feed", "url": "https://n.example/rss"}
+    monkeypatch.setattr(build, "fetch_feeds_concurrently", lambda feeds: [(feed, SimpleNamespace(entries=entries))])
+    monkeypatch.setattr(build.FEED_CACHE, "save", lambda: None)
+    monkeypatch.setattr(build.HOST_HEALTH, "save", lambda: None)
+    calls = []
+    original = build.calculate_importance_score
+    monkeypatch.setattr(build, "calculate_importance_score", lambda item: calls.append(1) or original(item))
+
+    items = build.gather_items([feed], "Business")
+    assert len(items) == 5 and len(calls) == 5
+    assert all(isinstance(item, NewsItem) for item in items)
+
+    build.sort_items_for_category(items, "Business")
+    html_out = build.build_cards(items, None, "business", "ビジネス")
+    assert len(calls) == 5
+    assert 'data-freshness-bucket="24h"' in html_out
+
+
+def test_sort_puts_unscored_items_last():
+    scored = build.to_news_item({"title": "a", "link": "https://n.example/a", "_dt": build.NOW,
+                                 "_importance_score": 5.0})
+    unscored = build.to_news_item({"title": "b", "link": "https://n.example/b", "_dt": build.NOW})
+    assert build.sort_items_for_category([unscored, scored], "Posts") == [scored, unscored]
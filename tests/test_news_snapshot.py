@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""news_snapshot の保存・読み込みと build.collect_items の再利用テスト"""
+import gzip
+from datetime import timedelta
+
+import build
+from news_item import NewsItem
+from news_snapshot import load_snapshot, write_snapshot
+
+
+def news(title, category="Business", **extra):
+    return build.to_news_item({"title": title, "link": f"https://example.com/{title}", "_summary": "s",
+                               "_source": "Reuters", "_dt": build.NOW - timedelta(hours=1), **extra}, category)
+
+
+def test_round_trip_keeps_scores_dates_and_extra(tmp_path):
+    path = tmp_path / "snapshot.jsonl.gz"
+    original = news("OpenAI launches GPT-5",
+                    _also_covered_by=[{"source": "VentureBeat", "link": "https://v.example/a", "title": "t"}])
+    write_snapshot({"Business": [original], "Tools": [], "Posts": []}, {"hours_lookback": 24}, path)
+
+    snapshot = load_snapshot(path, hours_lookback=24)
+    [loaded] = snapshot.sections["Business"]
+    assert isinstance(loaded, NewsItem)
+    assert loaded.to_dict() == original.to_dict()
+    assert loaded.dt == original.dt and loaded.dt.tzinfo is not None
+    assert loaded.link_key == original.link_key and snapshot.sections["Tools"] == []
+
+
+def test_rejects_stale_mismatched_incomplete_or_corrupt(tmp_path):
+    path = tmp_path / "snapshot.jsonl.gz"
+    write_snapshot({"Business": [news("a")], "Tools": [], "Posts": []}, {"hours_lookback": 24}, path)
+
+    assert load_snapshot(path, max_age_minutes=-1) is None
+    assert load_snapshot(path, hours_lookback=48) is None
+    assert load_snapshot(path, require=("Business", "X")) is None
+    assert load_snapshot(tmp_path / "missing.jsonl.gz") is None
+    path.write_bytes(gzip.compress(b'{"version": 1, "created_at": "x"}\n'))
+    assert load_snapshot(path) is None
+
+
+def test_collect_items_reuses_snapshot_without_fetching(monkeypatch, tmp_path):
+    monkeypatch.setattr(build, "NEWS_SNAPSHOT_FILE", tmp_path / "snapshot.jsonl.gz")
+    monkeypatch.setattr(build, "X_POSTS_CSV", "")
+    fetched = []
+
+    def fake_gather(feeds, category_name):
+        fetched.append(category_name)
+        return [news(f"{category_name} story", category_name)]
+
+    monkeypatch.setattr(build, "gather_items", fake_gather)
+    first = build.collect_items({}, reuse=True)
+    assert fetched == ["Business", "Tools", "Posts"] and first["X"] == []
+
+    again = build.collect_items({}, reuse=True)
+    assert fetched == ["Business", "Tools", "Posts"]
+    assert [item.title for item in again["Tools"]] == ["Tools story"]
+    assert again["Posts"][0].importance_score == first["Posts"][0].importance_score
+
+    # X を含まない収集（ダッシュボード生成）で保存したスナップショットは build.main では使わない
+    build.collect_items({}, include_x=False)
+    build.collect_items({}, reuse=True)
+    assert len(fetched) == 9
+
+
+def test_collect_items_ignores_snapshot_from_another_x_csv(monkeypatch, tmp_path):
+    monkeypatch.setattr(build, "NEWS_SNAPSHOT_FILE", tmp_path / "snapshot.jsonl.gz")
+    monkeypatch.setattr(build, "gather_items", lambda feeds, category_name: [])
+    monkeypatch.setattr(build, "gather_x_posts", lambda csv_path: [])
+    monkeypatch.setattr(build, "X_POSTS_CSV", "a.csv")
+    build.collect_items({})
+
+    fetched = []
+    monkeypatch.setattr(build, "gather_x_posts", lambda csv_path: fetched.append(csv_path) or [])
+    build.collect_items({}, reuse=True)
+    assert fetched == []
+    monkeypatch.setattr(build, "X_POSTS_CSV", "b.csv")
+    build.collect_items({}, reuse=True)
+    assert fetched == ["b.csv"]
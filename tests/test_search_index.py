@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""search_index の転置インデックスと index.html のデータアイランドのテスト"""
+import json
+import re
+from datetime import timedelta
+from pathlib import Path
+
+import build
+from search_index import build_payload, build_search_index, json_island, search, tokenize
+
+TEMPLATE = Path(__file__).resolve().parent.parent / "templates" / "bootstrap_template.html"
+
+
+def test_tokenize_words_and_japanese_ngrams():
+    assert tokenize("OpenAI の GPT-5") == ["openai", "gpt", "5", "の"]
+    assert tokenize("人工知能") == ["人", "工", "知", "能", "人工", "工知", "知能"]
+    assert tokenize("ＧＰＴ ｶﾀｶﾅ") == ["gpt", "カ", "タ", "カ", "ナ", "カタ", "タカ", "カナ"]
+
+
+def test_index_matches_substrings_like_text_search():
+    texts = ["OpenAI launches GPT-5", "人工知能の新モデル", "Google DeepMind 研究"]
+    index = build_search_index(texts)
+    assert index["openai"] == [0] and index["知能"] == [1]
+    assert search(index, "open", 3) == [0]
+    assert search(index, "mind", 3) == [2]
+    assert search(index, "知能", 3) == [1]
+    assert search(index, "モデル", 3) == [1]
+    assert search(index, "gpt 研究", 3) == []
+    # トークンにならない記号だけの問い合わせは絞り込まない（テンプレートの matchKeywords と同じ）
+    assert search(index, "!! -", 3) == [0, 1, 2]
+    assert search(index, "open !!", 3) == [0]
+
+
+def test_json_island_cannot_close_script_element():
+    island = json_island({"cards": [["</script><!-- & "]]})
+    assert "<" not in island and ">" not in island
+    assert json.loads(island) == {"cards": [["</script><!-- & "]]}
+
+
+def test_card_payload_matches_template_fields(monkeypatch):
+    monkeypatch.setattr(build, "TRANSLATE_TO_JA", False)
+    item = build.to_news_item({"title": "OpenAI & 人工知能", "link": "https://example.com/a",
+                               "_summary": "summary", "_source": "Reuters",
+                               "_dt": build.NOW - timedelta(hours=1)}, "Business")
+    [record] = build.build_card_records([item], None, "business", "ビジネス")
+    payload = build_payload([build.card_payload(record)], [build.card_search_text(record)])
+
+    fields = re.search(r"const CARD_FIELDS = \[(.*?)\];", TEMPLATE.read_text(encoding="utf-8"), re.S).group(1)
+    names = re.findall(r"'(\w+)'", fields)
+    card = dict(zip(names, payload["cards"][0]))
+    assert len(names) == len(payload["cards"][0])
+    assert card["title"] == "OpenAI & 人工知能" and card["category"] == "business" and card["rank"] == 1
+    assert search(payload["index"], "ビジネス", 1) == [0]  # タグも検索対象
+    assert "%%NEWS_DATA%%" in TEMPLATE.read_text(encoding="utf-8")
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""story_clusters のストーリー単位クラスタリングのテスト"""
+from datetime import timedelta
+
+import build
+import near_duplicate
+from story_clusters import canonicalize_url, cluster_stories
+
+TRUST = {"Reuters": 90, "VentureBeat": 80, "ITmedia": 70, "Hacker News": 60}
+
+
+def item(title, link, source, summary=""):
+    return {"title": title, "link": link, "_source": source, "_summary": summary}
+
+
+def test_canonicalize_url_drops_tracking_and_variants():
+    assert canonicalize_url("http://www.example.com/news/a/?utm_source=x&id=3&fbclid=y#top") == \
+        "https://example.com/news/a?id=3"
+    assert canonicalize_url("https://m.example.com/news/a/amp") == "https://example.com/news/a"
+    assert canonicalize_url("#") == ""
+
+
+def test_groups_same_story_and_keeps_most_trusted_representative():
+    summary = "OpenAI announced GPT-5 with improved reasoning, coding and agent capabilities for developers"
+    items = [
+        item("OpenAI launches GPT-5", "https://news.ycombinator.com/item?id=1", "Hacker News", summary),
+        item("OpenAI launches GPT-5 model", "https://venturebeat.com/ai/gpt5?utm_source=rss", "VentureBeat",
+             summary + " today"),
+        item("OpenAI unveils GPT-5 for developers", "https://reuters.com/tech/gpt5", "Reuters", summary),
+        item("Anthropic ships Claude update", "https://venturebeat.com/ai/claude", "VentureBeat",
+             "Anthropic released a new Claude model with longer context and tool use for enterprise teams"),
+        item("OpenAI launches GPT-5", "https://example.com/other", "ITmedia"),  # 同じタイトル
+    ]
+    clusterer = cluster_stories(items, rank=lambda it: TRUST[it["_source"]])
+    assert [len(c) for c in clusterer.clusters()] == [4, 1]
+
+    reps = clusterer.representatives
+    assert [r["_source"] for r in reps] == ["Reuters", "VentureBeat"]
+    covered = [c["source"] for c in reps[0]["_also_covered_by"]]
+    assert covered == ["Hacker News", "VentureBeat", "ITmedia"]
+    assert reps[1]["_also_covered_by"] == []
+
+
+def test_signature_computed_once_per_item(monkeypatch):
+    calls = []
+    original = near_duplicate.minhash_signature
+    monkeypatch.setattr(near_duplicate, "minhash_signature", lambda f: calls.append(1) or original(f))
+    summary = "OpenAI announced a new reasoning model with improved benchmark results today"
+    items = [item(f"OpenAI model story {i}", f"https://site{i}.example/a", "Reuters", summary) for i in range(5)]
+    clusterer = cluster_stories(items, lambda it: TRUST.get(it["_source"], 0))
+    assert len(calls) == 5
+    assert len(clusterer.clusters()) == 1
+
+
+def test_attach_adds_late_items_to_existing_story():
+    summary = "Google DeepMind introduced Gemini robotics models that control physical robots from language"
+    clusterer = cluster_stories([item("DeepMind Gemini Robotics", "https://deepmind.google/gr", "Reuters", summary)],
+                                rank=lambda it: TRUST.get(it["_source"], 0))
+    rep = clusterer.attach(item("DeepMind Gemini Robotics announced", "https://x.com/a/status/1", "X / SNS", summary))
+    assert rep is not None and rep["_source"] == "Reuters"
+    assert [c["link"] for c in rep["_also_covered_by"]] == ["https://x.com/a/status/1"]
+    assert clusterer.attach(item("Totally different post", "https://x.com/b/status/2", "X / SNS")) is None
+
+
+def test_build_cards_show_other_coverage():
+    news = build.to_news_item({"title": "OpenAI launches GPT-5", "link": "https://reuters.com/tech/gpt5",
+                               "_summary": "s", "_source": "Reuters", "_dt": build.NOW - timedelta(hours=1)},
+                              "Business")
+    news["_also_covered_by"] = [{"source": "VentureBeat", "link": "https://venturebeat.com/ai/gpt5", "title": "t"}]
+    html_out = build.build_cards([news], None, "business", "ビジネス")
+    assert 'class="news-card__also"' in html_out and ">VentureBeat</a>" in html_out
+
+    representatives = build.keep_story_representatives([news, build.to_news_item(
+        {"title": "OpenAI launches GPT-5", "link": "https://example.com/copy", "_source": "Some Blog",
+         "_dt": build.NOW}, "Business")])
+    assert representatives == [news]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""JaTranslator.translate_batch と翻訳の先読みのテスト"""
+import build
+
+
+class FakeTranslator(build.JaTranslator):
+    """区切りマーカーを保ったまま各行に「訳:」を付けるだけのエンジン"""
+
+    def __init__(self, engine="google", break_markers=False, down=()):
+        super().__init__(engine)
+        self.calls = []
+        self.engine_calls = []
+        self.break_markers = break_markers
+        self.down = set(down)
+
+    def _call(self, engine, text):
+        self.engine_calls.append((engine, text))
+        if engine in self.down:
+            raise RuntimeError(f"{engine} unavailable")
+        self.calls.append(text)
+        if self.break_markers and "[[" in text:
+            return text.replace("[[1]]", "[1]")
+        return "\n".join(
+            line if self.BATCH_MARKER_RE.fullmatch(line) else f"訳:{line}"
+            for line in text.split("\n")
+        )
+
+
+def test_batch_packs_texts_into_one_request():
+    translator = FakeTranslator()
+    texts = ["first summary", "", "日本語の要約", "second  summary\nwith newline"]
+
+    result = translator.translate_batch(texts)
+
+    assert result == ["訳:first summary", "", "日本語の要約", "訳:second summary with newline"]
+    assert len(translator.calls) == 1
+
+
+def test_batch_falls_back_per_item_when_markers_break():
+    translator = FakeTranslator(break_markers=True)
+
+    result = translator.translate_batch(["alpha text", "beta text"])
+
+    assert result == ["訳:alpha text", "訳:beta text"]
+    assert len(translator.calls) == 3
+
+
+def test_batch_respects_engine_size_cap_and_marker_collisions():
+    translator = FakeTranslator(engine="mymemory")
+    texts = ["x" * 200, "y" * 200, "z" * 200, "contains [[0]] marker"]
+
+    result = translator.translate_batch(texts)
+
+    assert result == [f"訳:{t}" for t in texts]
+    assert all(len(call) <= translator.BATCH_CHAR_LIMITS["mymemory"] for call in translator.calls)
+    assert "contains [[0]] marker" in translator.calls
+
+
+def test_fallback_engine_gets_batches_repacked_to_its_limit():
+    translator = FakeTranslator(down={"google"})
+    texts = [f"summary {i} " + "x" * 180 for i in range(10)]
+
+    result = translator.translate_batch(texts)
+
+    assert result == [f"訳:{t}" for t in texts]
+    assert [engine for engine, _ in translator.engine_calls].count("google") == 1
+    fallback_calls = [text for engine, text in translator.engine_calls if engine == "mymemory"]
+    assert len(fallback_calls) == 5
+    assert all(len(call) <= translator.BATCH_CHAR_LIMITS["mymemory"] for call in fallback_calls)
+
+
+def test_prefetch_only_sends_cache_misses(monkeypatch):
+    cache = build.TranslationCache(build.CACHE_FILE, legacy_path=None, autoload=False)
+    build.put_cached_translation(cache, "cached summary", "キャッシュ済み")
+    monkeypatch.setattr(build, "TRANSLATION_CACHE", cache)
+    monkeypatch.setattr(build, "TRANSLATE_TO_JA", True)
+    translator = FakeTranslator()
+    items = [
+        {"link": "https://a", "_summary": "cached summary"},
+        {"link": "https://b", "_summary": "new summary"},
+        {"link": "https://c", "_summary": "new summary"},
+    ]
+
+    stored = build.prefetch_translations(items, translator)
+
+    assert stored == 1
+    assert translator.calls == ["new summary"]
+    assert build.get_cached_translation(cache, "https://c", "new summary") == "訳:new summary"
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""translation_cache.TranslationCache と build の翻訳キャッシュ連携のテスト"""
+import json
+import time
+
+import build
+from translation_cache import TranslationCache, link_key, text_key
+
+
+def _cache(tmp_path, **kwargs):
+    return TranslationCache(tmp_path / "translations.jsonl",
+                            legacy_path=tmp_path / "translations.json", **kwargs)
+
+
+def test_text_key_is_stable_and_normalized():
+    key = text_key("OpenAI  releases\nGPT-5")
+    assert key == text_key("OpenAI releases GPT-5 ")
+    assert key == text_key("ＯｐｅｎＡＩ releases GPT-5")
+    assert key != text_key("OpenAI releases GPT-4")
+
+
+def test_legacy_v1_entries_are_recovered_by_link(tmp_path):
+    (tmp_path / "translations.json").write_text(json.dumps({
+        "https://example.com/a::-1234567890": "訳文A",
+        "Some title_ja": "別スクリプトのキー",
+    }), encoding="utf-8")
+    cache = _cache(tmp_path)
+
+    assert cache["Some title_ja"] == "別スクリプトのキー"
+    assert build.get_cached_translation(cache, "https://example.com/a", "summary a") == "訳文A"
+    # 付け替え後は本文ダイジェストでヒットする
+    assert link_key("https://example.com/a") not in cache
+    assert build.get_cached_translation(cache, "https://other.example/a", "summary a") == "訳文A"
+
+
+def test_save_appends_only_new_records(tmp_path):
+    cache = _cache(tmp_path)
+    cache["a"] = "あ"
+    cache.save()  # 初回は圧縮書き出し
+    cache["b"] = "い"
+    cache.save()
+
+    lines = (tmp_path / "translations.jsonl").read_text(encoding="utf-8").splitlines()
+    reloaded = _cache(tmp_path)
+
+    assert len(lines) == 2
+    assert reloaded.get("a") == "あ" and reloaded.get("b") == "い"
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    cache = _cache(tmp_path)
+    cache["a"] = "あ"
+    cache.save()
+    with open(tmp_path / "translations.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"k": "b", "v": "途中')
+
+    reloaded = _cache(tmp_path)
+
+    assert len(reloaded) == 1
+    assert reloaded.get("a") == "あ"
+
+
+def test_evicts_expired_and_least_recently_hit(tmp_path):
+    cache = _cache(tmp_path, max_entries=2, ttl_days=30)
+    cache["old"] = "古い"
+    cache["a"] = "あ"
+    cache["b"] = "い"
+    cache["c"] = "う"
+    now = time.time()
+    cache._entries["old"][1] = now - 31 * 86400
+    cache._entries["a"][1] = now - 10
+    cache._entries["b"][1] = now - 5
+
+    removed = cache.evict(now)
+
+    assert removed == 2
+    assert sorted(cache._entries) == ["b", "c"]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""x_csv_parser の共通ストリーミングパーサーのテスト"""
+import io
+from datetime import datetime
+
+from x_csv_parser import JST, DateParser, parse_x_csv
+
+ROWS_OLDEST_FIRST = (
+    '"August 10, 2025 at 02:41AM",@old,"古い投稿 https://t.co/x",,https://twitter.com/old/status/1\n'
+    '"August 12, 2025 at 09:00AM",@mid,"複数行の\n投稿 &amp; テキスト",https://x.com/mid/photo/1,\n'
+    '"August 13, 2025 at 11:30PM",@new,"新しい投稿",,https://twitter.com/new/status/3\n'
+)
+
+
+def test_parses_rows_and_normalizes_text():
+    posts = list(parse_x_csv(io.StringIO(ROWS_OLDEST_FIRST)))
+    assert [p.username for p in posts] == ["@old", "@mid", "@new"]
+    assert posts[1].text == "複数行の 投稿 & テキスト"
+    assert posts[1].url == "https://x.com/mid/photo/1"  # ツイートURL列が空なら他の列から補完
+    assert posts[2].dt == datetime(2025, 8, 13, 23, 30, tzinfo=JST)
+
+
+def test_cutoff_skips_old_rows_without_stopping_by_default():
+    stats = {}
+    cutoff = datetime(2025, 8, 12, tzinfo=JST)
+    posts = list(parse_x_csv(io.StringIO(ROWS_OLDEST_FIRST), cutoff=cutoff, stats=stats))
+    assert [p.username for p in posts] == ["@mid", "@new"]
+    assert stats["skipped_old"] == 1 and not stats["stopped_early"]
+
+
+def test_cutoff_stops_early_when_newest_first():
+    newest_first = "".join(reversed(ROWS_OLDEST_FIRST.replace("の\n投稿", "の 投稿").splitlines(True)))
+    newest_first += '"not a date",@x,"header-like row"\n' * 3
+    stats = {}
+    cutoff = datetime(2025, 8, 12, tzinfo=JST)
+    posts = list(parse_x_csv(io.StringIO(newest_first), cutoff=cutoff, newest_first=True, stats=stats))
+    assert [p.username for p in posts] == ["@new", "@mid"]
+    assert stats["stopped_early"] and stats["rows"] == 3
+
+
+def test_date_parser_remembers_detected_format():
+    parser = DateParser()
+    assert parser.parse("2025-08-18 14:30:00") == datetime(2025, 8, 18, 14, 30, tzinfo=JST)
+    assert parser.detected == "%Y-%m-%d %H:%M:%S"
+    assert parser.parse("August 13, 2025").day == 13
+    assert parser.parse("garbage") is None
+
+
+def test_bytes_source_falls_back_to_cp932():
+    raw = '"2025-08-18",@jp,"日本語の投稿です"\n'.encode("cp932")
+    posts = list(parse_x_csv(raw))
+    assert posts[0].text == "日本語の投稿です"
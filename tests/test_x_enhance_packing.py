@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""X 投稿強化のリクエストまとめ（最大 20 件/回・URL で対応付け・失敗分だけ再試行）のテスト"""
+import json
+
+import enhanced_x_processor
+from enhanced_x_processor import EnhancedXProcessor
+from llm_cache import LLMResponseCache
+
+
+class FakeGeminiClient:
+    """まとめたリクエストには JSON 配列、投稿単位のリクエストには見出し形式で応答する"""
+
+    def __init__(self, omit=()):
+        self.requests = []
+        self.omit = set(omit)
+
+    def gather_from_urls(self, requests, max_concurrency=None):
+        self.requests.extend(requests)
+        results = []
+        for request in requests:
+            if len(request["urls"]) > 1:
+                entries = [{"url": url.replace("https://x.com", "https://twitter.com") + "/",
+                            "summary": f"{url} の要約", "category": "ビジネス", "importance": "中"}
+                           for url in request["urls"] if url not in self.omit]
+                results.append({"text": "```json\n" + json.dumps(entries, ensure_ascii=False) + "\n```"})
+            else:
+                results.append({"text": "## 要約\n個別の要約\n\n## カテゴリ\nAI技術\n\n## 重要度\n高"})
+        return results
+
+
+def make_processor(client):
+    processor = EnhancedXProcessor.__new__(EnhancedXProcessor)
+    processor.gemini_client = client
+    return processor
+
+
+def test_packs_twenty_posts_per_call_and_retries_only_missing():
+    posts = [{"url": f"https://x.com/u/status/{i}", "text": f"post {i}"} for i in range(25)]
+    client = FakeGeminiClient(omit={"https://x.com/u/status/3"})
+    make_processor(client).enhance_posts_packed(posts)
+
+    assert [len(r["urls"]) for r in client.requests] == [20, 5, 1]
+    assert client.requests[2]["urls"] == ["https://x.com/u/status/3"]
+    assert all(p["_gemini_enhanced"] for p in posts)
+    assert posts[0]["_enhanced_summary"] == "https://x.com/u/status/0 の要約"
+    assert posts[0]["_importance"] == "中" and posts[3]["_importance"] == "高"
+
+
+def test_unparseable_pack_falls_back_to_per_post_requests():
+    class BrokenPackClient(FakeGeminiClient):
+        def gather_from_urls(self, requests, max_concurrency=None):
+            results = super().gather_from_urls(requests, max_concurrency)
+            return [{"text": "not json"} if len(r["urls"]) > 1 else res for r, res in zip(requests, results)]
+
+    posts = [{"url": f"https://x.com/u/status/{i}", "text": f"post {i}"} for i in range(3)]
+    posts.append({"url": "", "text": "no url"})
+    client = BrokenPackClient()
+    make_processor(client).enhance_posts_packed(posts)
+
+    assert [len(r["urls"]) for r in client.requests] == [3, 1, 1, 1]
+    assert [p.get("_gemini_enhanced", False) for p in posts] == [True, True, True, False]
+
+
+def test_unparseable_cached_pack_is_evicted(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm.json")
+    cache.set("pack", "not json")
+    cache.set("other", "kept")
+    monkeypatch.setattr(enhanced_x_processor, "get_llm_cache", lambda: cache)
+
+    class CachedBrokenPackClient(FakeGeminiClient):
+        def gather_from_urls(self, requests, max_concurrency=None):
+            results = super().gather_from_urls(requests, max_concurrency)
+            return [{"text": "not json", "cached": True, "cache_key": "pack"} if len(r["urls"]) > 1 else res
+                    for r, res in zip(requests, results)]
+
+    posts = [{"url": f"https://x.com/u/status/{i}", "text": f"post {i}"} for i in range(2)]
+    make_processor(CachedBrokenPackClient()).enhance_posts_packed(posts)
+
+    assert cache.get("pack") is None and cache.get("other") == "kept"
+    assert all(p["_gemini_enhanced"] for p in posts)
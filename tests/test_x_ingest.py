@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""x_ingest の差分取り込み（ウォーターマーク）のテスト"""
+from datetime import datetime
+
+from x_csv_parser import JST
+from x_ingest import XIngestState
+
+
+def row(day, user, text):
+    return f'"August {day}, 2025 at 10:00AM",@{user},"{text}",,https://twitter.com/{user}/status/{day}'
+
+
+def to_items(rows):
+    return [{"title": r.username, "link": r.url, "_dt": r.dt} for r in rows]
+
+
+def test_second_run_reads_only_appended_rows(tmp_path):
+    csv_path = tmp_path / "x.csv"
+    csv_path.write_text("\r\n".join([row(10, "a", "一件目"), row(11, "b", "二件目")]), encoding="utf-8")
+    state_path = tmp_path / "x_ingest.json"
+    cutoff = datetime(2025, 8, 1, tzinfo=JST)
+
+    state = XIngestState(state_path)
+    rows, window = state.read_rows(str(csv_path), "test", cutoff)
+    assert [r.username for r in rows] == ["@a", "@b"] and window == []
+    state.commit(str(csv_path), "test", to_items(rows), cutoff)
+
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("\r\n" + row(12, "c", "三件目\n複数行"))
+
+    state = XIngestState(state_path)
+    rows, window = state.read_rows(str(csv_path), "test", cutoff)
+    assert [r.username for r in rows] == ["@c"]
+    assert [w["title"] for w in window] == ["@a", "@b"]
+    merged = state.commit(str(csv_path), "test", to_items(rows), cutoff)
+    assert [m["title"] for m in merged] == ["@c", "@a", "@b"]
+
+    # 追記が無ければ新規行なし・投稿はそのまま
+    rows, window = XIngestState(state_path).read_rows(str(csv_path), "test", cutoff)
+    assert rows == [] and len(window) == 3
+
+
+def test_rewritten_file_falls_back_to_full_read_and_window_respects_cutoff(tmp_path):
+    csv_path = tmp_path / "x.csv"
+    csv_path.write_text(row(10, "a", "一件目"), encoding="utf-8")
+    state_path = tmp_path / "x_ingest.json"
+    state = XIngestState(state_path)
+    rows, _ = state.read_rows(str(csv_path), "test")
+    state.commit(str(csv_path), "test", to_items(rows))
+
+    # 先頭行が書き換えられた（ウォーターマーク前の内容が変わった）
+    csv_path.write_text("\r\n".join([row(11, "x", "差し替え"), row(20, "y", "新規")]), encoding="utf-8")
+    cutoff = datetime(2025, 8, 15, tzinfo=JST)
+    state = XIngestState(state_path)
+    rows, window = state.read_rows(str(csv_path), "test", cutoff)
+    assert [r.username for r in rows] == ["@y"] and window == []
+    merged = state.commit(str(csv_path), "test", to_items(rows), cutoff)
+    assert [m["title"] for m in merged] == ["@y"]
+
+
+def test_commit_caps_merged_window(tmp_path):
+    csv_path = tmp_path / "x.csv"
+    csv_path.write_text("\r\n".join([row(10, "a", "一件目"), row(11, "b", "二件目")]), encoding="utf-8")
+    state_path = tmp_path / "x_ingest.json"
+    state = XIngestState(state_path)
+    rows, _ = state.read_rows(str(csv_path), "test")
+    state.commit(str(csv_path), "test", to_items(rows), limit=2)
+
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("\r\n" + row(12, "c", "三件目"))
+    state = XIngestState(state_path)
+    rows, _ = state.read_rows(str(csv_path), "test")
+    merged = state.commit(str(csv_path), "test", to_items(rows), limit=2)
+    assert [m["title"] for m in merged] == ["@c", "@a"]
+
+    # あふれた投稿も保存しておき、次回以降に返せるようにする
+    _, window = XIngestState(state_path).read_rows(str(csv_path), "test")
+    assert [w["title"] for w in window] == ["@c", "@a", "@b"]
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻訳キャッシュ（build.py / build_simple_ranking.py / build_enhanced_ranking.py 共通）
+- 追記型の JSON Lines（_cache/translations.jsonl）に保存し、毎回ファイル全体を書き直さない
+- 各エントリに最終ヒット時刻を持たせ、期限切れ（TTL）と件数上限（LRU）で削除
+- 追記ログが肥大化したら一時ファイルへ書き出して os.replace でアトミックに圧縮
+- 旧形式の _cache/translations.json（v1 フラット / v2）は初回ロード時に取り込む
+
+Env (optional):
+  TRANSLATION_CACHE_MAX_ENTRIES=20000  # 件数上限（超えたら最終ヒットが古い順に削除）
+  TRANSLATION_CACHE_TTL_DAYS=90        # 最終ヒットからの保持日数
+"""
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+CACHE_DIR = Path("_cache")
+DEFAULT_PATH = CACHE_DIR / "translations.jsonl"
+LEGACY_JSON_PATH = CACHE_DIR / "translations.json"
+
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_TTL_DAYS = 90
+# ヒット時刻の更新はこの間隔より細かくはログに書かない（TTL は日単位のため）
+TOUCH_INTERVAL = 6 * 3600
+
+# v1 (build.py 旧形式) のキー: "<link>::<hash(summary)>"
+_LEGACY_KEY_RE = re.compile(r"^(?P<link>.+)::-?\d+$")
+LINK_KEY_PREFIX = "link::"
+
+
+def text_key(text: str) -> str:
+    """翻訳元テキストの決定的なダイジェスト（NFKC・空白正規化後の BLAKE2b）"""
+    normalized = re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text or "")).strip()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def link_key(link: str) -> str:
+    """旧キャッシュから link 単位で回収した訳文のキー"""
+    return f"{LINK_KEY_PREFIX}{link}"
+
+
+def _iter_legacy_json(raw: dict) -> Iterator[Tuple[str, str]]:
+    """旧 translations.json（v1 フラット / v2）を (key, value) に展開"""
+    if raw.get("version") == 2:
+        for key, value in (raw.get("entries") or {}).items():
+            yield key, value
+        for link, value in (raw.get("by_link") or {}).items():
+            yield link_key(link), value
+        extra = {k: v for k, v in raw.items() if k not in ("version", "entries", "by_link")}
+    else:
+        extra = {}
+        for key, value in raw.items():
+            match = _LEGACY_KEY_RE.match(key) if isinstance(value, str) else None
+            if match:
+                yield link_key(match.group("link")), value
+            else:
+                extra[key] = value
+    for key, value in extra.items():
+        if isinstance(value, str):
+            yield key, value
+
+
+class TranslationCache:
+    """最終ヒット時刻付きの追記型キャッシュ。dict と同じ感覚で get / in / [] が使える"""
+
+    def __init__(self, path: Path = DEFAULT_PATH, legacy_path: Optional[Path] = LEGACY_JSON_PATH,
+                 max_entries: Optional[int] = None, ttl_days: Optional[float] = None,
+                 autoload: bool = True):
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.max_entries = max_entries or int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.ttl_days = ttl_days or float(os.getenv("TRANSLATION_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS))
+        self._entries: Dict[str, list] = {}  # key -> [value, last_hit]
+        self._pending: Dict[str, dict] = {}  # 次回 save で追記するレコード
+        self._log_lines = 0
+        self._needs_compaction = False
+        self.hits = 0
+        self.misses = 0
+        if autoload:
+            self.load()
+
+    # ---- 読み込み ----
+    def load(self):
+        self._entries.clear()
+        self._pending.clear()
+        self._log_lines = 0
+        if self.path.exists():
+            self._replay_log()
+        elif self.legacy_path and self.legacy_path.exists():
+            self._import_legacy()
+
+    def _replay_log(self):
+        skipped = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                self._log_lines += 1
+                try:
+                    record = json.loads(line)
+                    key = record["k"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # 書き込み途中で中断された行などは読み飛ばす
+                    skipped += 1
+                    continue
+                if record.get("d"):
+                    self._entries.pop(key, None)
+                elif "v" in record:
+                    self._entries[key] = [record["v"], record.get("t", 0)]
+                elif key in self._entries:
+                    self._entries[key][1] = max(self._entries[key][1], record.get("t", 0))
+        if skipped:
+            print(f"[WARN] Translation cache: skipped {skipped} unreadable log lines")
+            self._needs_compaction = True
+        print(f"[INFO] Loaded translation cache with {len(self._entries)} entries ({self._log_lines} log lines)")
+
+    def _import_legacy(self):
+        try:
+            raw = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            print(f"[WARN] Legacy translation cache unreadable: {e}")
+            return
+        now = time.time()
+        for key, value in _iter_legacy_json(raw if isinstance(raw, dict) else {}):
+            self._entries[key] = [value, now]
+        self._needs_compaction = True
+        print(f"[INFO] Imported {len(self._entries)} entries from {self.legacy_path}")
+
+    # ---- dict 互換の操作 ----
+    def get(self, key: str, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        now = time.time()
+        if now - entry[1] >= TOUCH_INTERVAL:
+            entry[1] = now
+            if key not in self._pending:
+                self._pending[key] = {"k": key, "t": now}
+        return entry[0]
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        self._entries[key] = [value, now]
+        self._pending[key] = {"k": key, "v": value, "t": now}
+
+    def pop(self, key: str, default=None):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self._pending[key] = {"k": key, "d": 1}
+        return entry[0]
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self._entries:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key: str, value: str):
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---- 削除・保存 ----
+    def evict(self, now: Optional[float] = None) -> int:
+        """TTL 切れと件数上限超過分（最終ヒットが古い順）を削除"""
+        now = now or time.time()
+        cutoff = now - self.ttl_days * 86400
+        expired = [k for k, (_, last_hit) in self._entries.items() if last_hit < cutoff]
+        for key in expired:
+            del self._entries[key]
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            oldest = sorted(self._entries.items(), key=lambda kv: kv[1][1])[:overflow]
+            for key, _ in oldest:
+                del self._entries[key]
+        removed = len(expired) + max(overflow, 0)
+        if removed:
+            self._needs_compaction = True
+            print(f"[INFO] Translation cache: evicted {removed} entries "
+                  f"({len(expired)} expired, {max(overflow, 0)} over limit)")
+        return removed
+
+    def save(self):
+        """追記分だけをログに書き足す。必要ならログ全体を圧縮して書き直す"""
+        self.evict()
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            if self._needs_compaction or self._log_lines + len(self._pending) > 2 * len(self._entries) + 1000:
+                self.compact()
+            elif self._pending:
+                lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self._pending.values())
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._log_lines += len(self._pending)
+                print(f"[INFO] Translation cache: appended {len(self._pending)} records")
+                self._pending.clear()
+        except Exception as e:
+            print(f"[ERROR] Failed to save translation cache: {e}")
+
+    def compact(self):
+        """生きているエントリだけを一時ファイルに書き出し、アトミックに置き換える"""
+        tmp_path = self.path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, (value, last_hit) in self._entries.items():
+                f.write(json.dumps({"k": key, "v": value, "t": last_hit}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._log_lines = len(self._entries)
+        self._pending.clear()
+        self._needs_compaction = False
+        print(f"[INFO] Translation cache compacted ({len(self._entries)} entries)")
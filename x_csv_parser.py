@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+X(Twitter) / Bluesky お気に入り CSV の共通ストリーミングパーサー
+- 形式（ヘッダーなし 5 列）: "日付", "@ユーザー", "テキスト", "画像URL", "ツイートURL"
+- ファイル / URL / bytes を 1 行ずつ読み、全文をメモリに載せない
+- 日付フォーマットは最初に成功したものを記憶して次の行から優先的に試す
+- cutoff より古い行は正規化（NFKC・文字化け修復）の前に捨てる
+- newest_first=True（新しい順の CSV）なら cutoff を過ぎた時点で読み込みを打ち切る
+  （_sources/x_favorites.csv やスプレッドシートは追記順で日付が前後するため既定は最後まで読む）
+"""
+import codecs
+import csv
+import html
+import io
+import re
+import unicodedata
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+JST = timezone(timedelta(hours=9))
+
+DATE_FORMATS = (
+    "%B %d, %Y at %I:%M%p",  # "August 10, 2025 at 02:41AM"
+    "%B %d, %Y",             # "August 13, 2025"
+    "%Y-%m-%d %H:%M:%S",     # "2025-08-18 14:30:00"
+    "%Y-%m-%dT%H:%M:%S",     # "2025-08-18T14:30:00"
+    "%Y-%m-%d",              # "2025-08-18"
+    "%Y年%m月%d日 %H:%M:%S",  # "2025年8月18日 14:30:00"
+    "%Y年%m月%d日",           # "2025年8月18日"
+    "%m/%d/%Y %H:%M:%S",     # "8/18/2025 14:30:00"
+    "%m/%d/%Y",              # "8/18/2025"
+)
+
+X_URL_RE = re.compile(r'https?://(?:x\.com|twitter\.com)/[^\s,;"\']+')
+
+# エンコーディング判定に使う先頭バイト数
+SNIFF_BYTES = 65536
+
+Source = Union[str, Path, bytes, IO[str]]
+
+
+@dataclass(slots=True)
+class XPost:
+    """CSV 1 行分の投稿（日付パース・正規化済み）"""
+    row: int
+    dt: datetime
+    date_str: str
+    username: str
+    text: str
+    media_url: str
+    url: str
+
+
+def repair_mojibake(text: str) -> str:
+    """Attempt to repair common mojibake (garbled) text.
+    Tries several re-encode/decode strategies and picks the one with more Japanese characters
+    and fewer replacement characters. Always returns normalized (NFKC) single-line text.
+    """
+    if not text:
+        return text
+    try:
+        candidates = [text]
+        # Try common mis-decode patterns
+        for src, dst in (('latin-1', 'utf-8'), ('cp1252', 'utf-8'), ('latin-1', 'cp932'), ('cp932', 'utf-8')):
+            try:
+                candidates.append(bytes(text, src, errors='ignore').decode(dst, errors='ignore'))
+            except Exception:
+                pass
+
+        def score(t: str) -> int:
+            jp = sum(1 for ch in t if ('\u3040' <= ch <= '\u30ff') or ('\u4e00' <= ch <= '\u9fff'))
+            bad = t.count('\ufffd') + t.count('�')
+            ctrl = sum(1 for ch in t if ord(ch) < 32 and ch not in '\n\r\t')
+            return jp * 2 - bad * 2 - ctrl
+
+        best = max(candidates, key=score)
+        best = unicodedata.normalize('NFKC', best)
+        # Replace common broken punctuation
+        for k, v in {
+            'â€“': '–', 'â€”': '—', 'â€˜': "'", 'â€™': "'",
+            'â€œ': '"', 'â€': '"', 'â€¢': '•', 'â€¦': '…'
+        }.items():
+            best = best.replace(k, v)
+        best = re.sub(r"\s+", " ", best).strip()
+        return best
+    except Exception:
+        return text
+
+
+class DateParser:
+    """日付文字列を JST の datetime に変換。成功したフォーマットを記憶して先に試す"""
+
+    def __init__(self, formats=DATE_FORMATS):
+        self.formats = list(formats)
+        self.detected: Optional[str] = None
+
+    def parse(self, date_str: str) -> Optional[datetime]:
+        date_str = (date_str or "").strip()
+        if not date_str:
+            return None
+        if self.detected:
+            try:
+                return datetime.strptime(date_str, self.detected).replace(tzinfo=JST)
+            except ValueError:
+                pass
+        for fmt in self.formats:
+            if fmt == self.detected:
+                continue
+            try:
+                dt = datetime.strptime(date_str, fmt).replace(tzinfo=JST)
+            except ValueError:
+                continue
+            self.detected = fmt
+            return dt
+        return None
+
+
+def normalize_text(text: str) -> str:
+    """HTML エンティティ・全角/半角・制御文字・文字化け・空白を正規化"""
+    text = unicodedata.normalize('NFKC', html.unescape(text))
+    text = ''.join(char for char in text if char.isprintable() or char in '\n\r\t')
+    text = repair_mojibake(text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _cell(row: list, index: int) -> str:
+    return row[index].strip('"').strip() if len(row) > index else ""
+
+
+def _find_post_url(row: list, text: str) -> str:
+    """ツイートURL 列 → 本文中の X/Twitter URL → 他の列の順で投稿 URL を探す"""
+    url = _cell(row, 4)
+    if url:
+        return url
+    match = X_URL_RE.search(text)
+    if match:
+        return match.group(0)
+    for col in row:
+        match = X_URL_RE.search(col)
+        if match:
+            return match.group(0)
+    return ""
+
+
+def _sniff_encoding(head: bytes) -> str:
+    # UTF-8 BOM優先→UTF-8→CP932（先頭のみで判定し、末尾で切れたマルチバイト文字は許容）
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        pass
+    try:
+        head.decode('cp932')
+        return 'cp932'
+    except UnicodeDecodeError:
+        return 'utf-8-sig'
+
+
+@contextmanager
+def open_csv_text(source: Source) -> Iterator[IO[str]]:
+    """ファイルパス / URL / bytes / テキストストリームを行単位で読めるテキストストリームにする"""
+    if hasattr(source, "read"):
+        yield source
+    elif isinstance(source, bytes):
+        encoding = _sniff_encoding(source[:SNIFF_BYTES])
+        yield io.StringIO(source.decode(encoding, errors='replace'), newline='')
+    elif str(source).startswith(('http://', 'https://')):
+        import http_client
+        with http_client.get(str(source), timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield io.TextIOWrapper(response.raw, encoding='utf-8-sig', errors='replace', newline='')
+    else:
+        with open(source, 'rb') as f:
+            encoding = _sniff_encoding(f.read(SNIFF_BYTES))
+        with open(source, 'r', encoding=encoding, errors='replace', newline='') as f:
+            yield f
+
+
+def parse_x_csv(source: Source, cutoff: Optional[datetime] = None, min_text_len: int = 1,
+                newest_first: bool = False, stats: Optional[dict] = None) -> Iterator[XPost]:
+    """
+    X お気に入り CSV を 1 行ずつパースして XPost を返すジェネレーター
+
+    Args:
+        source: ファイルパス / URL / bytes / テキストストリーム
+        cutoff: これより古い投稿は正規化せずに捨てる
+        min_text_len: 正規化後の本文がこれより短い投稿は捨てる
+        newest_first: CSV が新しい順に並んでいる場合 True（cutoff で読み込みを打ち切る）
+        stats: 渡すと rows / parsed / skipped_date / skipped_old / stopped_early を記録する
+    """
+    stats = stats if stats is not None else {}
+    stats.update(rows=0, parsed=0, skipped_date=0, skipped_old=0, stopped_early=False)
+    dates = DateParser()
+
+    with open_csv_text(source) as stream:
+        for row_no, row in enumerate(csv.reader(stream), 1):
+            stats["rows"] += 1
+            if len(row) < 3:
+                continue
+            date_str = _cell(row, 0)
+            dt = dates.parse(date_str)
+            if dt is None:
+                # ヘッダー行や壊れた行（古い投稿が最新扱いされるのを防ぐためスキップ）
+                stats["skipped_date"] += 1
+                continue
+            if cutoff is not None and dt < cutoff:
+                stats["skipped_old"] += 1
+                if newest_first:
+                    # 新しい順の CSV: 以降の行はすべて cutoff より古い
+                    stats["stopped_early"] = True
+                    break
+                continue
+
+            text = normalize_text(_cell(row, 2))
+            if len(text) < min_text_len:
+                continue
+            stats["parsed"] += 1
+            yield XPost(
+                row=row_no,
+                dt=dt,
+                date_str=date_str,
+                username=unicodedata.normalize('NFKC', html.unescape(_cell(row, 1))),
+                text=text,
+                media_url=_cell(row, 3),
+                url=_find_post_url(row, text),
+            )
+    stats["date_format"] = dates.detected
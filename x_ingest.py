@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+X 投稿 CSV の差分取り込み（ウォーターマーク方式）
+- CSV ごとに「処理済みバイト位置」「その直前バイト列のハッシュ」「最終行の時刻」を _cache/x_ingest.json に保存
+- 次回は保存位置までを読み飛ばし、直前バイト列のハッシュが一致すれば追記分の行だけをパース・処理する
+  （一致しない = シートが編集・削除された場合は全件を読み直す）
+- 処理済みの投稿は時間窓（cutoff）内の分だけ保存し、新しい投稿とマージして返す
+
+使い方:
+    rows, window = X_INGEST.read_rows(csv_path, "enhanced", cutoff)   # 新規行と前回までの投稿
+    items = process(rows, window)                                      # 正規化・重複除去・Gemini強化
+    items = X_INGEST.commit(csv_path, "enhanced", items, cutoff)      # ウォーターマーク更新・マージ
+"""
+import hashlib
+import io
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from json_store import atomic_write_json, load_versioned_json
+from x_csv_parser import SNIFF_BYTES, XPost, _sniff_encoding, parse_x_csv
+
+STATE_VERSION = 1
+# ウォーターマーク直前の検証に使うバイト数（最終行の末尾を含む）
+TAIL_BYTES = 256
+CHUNK_SIZE = 65536
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class _CountingReader(io.RawIOBase):
+    """読み出したバイト数と末尾 TAIL_BYTES を記録するラッパー（prefix を先に返す）"""
+
+    def __init__(self, raw, prefix: bytes = b"", tail_seed: bytes = b""):
+        self._raw = raw
+        self._prefix = prefix
+        self.count = 0
+        self.tail = tail_seed[-TAIL_BYTES:]
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            data, self._prefix = self._prefix[:len(buffer)], self._prefix[len(buffer):]
+        else:
+            data = self._raw.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self.count += n
+        self.tail = (self.tail + data)[-TAIL_BYTES:]
+        return n
+
+
+@contextmanager
+def _open_binary(source: str) -> Iterator[Tuple[object, bool]]:
+    """(バイナリストリーム, seek 可能か) を返す"""
+    if str(source).startswith(('http://', 'https://')):
+        import http_client
+        with http_client.get(str(source), timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield response.raw, False
+    else:
+        with open(source, 'rb') as f:
+            yield f, True
+
+
+def _skip_to_watermark(raw, seekable: bool, record: Dict) -> Optional[bytes]:
+    """保存位置まで読み進め、直前バイト列が一致すればそのバイト列を返す（不一致なら None）"""
+    offset = record.get("offset", 0)
+    tail_len = min(TAIL_BYTES, offset)
+    if seekable:
+        raw.seek(0, os.SEEK_END)
+        if raw.tell() < offset:
+            raw.seek(0)
+            return None
+        raw.seek(offset - tail_len)
+        tail = raw.read(tail_len)
+    else:
+        # seek できない（HTTP）場合は保存位置まで読み捨てる（パース・正規化はしない）
+        remaining, tail = offset, b""
+        while remaining > 0:
+            chunk = raw.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                return None
+            remaining -= len(chunk)
+            tail = (tail + chunk)[-tail_len:]
+    if _digest(tail) != record.get("tail_hash"):
+        if seekable:
+            raw.seek(0)
+        return None
+    return tail
+
+
+class XIngestState:
+    """CSV × パイプラインごとのウォーターマークと直近投稿ウィンドウ"""
+
+    def __init__(self, path: Path, enabled: bool = True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict] = {}
+        self._pending: Dict[str, Dict] = {}
+        if enabled:
+            self.load()
+
+    def load(self):
+        """状態ファイルを読み込み（壊れていれば全件読み直しから開始）"""
+        raw = load_versioned_json(self.path, STATE_VERSION, "X ingest state")
+        self._sources = raw.get("sources", {}) if raw else {}
+
+    def save(self):
+        """アトミックに書き出す"""
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                atomic_write_json(self.path, {"version": STATE_VERSION, "sources": self._sources}, default=str)
+            except Exception as e:
+                print(f"[WARN] Failed to save X ingest state: {e}")
+
+    @staticmethod
+    def _key(source: str, pipeline: str) -> str:
+        return f"{pipeline}|{source}"
+
+    def read_rows(self, source: str, pipeline: str, cutoff: Optional[datetime] = None,
+                  min_text_len: int = 1) -> Tuple[List[XPost], List[Dict]]:
+        """
+        前回のウォーターマーク以降に追加された行と、前回までに処理済みの投稿を返す
+
+        Returns:
+            (新規行の XPost リスト, cutoff 内の処理済み投稿リスト)。差分が使えない場合は全行と空リスト
+        """
+        key = self._key(source, pipeline)
+        record = self._sources.get(key) if self.enabled else None
+        stats: Dict = {}
+
+        with _open_binary(source) as (raw, seekable):
+            tail = _skip_to_watermark(raw, seekable, record) if record else None
+            if record and tail is None and not seekable:
+                # HTTP で不一致: 読み捨てた分を取り戻せないので開き直して全件読む
+                with _open_binary(source) as (raw_again, _):
+                    return self._read_all(raw_again, key, cutoff, min_text_len, stats)
+            if tail is None:
+                if record:
+                    print(f"[INFO] X ingest: {source} changed before watermark, re-reading all rows")
+                return self._read_all(raw, key, cutoff, min_text_len, stats)
+
+            start = record["offset"]
+            reader = _CountingReader(raw, tail_seed=tail)
+            text = io.TextIOWrapper(io.BufferedReader(reader), encoding=record.get("encoding", "utf-8"),
+                                    errors="replace", newline="")
+            rows = list(parse_x_csv(text, cutoff=cutoff, min_text_len=min_text_len, stats=stats))
+            self._stage(key, start + reader.count, reader.tail, record.get("encoding", "utf-8"), rows, record,
+                        incremental=True)
+
+        window = [self._decode_item(item) for item in record.get("window", [])]
+        window = [item for item in window if cutoff is None or item["_dt"] >= cutoff]
+        print(f"[INFO] X ingest: {len(rows)} new rows after byte {start} "
+              f"({stats.get('rows', 0)} rows read), {len(window)} posts carried over")
+        return rows, window
+
+    def _read_all(self, raw, key: str, cutoff, min_text_len: int, stats: Dict) -> Tuple[List[XPost], List[Dict]]:
+        head = raw.read(SNIFF_BYTES)
+        encoding = _sniff_encoding(head)
+        reader = _CountingReader(raw, prefix=head)
+        text = io.TextIOWrapper(io.BufferedReader(reader), encoding=encoding, errors="replace", newline="")
+        rows = list(parse_x_csv(text, cutoff=cutoff, min_text_len=min_text_len, stats=stats))
+        # 2 回目以降の差分読み込みは途中から始まるため BOM 除去は不要
+        self._stage(key, reader.count, reader.tail, encoding.replace("-sig", ""), rows, None,
+                    incremental=False)
+        print(f"[INFO] X ingest: full read of {stats.get('rows', 0)} rows, {len(rows)} in window")
+        return rows, []
+
+    def _stage(self, key: str, offset: int, tail: bytes, encoding: str, rows: List[XPost],
+               record: Optional[Dict], incremental: bool):
+        last_dt = max((row.dt for row in rows), default=None)
+        previous_dt = (record or {}).get("last_row_dt")
+        with self._lock:
+            self._pending[key] = {
+                "offset": offset,
+                "tail_hash": _digest(tail),
+                "encoding": encoding,
+                "last_row_dt": last_dt.isoformat() if last_dt else previous_dt,
+                "incremental": incremental,
+            }
+
+    def commit(self, source: str, pipeline: str, items: List[Dict], cutoff: Optional[datetime] = None,
+               limit: Optional[int] = None) -> List[Dict]:
+        """
+        新たに処理した投稿を前回までの投稿とマージし、ウォーターマークを確定して保存する
+        （保存する投稿は limit で切らない。今回あふれた投稿も古い投稿が cutoff を過ぎれば返るようにする）
+
+        Returns:
+            cutoff 内の投稿（新しい投稿を優先し、link で重複除去。limit があれば先頭からその件数まで）
+        """
+        key = self._key(source, pipeline)
+        with self._lock:
+            record = self._sources.get(key) or {}
+            pending = self._pending.pop(key, None)
+        previous = []
+        if pending and pending.pop("incremental"):
+            previous = [self._decode_item(item) for item in record.get("window", [])]
+
+        merged, seen = [], set()
+        for item in list(items) + previous:
+            link = item.get("link", "")
+            if link in seen or (cutoff is not None and item.get("_dt") and item["_dt"] < cutoff):
+                continue
+            seen.add(link)
+            merged.append(item)
+
+        if self.enabled and pending:
+            pending["window"] = [self._encode_item(item) for item in merged]
+            with self._lock:
+                self._sources[key] = pending
+            self.save()
+        return merged if limit is None else merged[:limit]
+
+    @staticmethod
+    def _encode_item(item: Dict) -> Dict:
+        data = dict(item)
+        if isinstance(data.get("_dt"), datetime):
+            data["_dt"] = data["_dt"].isoformat()
+        return data
+
+    @staticmethod
+    def _decode_item(data: Dict) -> Dict:
+        item = dict(data)
+        if isinstance(item.get("_dt"), str):
+            item["_dt"] = datetime.fromisoformat(item["_dt"])
+        return item